@@ -9,6 +9,7 @@ from flux_orm.models.models import (
     TeamMember,
     TeamInMatch,
     MatchStatus,
+    MatchStatusHistory,
     Match,
     AIStatementInMatch,
     MatchAIStatement,
@@ -16,7 +17,9 @@ from flux_orm.models.models import (
     CoachInTeam,
     Substitution,
     RawNews,
+    RawNewsBody,
     FormattedNews,
+    FormattedNewsBody,
     FilteredMatchInNews,
 )
 
@@ -31,6 +34,7 @@ __all__ = [
     "TeamMember",
     "TeamInMatch",
     "MatchStatus",
+    "MatchStatusHistory",
     "Match",
     "AIStatementInMatch",
     "MatchAIStatement",
@@ -38,6 +42,8 @@ __all__ = [
     "CoachInTeam",
     "Substitution",
     "RawNews",
+    "RawNewsBody",
     "FormattedNews",
+    "FormattedNewsBody",
     "FilteredMatchInNews",
 ]
@@ -1,8 +1,18 @@
+"""
+Database maintenance and diagnostics.
+
+    python -m flux_orm tables                # sizes of every table
+    python -m flux_orm all --format json     # every report as one JSON document
+    python -m flux_orm transactions --min-seconds 5
+    python -m flux_orm reset --yes           # drop and recreate all tables
+"""
+
+import argparse
 import asyncio
-from flux_orm.database import create_tables, delete_tables
 
-from flux_orm.database import new_session
 from flux_orm import Sport
+from flux_orm.database import async_engine, create_tables, delete_tables, new_session
+from flux_orm.diagnostics import REPORTS, to_json, to_table
 
 
 async def add_cs_sport():
@@ -12,11 +22,70 @@ async def add_cs_sport():
         await session.commit()
 
 
-async def main():
+async def reset():
     await delete_tables()
     await create_tables()
     await add_cs_sport()
 
 
+async def run_reports(names: list[str], schema: str, min_seconds: float) -> dict:
+    reports = {}
+    async with async_engine.connect() as conn:
+        for name in names:
+            kwargs = {"min_seconds": min_seconds} if name == "transactions" else {}
+            reports[name] = await REPORTS[name](conn, schema, **kwargs)
+    await async_engine.dispose()
+    return reports
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flux_orm",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reset_parser = commands.add_parser(
+        "reset", help="drop all tables, recreate them and seed CS2"
+    )
+    reset_parser.add_argument(
+        "--yes", action="store_true", help="confirm that all data is lost"
+    )
+
+    helps = {name: (report.__doc__ or "").strip() for name, report in REPORTS.items()}
+    helps["all"] = "every report"
+    for name, help_ in helps.items():
+        report_parser = commands.add_parser(name, help=help_)
+        report_parser.add_argument("--format", choices=["table", "json"], default="table")
+        report_parser.add_argument("--schema", default="public")
+        report_parser.add_argument(
+            "--min-seconds",
+            type=float,
+            default=60.0,
+            help="minimal age of the transactions listed by 'transactions'",
+        )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "reset":
+        if not args.yes:
+            raise SystemExit("reset deletes every row, pass --yes to confirm")
+        asyncio.run(reset())
+        return
+
+    names = list(REPORTS) if args.command == "all" else [args.command]
+    reports = asyncio.run(run_reports(names, args.schema, args.min_seconds))
+    if args.format == "json":
+        print(to_json(reports))
+        return
+    for name, rows in reports.items():
+        print(f"== {name} ==")
+        print(to_table(rows))
+        print()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmarks against a real database.
+
+Each module is runnable (``python -m flux_orm.benchmarks.<name>``), seeds its
+own data inside a transaction that is rolled back and prints a table of
+results, so any development database can be used.
+"""
+
+import statistics
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+class Timing(NamedTuple):
+    median_ms: float
+    p95_ms: float
+    runs: int
+
+
+async def measure(
+    operation: Callable[[], Awaitable[object]], runs: int = 50, warmup: int = 3
+) -> Timing:
+    """Median and 95th percentile wall time of ``runs`` awaited calls."""
+    for _ in range(warmup):
+        await operation()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return Timing(
+        round(statistics.median(samples), 3),
+        round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        runs,
+    )
+
+
+async def result_bytes(conn: AsyncConnection, statement) -> int:
+    """Size of the rows ``statement`` returns, as stored (``pg_column_size``)."""
+    sql = statement.compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    return (
+        await conn.execute(
+            text(f"SELECT COALESCE(sum(pg_column_size(q.*)), 0) FROM ({sql}) q")
+        )
+    ).scalar_one()
+
+
+@asynccontextmanager
+async def rolled_back(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """A connection whose transaction is always rolled back."""
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            yield conn
+        finally:
+            await transaction.rollback()
@@ -0,0 +1,152 @@
+"""
+Listing queries with and without the heavy deferred columns.
+
+    python -m flux_orm.benchmarks.deferred_columns [--rows 5000] [--runs 30]
+
+Prints, per listing, the bytes of the returned rows and the median/p95
+latency of loading them through an ``AsyncSession``, once with the mapper
+defaults (bodies and documents deferred) and once with them undeferred or
+joined.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, undefer, undefer_group
+
+from flux_orm.benchmarks import measure, result_bytes, rolled_back
+from flux_orm.config import postgresql_connection_settings
+from flux_orm.diagnostics import to_table
+from flux_orm.models.models import FormattedNews, Match, RawNews, Team
+
+SEED = [
+    """
+    INSERT INTO sport (name) VALUES ('bench-sport')
+    """,
+    """
+    INSERT INTO team (name, stats, regalia)
+    SELECT
+        'bench-team-' || i,
+        jsonb_build_object(
+            'maps', (SELECT jsonb_agg(jsonb_build_object('map', m, 'wins', m * i))
+                     FROM generate_series(1, 40) m)
+        ),
+        jsonb_build_object('cups', (SELECT jsonb_agg('Cup ' || c)
+                                    FROM generate_series(1, 30) c))
+    FROM generate_series(1, :rows) i
+    """,
+    """
+    INSERT INTO match (sport_id, match_name, external_id, match_streams)
+    SELECT
+        (SELECT sport_id FROM sport WHERE name = 'bench-sport'),
+        'bench match ' || i,
+        'bench-match-' || i,
+        (SELECT jsonb_object_agg('stream-' || s, jsonb_build_array(
+            'https://stream.example/' || i || '/' || s, 'en', 'twitch', 'hd'))
+         FROM generate_series(1, 10) s)
+    FROM generate_series(1, :rows) i
+    """,
+    """
+    INSERT INTO raw_news (sport_id, header, url)
+    SELECT
+        (SELECT sport_id FROM sport WHERE name = 'bench-sport'),
+        'bench news ' || i,
+        'https://news.example/raw/' || i
+    FROM generate_series(1, :rows) i
+    """,
+    """
+    INSERT INTO raw_news_body (raw_news_id, text)
+    SELECT
+        raw_news_id,
+        (SELECT jsonb_agg(repeat('paragraph ' || p || ' ', 40))
+         FROM generate_series(1, 8) p)
+    FROM raw_news WHERE header LIKE 'bench news %'
+    """,
+    """
+    INSERT INTO formatted_news (sport_id, header, url, keywords)
+    SELECT
+        (SELECT sport_id FROM sport WHERE name = 'bench-sport'),
+        'bench news ' || i,
+        'https://news.example/' || i,
+        jsonb_build_object('teams', jsonb_build_array('a', 'b'), 'players',
+                           (SELECT jsonb_agg('player ' || k) FROM generate_series(1, 20) k))
+    FROM generate_series(1, :rows) i
+    """,
+    """
+    INSERT INTO formatted_news_body (formatted_news_id, text)
+    SELECT formatted_news_id, repeat(header || ' formatted body ', 200)
+    FROM formatted_news WHERE header LIKE 'bench news %'
+    """,
+]
+
+LISTINGS = {
+    "teams": (
+        select(Team).where(Team.name.like("bench-team-%")),
+        (undefer_group("documents"),),
+    ),
+    "matches": (
+        select(Match).where(Match.external_id.like("bench-match-%")),
+        (undefer(Match.match_streams),),
+    ),
+    "raw news": (
+        select(RawNews).where(RawNews.header.like("bench news %")),
+        (joinedload(RawNews.body),),
+    ),
+    "formatted news": (
+        select(FormattedNews).where(FormattedNews.header.like("bench news %")),
+        (undefer_group("body"), joinedload(FormattedNews.body)),
+    ),
+}
+
+
+async def run(rows: int, runs: int) -> list[dict]:
+    engine = create_async_engine(postgresql_connection_settings.async_url)
+    report = []
+    async with rolled_back(engine) as conn:
+        for statement in SEED:
+            await conn.execute(text(statement), {"rows": rows})
+        await conn.execute(
+            text(
+                "ANALYZE team, match, raw_news, raw_news_body,"
+                " formatted_news, formatted_news_body"
+            )
+        )
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+
+        for name, (listing, full_options) in LISTINGS.items():
+            full = listing.options(*full_options)
+
+            async def load(statement):
+                (await session.execute(statement)).scalars().all()
+                session.expunge_all()
+
+            deferred_bytes = await result_bytes(conn, listing)
+            full_bytes = await result_bytes(conn, full)
+            deferred_timing = await measure(lambda s=listing: load(s), runs)
+            full_timing = await measure(lambda s=full: load(s), runs)
+            report.append({
+                "listing": name,
+                "rows": rows,
+                "bytes_full": full_bytes,
+                "bytes_deferred": deferred_bytes,
+                "bytes_saved": f"{1 - deferred_bytes / full_bytes:.0%}",
+                "ms_full": full_timing.median_ms,
+                "ms_deferred": deferred_timing.median_ms,
+                "p95_full": full_timing.p95_ms,
+                "p95_deferred": deferred_timing.p95_ms,
+            })
+        await session.close()
+    await engine.dispose()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m flux_orm.benchmarks.deferred_columns"
+    )
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+    print(to_table(asyncio.run(run(args.rows, args.runs))))
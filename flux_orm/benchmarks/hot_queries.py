@@ -0,0 +1,176 @@
+"""
+Ad-hoc statements versus the cached lambda statements of ``flux_orm.queries``.
+
+    python -m flux_orm.benchmarks.hot_queries [--matches 5000] [--runs 30]
+
+Per query, prints the mean time of back-to-back calls through an
+``AsyncSession`` on the ``plan_check`` seed data (the round trip is the same
+for both, the difference is building the statement and finding it in the
+compiled cache), the time a compilation would take on a cache miss, and the
+median/p95 latency of single calls.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from flux_orm import queries
+from flux_orm.benchmarks import measure, rolled_back
+from flux_orm.config import postgresql_connection_settings
+from flux_orm.diagnostics import to_table
+from flux_orm.models.models import (
+    FilteredMatchInNews,
+    FormattedNews,
+    Match,
+    PlayerInTeam,
+    Sport,
+    Team,
+    TeamMember,
+)
+from flux_orm.plan_check import seed
+from flux_orm.schedule import (
+    LIVE_LOOKBACK,
+    cached_schedule_statement,
+    schedule_statement,
+)
+
+Builder = Callable[[dict], Any]
+
+TEAM_NAMES = [f"plan-team-{i}" for i in range(40, 50)]
+
+
+def _schedule_window(sample: dict) -> tuple:
+    start = sample["window_start"]
+    return sample["sport_id"], start - LIVE_LOOKBACK, start + timedelta(hours=24)
+
+
+# (ad-hoc, catalog) statement builders over the sample parameters.
+HOT_QUERIES: dict[str, tuple[Builder, Builder]] = {
+    "match_by_external_id": (
+        lambda s: select(Match).where(Match.external_id == s["external_id"]),
+        lambda s: queries.match_by_external_id_statement(s["external_id"]),
+    ),
+    "sport_by_name": (
+        lambda s: select(Sport).where(Sport.name == "plan-sport-1"),
+        lambda s: queries.sport_by_name_statement("plan-sport-1"),
+    ),
+    "teams_by_names": (
+        lambda s: select(Team).where(Team.name.in_(TEAM_NAMES)).order_by(Team.name),
+        lambda s: queries.teams_by_names_statement(TEAM_NAMES),
+    ),
+    "matches_in_window": (
+        lambda s: (
+            select(Match)
+            .where(
+                Match.sport_id == s["sport_id"],
+                Match.planned_start_datetime >= s["window_start"],
+                Match.planned_start_datetime < s["window_end"],
+            )
+            .order_by(Match.planned_start_datetime, Match.match_id)
+            .limit(50)
+        ),
+        lambda s: queries.matches_in_window_statement(
+            s["sport_id"], s["window_start"], s["window_end"]
+        ),
+    ),
+    "team_roster": (
+        lambda s: (
+            select(TeamMember)
+            .join(PlayerInTeam, PlayerInTeam.player_id == TeamMember.player_id)
+            .where(PlayerInTeam.team_id == s["team_id"])
+            .order_by(TeamMember.name)
+        ),
+        lambda s: queries.team_roster_statement(s["team_id"]),
+    ),
+    "news_for_match": (
+        lambda s: (
+            select(FormattedNews)
+            .join(
+                FilteredMatchInNews,
+                FilteredMatchInNews.news_id == FormattedNews.formatted_news_id,
+            )
+            .where(FilteredMatchInNews.match_id == s["match_id"])
+            .order_by(FormattedNews.news_creation_time.desc())
+            .limit(20)
+        ),
+        lambda s: queries.news_for_match_statement(s["match_id"]),
+    ),
+    "schedule": (
+        lambda s: schedule_statement(*_schedule_window(s)),
+        lambda s: cached_schedule_statement(*_schedule_window(s)),
+    ),
+}
+
+
+async def call_us(load: Callable[[], Awaitable[object]], builds: int) -> float:
+    """Mean microseconds of ``builds`` back-to-back calls of ``load``."""
+    await load()
+    started = time.perf_counter()
+    for _ in range(builds):
+        await load()
+    return round((time.perf_counter() - started) / builds * 1e6, 1)
+
+
+def compile_us(builder: Builder, sample: dict, dialect, builds: int) -> float:
+    """Microseconds to compile a statement without the compiled cache."""
+    started = time.perf_counter()
+    for _ in range(builds):
+        builder(sample).compile(dialect=dialect)
+    return round((time.perf_counter() - started) / builds * 1e6, 1)
+
+
+async def run(
+    engine: AsyncEngine, matches: int, runs: int, builds: int = 200
+) -> list[dict]:
+    report = []
+    async with rolled_back(engine) as conn:
+        sample = await seed(conn, matches)
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+
+        async def load(builder: Builder) -> None:
+            (await session.execute(builder(sample))).all()
+            session.expunge_all()
+
+        for name, (adhoc, catalog) in HOT_QUERIES.items():
+            adhoc_call = await call_us(lambda b=adhoc: load(b), builds)
+            catalog_call = await call_us(lambda b=catalog: load(b), builds)
+            adhoc_timing = await measure(lambda b=adhoc: load(b), runs)
+            catalog_timing = await measure(lambda b=catalog: load(b), runs)
+            report.append({
+                "query": name,
+                "call_us_adhoc": adhoc_call,
+                "call_us_catalog": catalog_call,
+                "call_speedup": f"{adhoc_call / max(catalog_call, 0.1):.1f}x",
+                "compile_us": compile_us(
+                    adhoc, sample, conn.dialect, builds // 10 or 1
+                ),
+                "ms_adhoc": adhoc_timing.median_ms,
+                "ms_catalog": catalog_timing.median_ms,
+                "p95_adhoc": adhoc_timing.p95_ms,
+                "p95_catalog": catalog_timing.p95_ms,
+            })
+        await session.close()
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(postgresql_connection_settings.async_url)
+    try:
+        report = await run(engine, args.matches, args.runs, args.builds)
+    finally:
+        await engine.dispose()
+    print(to_table(report))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m flux_orm.benchmarks.hot_queries")
+    parser.add_argument("--matches", type=int, default=5_000)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--builds", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,139 @@
+"""
+News bodies inline in the news row versus in the ``raw_news_body`` side table.
+
+    python -m flux_orm.benchmarks.news_bodies [--rows 20000] [--body-bytes 1500]
+
+Bodies of about 1.5 kB stay below the TOAST threshold and are stored in the
+heap tuple, so every pipeline status update copies them and every scan of the
+metadata reads them.  The wide layout is a temporary copy of ``raw_news`` with
+the body column added back.  Prints heap size, the median/p95 latency of
+updating the status of ``--batch`` rows and of an aggregate over the metadata.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from flux_orm.benchmarks import measure, rolled_back
+from flux_orm.config import postgresql_connection_settings
+from flux_orm.diagnostics import to_table
+
+SEED = [
+    """
+    INSERT INTO sport (name) VALUES ('bench-sport')
+    """,
+    """
+    INSERT INTO raw_news (sport_id, header, url, pipeline_status)
+    SELECT
+        (SELECT sport_id FROM sport WHERE name = 'bench-sport'),
+        'bench news ' || i,
+        'https://news.example/raw/' || i,
+        'NEW'
+    FROM generate_series(1, :rows) i
+    """,
+    # md5 keeps the paragraphs from compressing to nothing.
+    """
+    INSERT INTO raw_news_body (raw_news_id, text)
+    SELECT
+        raw_news_id,
+        (SELECT jsonb_agg(left(repeat(md5(header || p), 20), :body_bytes / 4))
+         FROM generate_series(1, 4) p)
+    FROM raw_news WHERE header LIKE 'bench news %'
+    """,
+    """
+    CREATE TEMPORARY TABLE wide_news (LIKE raw_news INCLUDING DEFAULTS)
+    ON COMMIT DROP
+    """,
+    """
+    ALTER TABLE wide_news ADD COLUMN text jsonb
+    """,
+    """
+    INSERT INTO wide_news
+    SELECT n.*, b.text
+    FROM raw_news n JOIN raw_news_body b USING (raw_news_id)
+    WHERE n.header LIKE 'bench news %'
+    """,
+    """
+    ANALYZE raw_news, raw_news_body, wide_news
+    """,
+]
+
+LAYOUTS = {"inline": "wide_news", "side table": "raw_news"}
+
+HEAP_BYTES = "SELECT pg_relation_size(CAST(:table AS regclass))"
+
+UPDATE_STATUS = """
+UPDATE {table} SET pipeline_status = :status, pipeline_update_time = now()
+WHERE raw_news_id IN (
+    SELECT raw_news_id FROM {table}
+    WHERE header LIKE 'bench news %' AND pipeline_status = :previous
+    LIMIT :batch
+)
+"""
+
+SCAN_METADATA = """
+SELECT pipeline_status, count(*), max(news_creation_time)
+FROM {table}
+WHERE header LIKE 'bench news %'
+GROUP BY pipeline_status
+"""
+
+
+async def run(
+    engine: AsyncEngine, rows: int, body_bytes: int, batch: int, runs: int
+) -> list[dict]:
+    report = []
+    async with rolled_back(engine) as conn:
+        for statement in SEED:
+            await conn.execute(
+                text(statement), {"rows": rows, "body_bytes": body_bytes}
+            )
+
+        for layout, table in LAYOUTS.items():
+            update = text(UPDATE_STATUS.format(table=table))
+            scan = text(SCAN_METADATA.format(table=table))
+            statuses = iter(["SENT", "NEW"] * (runs + 3))
+
+            async def update_batch():
+                status = next(statuses)
+                previous = "NEW" if status == "SENT" else "SENT"
+                await conn.execute(
+                    update, {"status": status, "previous": previous, "batch": batch}
+                )
+
+            heap_bytes = (
+                await conn.execute(text(HEAP_BYTES), {"table": table})
+            ).scalar_one()
+            update_timing = await measure(update_batch, runs)
+            scan_timing = await measure(lambda s=scan: conn.execute(s), runs)
+            report.append({
+                "layout": layout,
+                "rows": rows,
+                "heap_bytes": heap_bytes,
+                "update_ms": update_timing.median_ms,
+                "update_p95": update_timing.p95_ms,
+                "updates_per_s": round(batch / update_timing.median_ms * 1000),
+                "scan_ms": scan_timing.median_ms,
+                "scan_p95": scan_timing.p95_ms,
+            })
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(postgresql_connection_settings.async_url)
+    try:
+        report = await run(engine, args.rows, args.body_bytes, args.batch, args.runs)
+    finally:
+        await engine.dispose()
+    print(to_table(report))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m flux_orm.benchmarks.news_bodies")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--body-bytes", type=int, default=1_500)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
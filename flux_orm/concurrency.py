@@ -0,0 +1,178 @@
+"""Optimistic concurrency for versioned models (``Match``).
+
+Instead of ``SELECT ... FOR UPDATE``, writers read without locks and the
+``version`` column of ``Versioned`` models detects lost updates when they
+write.  ``commit`` turns SQLAlchemy's ``StaleDataError`` into a
+``ConcurrentUpdateError`` naming the rows that changed, ``retry_on_conflict``
+reloads a row and reapplies a mutation until it wins::
+
+    def finish(match: Match) -> None:
+        match.end_datetime = ended_at
+
+    await retry_on_conflict(new_session, Match, match_id, finish)
+
+``conditional_update`` writes many rows in one statement, each only if its
+version is still the expected one, and reports the rows that lost the race.
+"""
+
+import asyncio
+import inspect
+import random
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from typing import Any, NamedTuple
+
+from sqlalchemy import column, select, update, values
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Mapper
+from sqlalchemy.orm.exc import StaleDataError
+
+from flux_orm.custom_logger import logger
+
+
+class ConcurrentUpdateError(StaleDataError):
+    """``ids`` of ``model`` were changed or deleted by another writer."""
+
+    def __init__(self, model: type, ids: Sequence[Hashable], attempts: int = 1):
+        self.model = model
+        self.ids = list(ids)
+        self.attempts = attempts
+        super().__init__(
+            f"{model.__name__} {self.ids} changed concurrently "
+            f"({attempts} attempt{'s' if attempts != 1 else ''})"
+        )
+
+
+class ConditionalUpdateResult(NamedTuple):
+    updated: list
+    conflicts: list
+
+
+def _versioned_mapper(model: type) -> Mapper:
+    mapper = sa_inspect(model)
+    if mapper.version_id_col is None:
+        raise ValueError(f"{model.__name__} has no version column")
+    if len(mapper.primary_key) != 1:
+        raise ValueError(f"{model.__name__} must have a single-column primary key")
+    return mapper
+
+
+def _expected_versions(session: AsyncSession) -> dict[type, dict]:
+    """Loaded versions of the versioned objects the next flush updates or deletes."""
+    expected: dict[type, dict] = {}
+    for obj in (*session.dirty, *session.deleted):
+        state = sa_inspect(obj)
+        mapper = state.mapper
+        if mapper.version_id_col is None or state.key is None:
+            continue
+        prop = mapper.get_property_by_column(mapper.version_id_col)
+        history = state.attrs[prop.key].history
+        version = history.deleted[0] if history.deleted else state.dict.get(prop.key)
+        expected.setdefault(mapper.class_, {})[state.identity[0]] = version
+    return expected
+
+
+async def commit(session: AsyncSession) -> None:
+    """``session.commit()`` raising ``ConcurrentUpdateError`` on version conflicts."""
+    expected = _expected_versions(session)
+    try:
+        await session.commit()
+    except StaleDataError as error:
+        await session.rollback()
+        for model, versions in expected.items():
+            mapper = sa_inspect(model)
+            pk, version = mapper.primary_key[0], mapper.version_id_col
+            current = dict(
+                (
+                    await session.execute(
+                        select(pk, version).where(pk.in_(list(versions)))
+                    )
+                ).all()
+            )
+            stale = [
+                ident
+                for ident, loaded in versions.items()
+                if current.get(ident) != loaded
+            ]
+            if stale:
+                raise ConcurrentUpdateError(model, stale) from error
+        raise
+
+
+async def retry_on_conflict(
+    session_factory: async_sessionmaker,
+    model: type,
+    ident: Hashable,
+    mutate: Callable[[Any], Any],
+    attempts: int = 5,
+    backoff: float = 0.01,
+    options: Iterable = (),
+) -> Any:
+    """
+    Load ``model`` ``ident``, apply ``mutate`` (sync or async) and commit.
+
+    On a version conflict the row is reloaded and ``mutate`` runs again, up to
+    ``attempts`` times with jittered exponential backoff; ``mutate`` must be
+    safe to repeat.  Returns what ``mutate`` returned.  Raises ``LookupError``
+    if the row does not exist and ``ConcurrentUpdateError`` if every attempt
+    lost.
+    """
+    _versioned_mapper(model)
+    for attempt in range(1, attempts + 1):
+        async with session_factory() as session:
+            obj = await session.get(model, ident, options=list(options))
+            if obj is None:
+                raise LookupError(f"{model.__name__} {ident} does not exist")
+            result = mutate(obj)
+            if inspect.isawaitable(result):
+                result = await result
+            try:
+                await commit(session)
+                return result
+            except ConcurrentUpdateError as error:
+                if attempt == attempts:
+                    raise ConcurrentUpdateError(model, error.ids, attempts) from error
+                logger.debug(f"{error}, retrying")
+        jitter = random.uniform(0.5, 1.5)  # noqa: S311
+        await asyncio.sleep(backoff * 2 ** (attempt - 1) * jitter)
+
+
+async def conditional_update(
+    session: AsyncSession, model: type, rows: Sequence[Mapping[str, Any]]
+) -> ConditionalUpdateResult:
+    """
+    Update many rows in one statement, each only at its expected version.
+
+    Every row maps the primary key, ``version`` (the version read) and the
+    same set of new column values.  Winning rows get the next version; rows
+    whose version moved on or that were deleted are returned as conflicts.
+    Objects already loaded in ``session`` are not refreshed.
+    """
+    if not rows:
+        return ConditionalUpdateResult([], [])
+    mapper = _versioned_mapper(model)
+    table = mapper.local_table
+    pk, version = mapper.primary_key[0], mapper.version_id_col
+    names = list(rows[0])
+    if any(list(row) != names for row in rows):
+        raise ValueError("every row must set the same columns")
+    changed = [name for name in names if name not in {pk.key, version.key}]
+    if pk.key not in names or version.key not in names or not changed:
+        raise ValueError(f"rows need {pk.key!r}, {version.key!r} and new values")
+
+    data = values(
+        *(column(name, table.c[name].type) for name in names), name="versioned_rows"
+    ).data([tuple(row[name] for name in names) for row in rows])
+    stmt = (
+        update(table)
+        .where(pk == data.c[pk.key], version == data.c[version.key])
+        .values({
+            **{name: data.c[name] for name in changed},
+            version.key: version + 1,
+        })
+        .returning(pk)
+    )
+    updated = list((await session.execute(stmt)).scalars())
+    won = set(updated)
+    conflicts = [row[pk.key] for row in rows if row[pk.key] not in won]
+    return ConditionalUpdateResult(updated, conflicts)
@@ -1,4 +1,5 @@
 import pathlib
+from uuid import UUID
 
 import pydantic
 import pydantic_settings
@@ -60,3 +61,20 @@ class PostgreSQLConnectionSettings(pydantic_settings.BaseSettings):
 
 
 postgresql_connection_settings = PostgreSQLConnectionSettings()
+
+
+class ShardingSettings(pydantic_settings.BaseSettings):
+    """Horizontal sharding by sport, off while DB_SHARD_URLS is empty.
+
+    The regular database is the home shard; DB_SHARD_URLS (JSON) names the
+    others and DB_SPORT_SHARDS (JSON) maps sport ids to shard names.  Sports
+    that are not mapped stay on the home shard.
+    """
+
+    DB_HOME_SHARD: str = "home"
+    DB_SHARD_URLS: dict[str, pydantic.SecretStr] = {}
+    DB_SPORT_SHARDS: dict[UUID, str] = {}
+    DB_REPLICATE_SHARED: bool = True
+
+
+sharding_settings = ShardingSettings()
@@ -1,10 +1,48 @@
-from sqlalchemy import MetaData, create_engine, text
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import os
+import weakref
+
+from sqlalchemy import Engine, MetaData, create_engine, event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from flux_orm.config import postgresql_connection_settings
 
+
+def make_fork_safe(engine: Engine | AsyncEngine) -> None:
+    """
+    Keep a forked child away from the pooled connections of its parent.
+
+    The child starts with an empty pool (the parent's sockets are dropped, not
+    closed, so the parent keeps using them), and a connection checked out in
+    another process than the one that opened it is discarded as a fallback.
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    engine_ref = weakref.ref(engine)
+
+    def dispose_in_child() -> None:
+        if (forked := engine_ref()) is not None:
+            forked.dispose(close=False)
+
+    os.register_at_fork(after_in_child=dispose_in_child)
+
+    @event.listens_for(engine, "connect")
+    def remember_pid(dbapi_connection, connection_record):
+        connection_record.info["pid"] = os.getpid()
+
+    @event.listens_for(engine, "checkout")
+    def check_pid(dbapi_connection, connection_record, connection_proxy):
+        pid = os.getpid()
+        if connection_record.info["pid"] != pid:
+            connection_record.dbapi_connection = None
+            connection_proxy.dbapi_connection = None
+            raise exc.DisconnectionError(
+                f"Connection opened by process {connection_record.info['pid']} "
+                f"checked out by process {pid}"
+            )
+
+
 sync_engine = create_engine(postgresql_connection_settings.sync_url)
+make_fork_safe(sync_engine)
 
 new_sync_session = sessionmaker(sync_engine, expire_on_commit=True)
 
@@ -15,11 +53,14 @@ async_engine = create_async_engine(
     max_overflow=30,
     pool_timeout=60,
 )
+make_fork_safe(async_engine)
 new_session = async_sessionmaker(async_engine, expire_on_commit=True)
 
 
 class Model(DeclarativeBase):
-    pass
+    # ids and timestamps are generated by the server, fetch them with RETURNING
+    # instead of expiring the attributes after INSERT/UPDATE.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 Metadata = MetaData()
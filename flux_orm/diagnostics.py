@@ -0,0 +1,278 @@
+"""Read-only performance diagnostics from the PostgreSQL statistics views.
+
+Every report is an ``async`` function taking an ``AsyncConnection`` and
+returning a list of plain dicts, so the output can be printed as a table or
+dumped as JSON (see ``python -m flux_orm --help``).  Figures come from the
+cumulative statistics collector and are estimates: they reset with
+``pg_stat_reset()`` and lag behind by up to a few hundred milliseconds.
+"""
+
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+Report = list[dict[str, Any]]
+
+TABLE_SIZES = text("""
+SELECT
+    s.relname AS table,
+    s.n_live_tup AS rows,
+    pg_relation_size(s.relid) AS heap_bytes,
+    COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0) AS toast_bytes,
+    pg_indexes_size(s.relid) AS index_bytes,
+    pg_total_relation_size(s.relid) AS total_bytes
+FROM pg_stat_user_tables s
+JOIN pg_class c ON c.oid = s.relid
+WHERE s.schemaname = :schema
+ORDER BY total_bytes DESC, s.relname
+""")
+
+# Without pgstattuple the dead tuple share of the heap is the best cheap
+# estimate of the space a VACUUM would make reusable.
+BLOAT = text("""
+SELECT
+    relname AS table,
+    n_live_tup AS live_tuples,
+    n_dead_tup AS dead_tuples,
+    ROUND(n_dead_tup::numeric / NULLIF(n_live_tup + n_dead_tup, 0), 4) AS dead_ratio,
+    (pg_relation_size(relid) * n_dead_tup
+        / NULLIF(n_live_tup + n_dead_tup, 0))::bigint AS estimated_bloat_bytes,
+    GREATEST(last_vacuum, last_autovacuum) AS last_vacuum,
+    GREATEST(last_analyze, last_autoanalyze) AS last_analyze
+FROM pg_stat_user_tables
+WHERE schemaname = :schema
+ORDER BY dead_tuples DESC, relname
+""")
+
+INDEX_USAGE = text("""
+SELECT
+    s.relname AS table,
+    s.indexrelname AS index,
+    s.idx_scan AS scans,
+    s.idx_tup_read AS tuples_read,
+    s.idx_tup_fetch AS tuples_fetched,
+    pg_relation_size(s.indexrelid) AS bytes,
+    t.seq_scan AS table_seq_scans,
+    i.indisunique AS is_unique,
+    i.indisprimary AS is_primary
+FROM pg_stat_user_indexes s
+JOIN pg_index i ON i.indexrelid = s.indexrelid
+JOIN pg_stat_user_tables t ON t.relid = s.relid
+WHERE s.schemaname = :schema
+ORDER BY s.relname, s.idx_scan DESC, s.indexrelname
+""")
+
+INDEX_DEFINITIONS = text("""
+SELECT
+    t.relname AS table,
+    c.relname AS index,
+    i.indkey::int2[] AS columns,
+    i.indclass::oid[] AS opclasses,
+    pg_get_expr(i.indexprs, i.indrelid) AS expressions,
+    pg_get_expr(i.indpred, i.indrelid) AS predicate,
+    i.indisunique AS is_unique,
+    am.amname AS method,
+    pg_relation_size(c.oid) AS bytes
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_class t ON t.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+JOIN pg_am am ON am.oid = c.relam
+WHERE n.nspname = :schema
+ORDER BY t.relname, c.relname
+""")
+
+CACHE_HIT_RATIO = text("""
+SELECT
+    relname AS table,
+    ROUND(heap_blks_hit::numeric
+        / NULLIF(heap_blks_hit + heap_blks_read, 0), 4) AS heap_hit_ratio,
+    ROUND(idx_blks_hit::numeric
+        / NULLIF(idx_blks_hit + idx_blks_read, 0), 4) AS index_hit_ratio,
+    heap_blks_read + COALESCE(idx_blks_read, 0) AS blocks_read
+FROM pg_statio_user_tables
+WHERE schemaname = :schema
+UNION ALL
+SELECT
+    '(database)',
+    ROUND(blks_hit::numeric / NULLIF(blks_hit + blks_read, 0), 4),
+    NULL,
+    blks_read
+FROM pg_stat_database
+WHERE datname = current_database()
+ORDER BY blocks_read DESC
+""")
+
+LONG_TRANSACTIONS = text("""
+SELECT
+    pid,
+    usename AS user,
+    application_name,
+    state,
+    wait_event_type,
+    now() - xact_start AS transaction_age,
+    now() - query_start AS query_age,
+    LEFT(query, 200) AS query
+FROM pg_stat_activity
+WHERE datname = current_database()
+  AND xact_start IS NOT NULL
+  AND pid <> pg_backend_pid()
+  AND now() - xact_start > make_interval(secs => :min_seconds)
+ORDER BY xact_start
+""")
+
+LOCK_WAITS = text("""
+SELECT
+    waiting.pid,
+    pg_blocking_pids(waiting.pid) AS blocked_by,
+    waiting.wait_event_type,
+    waiting.wait_event,
+    now() - waiting.query_start AS waiting_for,
+    LEFT(waiting.query, 200) AS query,
+    LEFT(blocker.query, 200) AS blocking_query
+FROM pg_stat_activity waiting
+LEFT JOIN pg_stat_activity blocker
+    ON blocker.pid = (pg_blocking_pids(waiting.pid))[1]
+WHERE waiting.datname = current_database()
+  AND cardinality(pg_blocking_pids(waiting.pid)) > 0
+ORDER BY waiting.query_start
+""")
+
+
+async def _fetch(conn: AsyncConnection, statement, **params) -> Report:
+    return [dict(row) for row in (await conn.execute(statement, params)).mappings()]
+
+
+async def table_sizes(conn: AsyncConnection, schema: str = "public") -> Report:
+    """Estimated row count and heap, TOAST and index sizes of every table."""
+    return await _fetch(conn, TABLE_SIZES, schema=schema)
+
+
+async def bloat(conn: AsyncConnection, schema: str = "public") -> Report:
+    """Dead tuples, estimated reclaimable heap bytes and last (auto)vacuum."""
+    return await _fetch(conn, BLOAT, schema=schema)
+
+
+async def index_usage(conn: AsyncConnection, schema: str = "public") -> Report:
+    return await _fetch(conn, INDEX_USAGE, schema=schema)
+
+
+async def unused_indexes(conn: AsyncConnection, schema: str = "public") -> Report:
+    """Never scanned indexes that do not enforce uniqueness."""
+    return [
+        row
+        for row in await index_usage(conn, schema)
+        if row["scans"] == 0 and not row["is_unique"]
+    ]
+
+
+def _duplicates(indexes: Report) -> Report:
+    found = []
+    plain = [
+        index
+        for index in indexes
+        if index["expressions"] is None and index["predicate"] is None
+    ]
+    for index in plain:
+        if index["is_unique"]:
+            continue
+        width = len(index["columns"])
+        covering = [
+            other
+            for other in plain
+            if other is not index
+            and other["table"] == index["table"]
+            and other["method"] == index["method"]
+            and other["columns"][:width] == index["columns"]
+            and other["opclasses"][:width] == index["opclasses"]
+            # Of two identical non-unique indexes only the second one is reported.
+            and not (
+                len(other["columns"]) == width
+                and not other["is_unique"]
+                and other["index"] > index["index"]
+            )
+        ]
+        if not covering:
+            continue
+        best = min(
+            covering,
+            key=lambda other: (
+                len(other["columns"]) != width,
+                not other["is_unique"],
+                other["index"],
+            ),
+        )
+        found.append(
+            {
+                "table": index["table"],
+                "index": index["index"],
+                "covered_by": best["index"],
+                "kind": "duplicate" if len(best["columns"]) == width else "prefix",
+                "bytes": index["bytes"],
+            }
+        )
+    return found
+
+
+async def duplicate_indexes(conn: AsyncConnection, schema: str = "public") -> Report:
+    """Non-unique indexes whose columns are the same as or a prefix of another index."""
+    return _duplicates(await _fetch(conn, INDEX_DEFINITIONS, schema=schema))
+
+
+async def cache_hit_ratio(conn: AsyncConnection, schema: str = "public") -> Report:
+    return await _fetch(conn, CACHE_HIT_RATIO, schema=schema)
+
+
+async def long_transactions(
+    conn: AsyncConnection, schema: str = "public", min_seconds: float = 60.0
+) -> Report:
+    """Transactions of other sessions open for longer than ``min_seconds``."""
+    return await _fetch(conn, LONG_TRANSACTIONS, min_seconds=min_seconds)
+
+
+async def lock_waits(conn: AsyncConnection, schema: str = "public") -> Report:
+    """Sessions waiting on a lock with the pids and query of the blockers."""
+    return await _fetch(conn, LOCK_WAITS)
+
+
+REPORTS: dict[str, Callable[..., Awaitable[Report]]] = {
+    "tables": table_sizes,
+    "bloat": bloat,
+    "indexes": index_usage,
+    "unused-indexes": unused_indexes,
+    "duplicate-indexes": duplicate_indexes,
+    "cache": cache_hit_ratio,
+    "transactions": long_transactions,
+    "locks": lock_waits,
+}
+
+
+def to_json(reports: dict[str, Report]) -> str:
+    return json.dumps(reports, default=str, indent=2)
+
+
+def to_table(rows: Report) -> str:
+    """Render rows as an aligned plain text table."""
+    if not rows:
+        return "(no rows)"
+    columns = list(rows[0])
+    cells = [
+        ["" if row[column] is None else str(row[column]) for column in columns]
+        for row in rows
+    ]
+    widths = [
+        max(len(column), *(len(line[i]) for line in cells))
+        for i, column in enumerate(columns)
+    ]
+    lines = [
+        "  ".join(column.ljust(width) for column, width in zip(columns, widths, strict=True)),
+        "  ".join("-" * width for width in widths),
+    ]
+    lines.extend(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths, strict=True))
+        for line in cells
+    )
+    return "\n".join(line.rstrip() for line in lines)
@@ -0,0 +1,413 @@
+"""Streaming export of tables and queries to Parquet.
+
+Rows are read through a server-side cursor ``batch_size`` at a time, turned
+into an Arrow record batch and written as one row group, so memory depends on
+the batch size and not on the size of the table::
+
+    async with async_engine.connect() as conn:
+        await export(conn, Match, "/data/flux", incremental=True)
+
+    python -m flux_orm.export /data/flux match team_in_match --incremental
+
+Files are written hive style, ``<directory>/<name>/[<column>=<value>/]
+part-<run>-<n>.parquet``, and appear only once complete; a failed export
+removes the files of its run.  JSON columns are kept as JSON text or, with
+``json_mode="flatten"``, split into one text column per top-level key
+(``stats.kills``), the keys being collected server-side first.  With
+``partition_by`` the rows are ordered by that column and one file is open at
+a time.
+
+Incremental exports read the rows whose ``updated_at`` lies between the
+watermark stored in ``<directory>/<name>/_watermark`` and the database time
+minus ``settle``; the margin leaves transactions that were still running at
+that moment to the next export.
+"""
+
+import argparse
+import asyncio
+import enum
+import json
+import pathlib
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    ARRAY,
+    JSON,
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    Integer,
+    Interval,
+    Numeric,
+    Select,
+    SmallInteger,
+    String,
+    Table,
+    Time,
+    Uuid,
+    case,
+    cast,
+    func,
+    select,
+    true,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from flux_orm.custom_logger import logger
+from flux_orm.database import Model
+
+WATERMARK_FILE = "_watermark"
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+class ExportResult(NamedTuple):
+    name: str
+    rows: int
+    files: list[pathlib.Path]
+    watermark: datetime | None
+
+
+class _Column(NamedTuple):
+    name: str
+    arrow_type: pa.DataType
+    convert: Callable[[Any], Any] | None
+
+
+def _identity(value):
+    return value
+
+
+def _arrow_type(sa_type) -> tuple[pa.DataType, Callable[[Any], Any] | None]:
+    """Arrow type of a SQLAlchemy type and the conversion of non-null values."""
+    if isinstance(sa_type, JSON):
+        return pa.string(), lambda value: json.dumps(value, default=str)
+    if isinstance(sa_type, Uuid):
+        return pa.string(), str
+    if isinstance(sa_type, Enum):
+        return (
+            pa.string(),
+            lambda value: value.name if isinstance(value, enum.Enum) else value,
+        )
+    if isinstance(sa_type, Boolean):
+        return pa.bool_(), None
+    if isinstance(sa_type, SmallInteger):
+        return pa.int16(), None
+    if isinstance(sa_type, BigInteger):
+        return pa.int64(), None
+    if isinstance(sa_type, Integer):
+        return pa.int32(), None
+    if isinstance(sa_type, Float | Numeric):
+        return pa.float64(), float
+    if isinstance(sa_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sa_type.timezone else None), None
+    if isinstance(sa_type, Date):
+        return pa.date32(), None
+    if isinstance(sa_type, Time):
+        return pa.time64("us"), None
+    if isinstance(sa_type, Interval):
+        return pa.duration("us"), None
+    if isinstance(sa_type, ARRAY):
+        item_type, convert = _arrow_type(sa_type.item_type)
+        if convert is None:
+            return pa.list_(item_type), None
+        return pa.list_(item_type), lambda values: [
+            None if value is None else convert(value) for value in values
+        ]
+    if isinstance(sa_type, String):
+        return pa.string(), None
+    return pa.string(), str
+
+
+def _source_statement(source) -> tuple[str | None, Select]:
+    if isinstance(source, Select):
+        return None, source
+    table = source if isinstance(source, Table) else sa_inspect(source).local_table
+    # Core select: deferred columns of the mapping are exported as well.
+    return table.name, select(table)
+
+
+async def _flatten_json(
+    conn: AsyncConnection, stmt: Select, json_columns: Sequence[str]
+) -> Select:
+    """Replace each JSON column by one text column per top-level key."""
+    source = stmt.subquery("source")
+    columns = []
+    for column in source.c:
+        if column.name not in json_columns:
+            columns.append(column)
+            continue
+        value = cast(column, JSONB)
+        keys = (
+            func
+            .jsonb_object_keys(case((func.jsonb_typeof(value) == "object", value)))
+            .table_valued("key")
+            .render_derived(name="keys")
+        )
+        names = await conn.execute(
+            select(keys.c.key)
+            .select_from(source)
+            .join(keys, true())
+            .distinct()
+            .order_by(keys.c.key)
+        )
+        columns.extend(
+            value[name].astext.label(f"{column.name}.{name}")
+            for name in names.scalars()
+        )
+    return select(*columns)
+
+
+def _partition_path(
+    directory: pathlib.Path, partition_by: str | None, value
+) -> pathlib.Path:
+    if partition_by is None:
+        return directory
+    value = NULL_PARTITION if value is None else getattr(value, "name", value)
+    return directory / f"{partition_by}={value}"
+
+
+class _PartWriter:
+    """Writes Parquet files of at most ``rows_per_file`` rows, one at a time."""
+
+    def __init__(self, schema: pa.Schema, run: str, rows_per_file: int):
+        self.schema = schema
+        self.run = run
+        self.rows_per_file = rows_per_file
+        self.files: list[pathlib.Path] = []
+        self._writer: pq.ParquetWriter | None = None
+        self._path: pathlib.Path | None = None
+        self._rows = 0
+
+    def write(self, partition: pathlib.Path, batch: pa.RecordBatch) -> None:
+        if self._path is not None and self._path.parent != partition:
+            self.close()
+        while batch.num_rows:
+            if self._writer is None:
+                self._open(partition)
+            part = batch.slice(0, self.rows_per_file - self._rows)
+            self._writer.write_batch(part)
+            self._rows += part.num_rows
+            batch = batch.slice(part.num_rows)
+            if self._rows >= self.rows_per_file:
+                self.close()
+
+    def _open(self, partition: pathlib.Path) -> None:
+        partition.mkdir(parents=True, exist_ok=True)
+        self._path = partition / f"part-{self.run}-{len(self.files):05d}.parquet"
+        # Hidden until complete, dataset readers skip dot files.
+        self._writer = pq.ParquetWriter(
+            self._path.with_name(f".{self._path.name}"), self.schema
+        )
+        self._rows = 0
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._path.with_name(f".{self._path.name}").rename(self._path)
+        self.files.append(self._path)
+        self._writer = self._path = None
+
+    def abort(self) -> None:
+        """Remove the open and the finished files; the run is exported again."""
+        if self._writer is not None:
+            self._writer.close()
+            self._path.with_name(f".{self._path.name}").unlink(missing_ok=True)
+            self._writer = self._path = None
+        for path in self.files:
+            path.unlink(missing_ok=True)
+        self.files = []
+
+
+def _read_watermark(directory: pathlib.Path) -> datetime | None:
+    path = directory / WATERMARK_FILE
+    if not path.exists():
+        return None
+    return datetime.fromisoformat(path.read_text().strip())
+
+
+def _write_watermark(directory: pathlib.Path, watermark: datetime) -> None:
+    path = directory / WATERMARK_FILE
+    temporary = path.with_name(f".{WATERMARK_FILE}")
+    temporary.write_text(watermark.isoformat())
+    temporary.replace(path)
+
+
+async def export(
+    conn: AsyncConnection,
+    source,
+    directory: str | pathlib.Path,
+    name: str | None = None,
+    batch_size: int = 10_000,
+    rows_per_file: int = 1_000_000,
+    partition_by: str | None = None,
+    json_mode: str = "string",
+    since: datetime | None = None,
+    incremental: bool = False,
+    watermark_column: str = "updated_at",
+    settle: timedelta = timedelta(minutes=1),
+) -> ExportResult:
+    """
+    Export a mapped class, a table or a ``Select`` to Parquet files.
+
+    ``name`` (the table name by default, required for a ``Select``) is the
+    subdirectory.  Rows changed after ``since`` are exported when it is given;
+    ``incremental`` takes it from the stored watermark and stores the new one
+    once the files are written.  Run it in a REPEATABLE READ transaction to get
+    one snapshot across the key collection of ``json_mode="flatten"`` and the
+    export.
+    """
+    if json_mode not in {"string", "flatten"}:
+        raise ValueError(f"json_mode must be 'string' or 'flatten', not {json_mode!r}")
+    table_name, stmt = _source_statement(source)
+    name = name or table_name
+    if name is None:
+        raise ValueError("name is required when exporting a Select")
+    target = pathlib.Path(directory) / name
+    target.mkdir(parents=True, exist_ok=True)
+
+    watermark = None
+    if incremental:
+        since = _read_watermark(target) if since is None else since
+    if since is not None or incremental:
+        column = stmt.selected_columns[watermark_column]
+        now = (
+            await conn.execute(select(func.timezone("utc", func.now())))
+        ).scalar_one()
+        watermark = now - settle
+        stmt = stmt.where(column <= watermark)
+        if since is not None:
+            stmt = stmt.where(column > since)
+
+    if json_mode == "flatten":
+        json_columns = [
+            column.name
+            for column in stmt.selected_columns
+            if isinstance(column.type, JSON)
+        ]
+        if json_columns:
+            stmt = await _flatten_json(conn, stmt, json_columns)
+    if partition_by is not None:
+        stmt = stmt.order_by(stmt.selected_columns[partition_by])
+
+    columns = [
+        _Column(column.name, *_arrow_type(column.type))
+        for column in stmt.selected_columns
+    ]
+    partition_index = None
+    if partition_by is not None:
+        # The value is in the directory name, hive style.
+        partition_index = [column.name for column in columns].index(partition_by)
+    schema = pa.schema([
+        (column.name, column.arrow_type)
+        for i, column in enumerate(columns)
+        if i != partition_index
+    ])
+
+    run = datetime.now().strftime("%Y%m%dT%H%M%S")  # noqa: DTZ005
+    writer = _PartWriter(schema, run, rows_per_file)
+    rows = 0
+    try:
+        result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+        async for batch in result.partitions(batch_size):
+            for partition, chunk in _split(batch, partition_index):
+                writer.write(
+                    _partition_path(target, partition_by, partition),
+                    _record_batch(columns, schema, chunk, partition_index),
+                )
+            rows += len(batch)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+
+    if incremental:
+        _write_watermark(target, watermark)
+    logger.info(f"Exported {rows} rows of {name} into {len(writer.files)} files")
+    return ExportResult(name, rows, writer.files, watermark)
+
+
+def _record_batch(
+    columns: Sequence[_Column],
+    schema: pa.Schema,
+    rows: Sequence,
+    skip: int | None = None,
+) -> pa.RecordBatch:
+    arrays = []
+    for i, values in enumerate(zip(*rows, strict=True)):
+        if i == skip:
+            continue
+        column = columns[i]
+        convert = column.convert or _identity
+        arrays.append(
+            pa.array(
+                [None if value is None else convert(value) for value in values],
+                type=column.arrow_type,
+            )
+        )
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _split(batch: Sequence, partition_index: int | None):
+    """Consecutive runs of rows with the same partition value."""
+    if partition_index is None:
+        yield None, batch
+        return
+    start = 0
+    for i in range(1, len(batch) + 1):
+        if (
+            i == len(batch)
+            or batch[i][partition_index] != batch[start][partition_index]
+        ):
+            yield batch[start][partition_index], batch[start:i]
+            start = i
+
+
+async def export_tables(
+    engine: AsyncEngine, names: Sequence[str], directory: str | pathlib.Path, **kwargs
+) -> list[ExportResult]:
+    """Export tables of the metadata by name, each in its own snapshot."""
+    results = []
+    for name in names:
+        async with engine.connect() as connection:
+            conn = await connection.execution_options(isolation_level="REPEATABLE READ")
+            async with conn.begin():
+                results.append(
+                    await export(conn, Model.metadata.tables[name], directory, **kwargs)
+                )
+    return results
+
+
+if __name__ == "__main__":
+    from flux_orm.database import async_engine
+
+    parser = argparse.ArgumentParser(prog="python -m flux_orm.export")
+    parser.add_argument("directory")
+    parser.add_argument("tables", nargs="+", choices=sorted(Model.metadata.tables))
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--rows-per-file", type=int, default=1_000_000)
+    parser.add_argument("--partition-by")
+    parser.add_argument("--json", choices=["string", "flatten"], default="string")
+    args = parser.parse_args()
+    asyncio.run(
+        export_tables(
+            async_engine,
+            args.tables,
+            args.directory,
+            batch_size=args.batch_size,
+            rows_per_file=args.rows_per_file,
+            partition_by=args.partition_by,
+            json_mode=args.json,
+            incremental=args.incremental,
+        )
+    )
@@ -0,0 +1,156 @@
+"""Fuzzy lookup of teams, players and competitions by name with ``pg_trgm``.
+
+Sources spell names differently ("Natus Vincere", "Natus Vincere Esports",
+"natus-vincere") and exact matches miss them; abbreviations only match a
+column that holds them, such as ``pretty_name``.  ``fuzzy_lookup`` finds the
+rows whose trigram-indexed name columns (``Team.name``/``pretty_name``,
+``TeamMember.nickname``/``name``, ``Competition.name``) are similar to a text,
+best first; ``fuzzy_lookup_many`` resolves many texts in one statement with a
+``LATERAL`` subquery per text::
+
+    matches = await fuzzy_lookup_many(session, Team, ["natus vincere", "g2 esports"])
+    best = {text: found[0].entity for text, found in matches.items() if found}
+
+Candidates are found with the ``%`` operator, which the GIN trigram indexes
+serve, so a lookup reads a few index pages instead of scoring every row.  The
+operator compares with the ``pg_trgm.similarity_threshold`` setting; the
+lookups set it to ``threshold`` for the rest of the current transaction.
+Similarities are between 0 and 1, case does not matter.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any, NamedTuple
+
+from sqlalchemy import ARRAY, Select, Text, bindparam, cast, func, or_, select, true
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
+
+from flux_orm.models import trigram
+
+DEFAULT_THRESHOLD = 0.3
+
+
+class FuzzyMatch(NamedTuple):
+    entity: Any
+    similarity: float
+
+
+def _searched(model) -> tuple[Any, list]:
+    mapper = sa_inspect(model)
+    if len(mapper.primary_key) != 1:
+        raise ValueError(f"{model.__name__} must have a single-column primary key")
+    columns = trigram.indexed_columns(mapper.local_table)
+    if not columns:
+        raise ValueError(f"{model.__name__} has no trigram indexed columns")
+    return mapper.primary_key[0], columns
+
+
+def _similarity(columns: Sequence, text):
+    # similarity() of a NULL column is NULL, which greatest() skips.
+    return func.greatest(*(func.similarity(column, text) for column in columns))
+
+
+def _similar(columns: Sequence, text):
+    return or_(*(column.op("%")(text) for column in columns))
+
+
+def _check_threshold(threshold: float) -> None:
+    if not 0 <= threshold <= 1:
+        raise ValueError("threshold must be between 0 and 1")
+
+
+async def _set_threshold(session: AsyncSession, threshold: float) -> None:
+    await session.execute(
+        select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True))
+    )
+
+
+def fuzzy_lookup_statement(model, text: str, limit: int = 5) -> Select:
+    """Rows of ``(model, similarity)`` similar to ``text``, best first."""
+    pk, columns = _searched(model)
+    text = bindparam("text", text, type_=Text)
+    similarity = _similarity(columns, text).label("similarity")
+    return (
+        select(model, similarity)
+        .where(_similar(columns, text))
+        .order_by(similarity.desc(), pk)
+        .limit(limit)
+    )
+
+
+def fuzzy_lookup_many_statement(model, texts: Sequence[str], limit: int = 1) -> Select:
+    """Rows of ``(text, model, similarity)``, in the order of ``texts``."""
+    pk, columns = _searched(model)
+    array = ARRAY(Text)
+    queries = (
+        func
+        .unnest(cast(bindparam("texts", list(texts), type_=array), array))
+        .table_valued("text", with_ordinality="position")
+        .render_derived(name="queries")
+    )
+    candidate = sa_inspect(model).local_table.alias("candidate")
+    candidate_columns = [candidate.c[column.name] for column in columns]
+    similarity = _similarity(candidate_columns, queries.c.text).label("similarity")
+    candidates = (
+        select(candidate.c[pk.name].label("ident"), similarity)
+        .where(_similar(candidate_columns, queries.c.text))
+        .order_by(similarity.desc(), candidate.c[pk.name])
+        .limit(limit)
+        .lateral("candidates")
+    )
+    return (
+        select(queries.c.text, model, candidates.c.similarity)
+        .select_from(queries)
+        .join(candidates, true())
+        .join(model, pk == candidates.c.ident)
+        .order_by(
+            queries.c.position, candidates.c.similarity.desc(), candidates.c.ident
+        )
+    )
+
+
+async def fuzzy_lookup(
+    session: AsyncSession,
+    model,
+    text: str,
+    limit: int = 5,
+    threshold: float = DEFAULT_THRESHOLD,
+    options: Sequence[ORMOption] = (),
+) -> list[FuzzyMatch]:
+    """Up to ``limit`` rows of ``model`` at least ``threshold`` similar to ``text``."""
+    _searched(model)
+    _check_threshold(threshold)
+    if not text.strip() or limit <= 0:
+        return []
+    await _set_threshold(session, threshold)
+    stmt = fuzzy_lookup_statement(model, text, limit).options(*options)
+    return [FuzzyMatch(entity, score) for entity, score in await session.execute(stmt)]
+
+
+async def fuzzy_lookup_many(
+    session: AsyncSession,
+    model,
+    texts: Iterable[str],
+    limit: int = 1,
+    threshold: float = DEFAULT_THRESHOLD,
+    options: Sequence[ORMOption] = (),
+) -> dict[str, list[FuzzyMatch]]:
+    """
+    ``fuzzy_lookup`` for many texts in one statement.
+
+    Every distinct text is a key of the result, texts without a similar row
+    map to an empty list.
+    """
+    _searched(model)
+    _check_threshold(threshold)
+    texts = list(dict.fromkeys(texts))
+    result: dict[str, list[FuzzyMatch]] = {text: [] for text in texts}
+    searched = [text for text in texts if text.strip()]
+    if not searched or limit <= 0:
+        return result
+    await _set_threshold(session, threshold)
+    stmt = fuzzy_lookup_many_statement(model, searched, limit).options(*options)
+    for text, entity, score in await session.execute(stmt):
+        result[text].append(FuzzyMatch(entity, score))
+    return result
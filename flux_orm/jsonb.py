@@ -0,0 +1,177 @@
+"""Partial in-place updates of JSONB columns.
+
+``MutableDict`` columns (``Team.stats``, ``Team.regalia``, ``Match.match_streams``,
+``Match.status_payload``) rewrite the whole document on every change.  The helpers
+below send only the changed keys with ``||`` / ``jsonb_set`` / ``-`` and keep
+already loaded objects in sync, reloading only documents that were NULL.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import ARRAY, Text, cast, column, func, literal, update, values
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+JSONPath = Sequence[str]
+
+
+def _primary_key(model):
+    pk = sa_inspect(model).primary_key
+    if len(pk) != 1:
+        raise ValueError(f"{model.__name__} must have a single-column primary key")
+    return pk[0]
+
+
+def _empty_object() -> ColumnElement:
+    return cast(literal("{}"), JSONB)
+
+
+def jsonb_patch(
+    target: ColumnElement,
+    set_: Mapping[str, Any] | None = None,
+    remove: Iterable[str] = (),
+    paths: Mapping[JSONPath, Any] | None = None,
+) -> ColumnElement:
+    """
+    Build a SQL expression that patches ``target`` in place.
+
+    ``set_`` is merged into the top level with ``||``, ``remove`` drops top-level
+    keys and ``paths`` sets nested values with ``jsonb_set``.  As in PostgreSQL,
+    a nested path is only written when all of its parent objects exist.
+    """
+    expr = func.coalesce(target, _empty_object())
+    remove = list(remove)
+    if remove:
+        expr = expr.op("-", return_type=JSONB)(cast(remove, ARRAY(Text)))
+    if set_:
+        expr = expr.op("||", return_type=JSONB)(cast(dict(set_), JSONB))
+    for path, value in (paths or {}).items():
+        expr = func.jsonb_set(
+            expr,
+            cast(list(path), ARRAY(Text)),
+            cast(value, JSONB),
+            True,
+            type_=JSONB,
+        )
+    return expr
+
+
+def _apply_in_memory(
+    document: dict,
+    set_: Mapping[str, Any] | None,
+    remove: Iterable[str],
+    paths: Mapping[JSONPath, Any] | None,
+) -> None:
+    # dict methods are called directly so MutableDict does not flag the
+    # attribute as modified: the database already holds the new value.
+    for key in remove:
+        dict.pop(document, key, None)
+    if set_:
+        dict.update(document, set_)
+    for path, value in (paths or {}).items():
+        node = document
+        for part in path[:-1]:
+            node = node.get(part) if isinstance(node, dict) else None
+        if isinstance(node, dict):
+            dict.__setitem__(node, path[-1], value)
+
+
+async def _sync_identity_map(
+    session: AsyncSession,
+    attr: InstrumentedAttribute,
+    ident,
+    set_: Mapping[str, Any] | None,
+    remove: Iterable[str],
+    paths: Mapping[JSONPath, Any] | None,
+) -> None:
+    key = session.identity_key(attr.class_, ident)
+    obj = session.sync_session.identity_map.get(key)
+    if obj is None:
+        return
+    state = sa_inspect(obj)
+    if attr.key not in state.dict and (
+        attr.key in state.expired_attributes
+        or state.manager[attr.key].impl.callable_ is not None
+    ):
+        # Expired or deferred: the next access reads the new value anyway.
+        return
+    document = state.dict.get(attr.key)
+    if document is None:
+        # Nothing to patch in memory: load the new document, so MutableDict
+        # tracks it like any other loaded value.
+        await session.refresh(obj, [attr.key])
+        return
+    _apply_in_memory(document, set_, list(remove), paths)
+
+
+async def patch_jsonb(
+    session: AsyncSession,
+    attr: InstrumentedAttribute,
+    ids: Iterable,
+    set_: Mapping[str, Any] | None = None,
+    remove: Iterable[str] = (),
+    paths: Mapping[JSONPath, Any] | None = None,
+) -> int:
+    """
+    Apply the same patch to ``attr`` of every row in ``ids`` with one UPDATE.
+
+    Example: ``await patch_jsonb(session, Team.stats, [team_id], {"wins": 6})``.
+    Returns the number of updated rows.
+    """
+    ids = list(ids)
+    remove = list(remove)
+    if not ids or not (set_ or remove or paths):
+        return 0
+    model = attr.class_
+    pk = _primary_key(model)
+    stmt = (
+        update(model)
+        .where(pk.in_(ids))
+        .values({attr.key: jsonb_patch(attr, set_, remove, paths)})
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    for ident in ids:
+        await _sync_identity_map(session, attr, ident, set_, remove, paths)
+    return result.rowcount
+
+
+async def patch_jsonb_many(
+    session: AsyncSession,
+    attr: InstrumentedAttribute,
+    patches: Mapping[Any, Mapping[str, Any]],
+) -> int:
+    """
+    Merge a different top-level patch into ``attr`` of each row with one UPDATE.
+
+    ``patches`` maps primary key to the keys that changed for that row, e.g.
+    ``{match_id: {"twitch": [...]}}``.  The rows are joined against a
+    ``VALUES`` list, so a live-stats tick over many rows is a single statement.
+    """
+    if not patches:
+        return 0
+    model = attr.class_
+    pk = _primary_key(model)
+    rows = values(
+        column("ident", pk.type),
+        column("patch", JSONB),
+        name="jsonb_patch_rows",
+    ).data([(ident, dict(patch)) for ident, patch in patches.items()])
+    stmt = (
+        update(model)
+        .where(pk == rows.c.ident)
+        .values({
+            attr.key: func.coalesce(attr, _empty_object()).op(
+                "||", return_type=JSONB
+            )(rows.c.patch)
+        })
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    for ident, patch in patches.items():
+        await _sync_identity_map(session, attr, ident, patch, (), None)
+    return result.rowcount
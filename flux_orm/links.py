@@ -0,0 +1,132 @@
+"""Set-based synchronization of many-to-many association tables.
+
+``sync_links`` replaces the set of targets linked to an owner (e.g. the players of
+a team in ``player_in_team``) with a single statement: the wanted pairs are sent
+as arrays, missing pairs are deleted and new ones inserted with
+``ON CONFLICT DO NOTHING``.  No ORM collection is loaded.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple
+
+from sqlalchemy import ARRAY, Table, and_, bindparam, delete, exists, func, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class LinkSyncResult(NamedTuple):
+    inserted: int
+    deleted: int
+
+
+def _resolve(assoc, owner_column: str | None):
+    """Return ``(table, owner column, target column, relationship attribute)``."""
+    if isinstance(assoc, InstrumentedAttribute):
+        prop = assoc.property
+        if prop.secondary is None:
+            raise ValueError(f"{assoc} is not a many-to-many relationship")
+        return (
+            prop.secondary,
+            prop.synchronize_pairs[0][1],
+            prop.secondary_synchronize_pairs[0][1],
+            assoc,
+        )
+    table = assoc if isinstance(assoc, Table) else sa_inspect(assoc).local_table
+    if owner_column is None:
+        raise ValueError("owner_column is required when passing an association table")
+    pk = list(table.primary_key.columns)
+    if len(pk) != 2:
+        raise ValueError(f"{table.name} must have a two-column primary key")
+    owner = table.c[owner_column]
+    target = pk[1] if pk[0] is owner else pk[0]
+    return table, owner, target, None
+
+
+def _expire_owners(session: AsyncSession, attr, owner_ids) -> None:
+    if attr is None:
+        return
+    for owner_id in owner_ids:
+        key = session.identity_key(attr.class_, owner_id)
+        obj = session.sync_session.identity_map.get(key)
+        if obj is not None:
+            session.expire(obj, [attr.key])
+
+
+async def sync_links_many(
+    session: AsyncSession,
+    assoc,
+    links: Mapping[object, Iterable],
+    owner_column: str | None = None,
+) -> LinkSyncResult:
+    """
+    Make each owner in ``links`` linked to exactly the given targets.
+
+    ``assoc`` is either a secondary relationship (``Team.members``) or an
+    association table / model together with ``owner_column``.  Owners mapped to
+    an empty iterable lose all their links; owners not in ``links`` are left
+    untouched.  Extra columns of deleted rows (``team_in_match.stats``) are lost,
+    kept rows are not modified.
+    """
+    table, owner, target, attr = _resolve(assoc, owner_column)
+    owner_ids = list(links)
+    if not owner_ids:
+        return LinkSyncResult(0, 0)
+    pair_owners, pair_targets = [], []
+    for owner_id, target_ids in links.items():
+        for target_id in dict.fromkeys(target_ids):
+            pair_owners.append(owner_id)
+            pair_targets.append(target_id)
+
+    wanted = (
+        func.unnest(
+            bindparam("pair_owners", pair_owners, type_=ARRAY(owner.type)),
+            bindparam("pair_targets", pair_targets, type_=ARRAY(target.type)),
+        )
+        .table_valued("owner_id", "target_id")
+        .render_derived(name="wanted")
+    )
+    deleted = (
+        delete(table)
+        .where(
+            owner == func.any(
+                bindparam("owners", owner_ids, type_=ARRAY(owner.type))
+            ),
+            ~exists().where(
+                and_(wanted.c.owner_id == owner, wanted.c.target_id == target)
+            ),
+        )
+        .returning(owner)
+        .cte("deleted")
+    )
+    inserted = (
+        insert(table)
+        .from_select(
+            [owner.name, target.name],
+            select(wanted.c.owner_id, wanted.c.target_id),
+        )
+        .on_conflict_do_nothing()
+        .returning(owner)
+        .cte("inserted")
+    )
+    stmt = select(
+        select(func.count()).select_from(inserted).scalar_subquery(),
+        select(func.count()).select_from(deleted).scalar_subquery(),
+    )
+    inserted_count, deleted_count = (await session.execute(stmt)).one()
+    _expire_owners(session, attr, owner_ids)
+    return LinkSyncResult(inserted_count, deleted_count)
+
+
+async def sync_links(
+    session: AsyncSession,
+    assoc,
+    owner_id,
+    target_ids: Iterable,
+    owner_column: str | None = None,
+) -> LinkSyncResult:
+    """Make ``owner_id`` linked to exactly ``target_ids`` in one round trip."""
+    return await sync_links_many(
+        session, assoc, {owner_id: target_ids}, owner_column=owner_column
+    )
@@ -0,0 +1,434 @@
+"""Lock-friendly helpers for Alembic revisions on a busy database.
+
+Use them from ``upgrade()``/``downgrade()`` instead of the plain ``op`` calls::
+
+    from flux_orm import migration_ops
+
+    def upgrade() -> None:
+        migration_ops.with_lock_timeout(
+            lambda: op.add_column("match", sa.Column("score", sa.Integer()))
+        )
+        migration_ops.backfill_in_batches("match", "match_id", "score = 0", "score IS NULL")
+        migration_ops.create_index_concurrently("ix_match_score", "match", ["score"])
+
+Revisions run in their own transaction (``transaction_per_migration``), the
+``*_concurrently`` and batched helpers step out of it with ``autocommit_block``.
+``flag_unsafe_operations`` is hooked into autogenerate from ``env.py`` and
+``lint_revision`` checks a revision file.
+"""
+
+import ast
+import pathlib
+import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+
+from alembic import op
+from alembic.operations import ops
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from flux_orm.custom_logger import logger
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _is_lock_timeout(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    return LOCK_NOT_AVAILABLE in (
+        getattr(orig, "sqlstate", None),
+        getattr(orig, "pgcode", None),
+    )
+
+
+def with_lock_timeout(
+    operation: Callable[[], None],
+    lock_timeout: str = "2s",
+    attempts: int = 5,
+    backoff: float = 1.0,
+) -> None:
+    """
+    Run ``operation`` with a short ``lock_timeout`` and retry when it expires.
+
+    Every attempt runs in a SAVEPOINT, so a lock timeout neither aborts the
+    revision transaction nor leaves queued queries behind an ACCESS EXCLUSIVE
+    lock request for long.
+    """
+    if op.get_context().as_sql:
+        op.execute(f"SET LOCAL lock_timeout = '{lock_timeout}'")
+        operation()
+        return
+    bind = op.get_bind()
+    previous = bind.execute(text("SHOW lock_timeout")).scalar_one()
+    for attempt in range(1, attempts + 1):
+        savepoint = bind.begin_nested()
+        try:
+            bind.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+            operation()
+        except DBAPIError as exc:
+            savepoint.rollback()
+            if not _is_lock_timeout(exc) or attempt == attempts:
+                raise
+            logger.warning(
+                f"Lock timeout on attempt {attempt}/{attempts}, retrying"
+            )
+            time.sleep(backoff * attempt)
+        else:
+            savepoint.commit()
+            bind.execute(text(f"SET LOCAL lock_timeout = '{previous}'"))
+            return
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence,
+    unique: bool = False,
+    **kw,
+) -> None:
+    """
+    ``CREATE INDEX CONCURRENTLY`` outside of the revision transaction.
+
+    An invalid index left over by an interrupted previous attempt is dropped
+    first.  Extra keyword arguments go to ``op.create_index`` (for example
+    ``postgresql_where`` or ``postgresql_using``).
+    """
+    with op.get_context().autocommit_block():
+        if not op.get_context().as_sql:
+            invalid = op.get_bind().execute(
+                text(
+                    "SELECT 1 FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ),
+                {"name": index_name},
+            ).first()
+            if invalid:
+                op.drop_index(
+                    index_name,
+                    table_name=table_name,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            unique=unique,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def backfill_in_batches(
+    table_name: str,
+    pk: str,
+    assignments: str,
+    where: str,
+    batch_size: int = 5_000,
+    pause: float = 0.1,
+    max_backoff: float = 10.0,
+) -> int:
+    """
+    Run ``UPDATE table SET <assignments>`` in committed chunks of ``batch_size``.
+
+    ``where`` must stop matching a row once it is backfilled (typically
+    ``new_column IS NULL``), otherwise the loop never ends.  Rows locked by the
+    application are skipped; once only locked rows are left the loop waits,
+    backing off up to ``max_backoff`` seconds, until they are released.
+    Returns the number of updated rows.
+    """
+    statement = text(
+        f'UPDATE "{table_name}" SET {assignments} '
+        f'WHERE "{pk}" IN ('
+        f'SELECT "{pk}" FROM "{table_name}" WHERE {where} '
+        f"LIMIT :batch_size FOR UPDATE SKIP LOCKED)"
+    )
+    if op.get_context().as_sql:
+        op.execute(statement.bindparams(batch_size=batch_size))
+        return 0
+    remaining = text(f'SELECT EXISTS (SELECT 1 FROM "{table_name}" WHERE {where})')
+    total = 0
+    waits = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            updated = bind.execute(statement, {"batch_size": batch_size}).rowcount
+            total += updated
+            if updated:
+                waits = 0
+                logger.info(f"Backfilled {total} rows of {table_name}")
+                time.sleep(pause)
+            elif bind.execute(remaining).scalar_one():
+                waits += 1
+                logger.warning(
+                    f"Rows of {table_name} left to backfill are locked, "
+                    f"waiting (attempt {waits})"
+                )
+                time.sleep(min(pause * 2**waits, max_backoff))
+            else:
+                break
+    return total
+
+
+def copy_in_batches(
+    source_table: str,
+    target_table: str,
+    pk: str,
+    columns: Sequence[str],
+    batch_size: int = 5_000,
+    pause: float = 0.1,
+    where: str | None = None,
+    update: bool = False,
+) -> int:
+    """
+    Copy ``pk`` and ``columns`` of every source row into ``target_table``.
+
+    Walks the source in primary key order in committed chunks of ``batch_size``
+    rows; rows already in the target are skipped, or with ``update`` rewritten
+    where they differ, so the copy can be repeated to catch up with rows
+    written in the meantime.  Only source rows matching ``where``, if given,
+    are copied.  Returns the number of source rows visited.
+    """
+    selected = ", ".join(f'"{col}"' for col in (pk, *columns))
+    copied_where = f"WHERE {where} " if where else ""
+    if update:
+        assigned = ", ".join(f'"{col}" = EXCLUDED."{col}"' for col in columns)
+        current = ", ".join(f'"{target_table}"."{col}"' for col in columns)
+        excluded = ", ".join(f'EXCLUDED."{col}"' for col in columns)
+        on_conflict = (
+            f"DO UPDATE SET {assigned} "
+            f"WHERE ROW({current}) IS DISTINCT FROM ROW({excluded})"
+        )
+    else:
+        on_conflict = "DO NOTHING"
+
+    def statement(after: str) -> str:
+        return (
+            f'WITH batch AS (SELECT {selected} FROM "{source_table}" {after}'
+            f'ORDER BY "{pk}" LIMIT :batch_size), '
+            f'copied AS (INSERT INTO "{target_table}" ({selected}) '
+            f"SELECT {selected} FROM batch {copied_where}"
+            f'ON CONFLICT ("{pk}") {on_conflict}) '
+            f'SELECT (SELECT "{pk}"::text FROM batch ORDER BY "{pk}" DESC LIMIT 1), '
+            f"count(*) FROM batch"
+        )
+
+    first = text(statement(""))
+    if op.get_context().as_sql:
+        op.execute(first.bindparams(batch_size=batch_size))
+        return 0
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        pk_type = bind.execute(
+            text(
+                "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                "WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+            ),
+            {"table": f'"{source_table}"', "column": pk},
+        ).scalar_one()
+        following = text(statement(f'WHERE "{pk}" > CAST(:last AS {pk_type}) '))
+        last, copied = bind.execute(first, {"batch_size": batch_size}).one()
+        while copied:
+            total += copied
+            logger.info(f"Copied {total} rows of {source_table} into {target_table}")
+            time.sleep(pause)
+            last, copied = bind.execute(
+                following, {"batch_size": batch_size, "last": last}
+            ).one()
+    return total
+
+
+def add_foreign_key_not_valid(
+    constraint_name: str,
+    source_table: str,
+    referent_table: str,
+    local_cols: Sequence[str],
+    remote_cols: Sequence[str],
+    ondelete: str | None = None,
+) -> None:
+    """Add a foreign key without scanning the table; follow with ``validate_constraint``."""
+    local = ", ".join(f'"{col}"' for col in local_cols)
+    remote = ", ".join(f'"{col}"' for col in remote_cols)
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    op.execute(
+        f'ALTER TABLE "{source_table}" ADD CONSTRAINT "{constraint_name}" '
+        f'FOREIGN KEY ({local}) REFERENCES "{referent_table}" ({remote})'
+        f"{on_delete} NOT VALID"
+    )
+
+
+def add_check_not_valid(constraint_name: str, table_name: str, condition: str) -> None:
+    """Add a CHECK constraint without scanning the table; follow with ``validate_constraint``."""
+    op.execute(
+        f'ALTER TABLE "{table_name}" ADD CONSTRAINT "{constraint_name}" '
+        f"CHECK ({condition}) NOT VALID"
+    )
+
+
+def validate_constraint(constraint_name: str, table_name: str) -> None:
+    """
+    Validate a ``NOT VALID`` constraint in its own transaction.
+
+    Validation only takes a SHARE UPDATE EXCLUSIVE lock, reads and writes keep
+    going while the table is scanned.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'ALTER TABLE "{table_name}" VALIDATE CONSTRAINT "{constraint_name}"'
+        )
+
+
+def _unsafe_reasons(operation: ops.MigrateOperation) -> Iterable[str]:
+    if isinstance(operation, ops.CreateIndexOp):
+        if not operation.kw.get("postgresql_concurrently"):
+            yield (
+                f"create_index {operation.index_name!r} blocks writes, "
+                "use create_index_concurrently"
+            )
+    elif isinstance(operation, ops.AddColumnOp):
+        column = operation.column
+        if not column.nullable and column.server_default is None:
+            yield (
+                f"add_column {operation.table_name}.{column.name} is NOT NULL "
+                "without a server default, add it nullable and backfill in batches"
+            )
+    elif isinstance(operation, ops.AlterColumnOp):
+        if operation.modify_type is not None:
+            yield (
+                f"alter_column {operation.table_name}.{operation.column_name} "
+                "changes the type and rewrites the table"
+            )
+        if operation.modify_nullable is False:
+            yield (
+                f"alter_column {operation.table_name}.{operation.column_name} "
+                "SET NOT NULL scans the table under ACCESS EXCLUSIVE, add a "
+                "NOT VALID check constraint and validate it first"
+            )
+    elif isinstance(operation, ops.CreateForeignKeyOp):
+        yield (
+            f"create_foreign_key {operation.constraint_name!r} validates the whole "
+            "table, use add_foreign_key_not_valid + validate_constraint"
+        )
+    elif isinstance(operation, ops.CreateUniqueConstraintOp):
+        yield (
+            f"create_unique_constraint {operation.constraint_name!r} builds an "
+            "index under lock, create a unique index concurrently first"
+        )
+    elif isinstance(operation, ops.CreateCheckConstraintOp):
+        yield (
+            f"create_check_constraint {operation.constraint_name!r} scans the table, "
+            "use add_check_not_valid + validate_constraint"
+        )
+    elif isinstance(operation, ops.DropColumnOp | ops.DropTableOp):
+        yield f"{type(operation).__name__} breaks code still reading the old schema"
+
+
+def find_unsafe_operations(container: ops.OpContainer) -> list[str]:
+    """Return a description of every operation that may lock a busy table."""
+    found = []
+    for operation in container.ops:
+        if isinstance(operation, ops.OpContainer):
+            found.extend(find_unsafe_operations(operation))
+        else:
+            found.extend(_unsafe_reasons(operation))
+    return found
+
+
+def flag_unsafe_operations(context, revision, directives) -> None:
+    """``process_revision_directives`` hook warning about unsafe autogenerated ops."""
+    for script in directives:
+        for upgrade_ops in script.upgrade_ops_list:
+            for reason in find_unsafe_operations(upgrade_ops):
+                logger.warning(f"Unsafe operation in new revision: {reason}")
+
+
+_UNSAFE_CALLS = {
+    "create_index": "postgresql_concurrently",
+    "create_foreign_key": None,
+    "create_unique_constraint": None,
+    "create_check_constraint": None,
+    "drop_column": None,
+    "drop_table": None,
+}
+
+
+def lint_revision(path: str | pathlib.Path) -> list[str]:
+    """
+    Flag unsafe ``op.*`` calls in the ``upgrade()`` of a revision file.
+
+    Calls wrapped by this module's helpers are not flagged.
+    """
+    tree = ast.parse(pathlib.Path(path).read_text())
+    upgrade = next(
+        (
+            node
+            for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name == "upgrade"
+        ),
+        None,
+    )
+    if upgrade is None:
+        return []
+    found = []
+    for node in ast.walk(upgrade):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "op"
+        ):
+            continue
+        name = node.func.attr
+        keywords = {kw.arg for kw in node.keywords}
+        if name in _UNSAFE_CALLS and (
+            _UNSAFE_CALLS[name] is None or _UNSAFE_CALLS[name] not in keywords
+        ):
+            found.append(f"{path}:{node.lineno}: op.{name}")
+        elif name == "alter_column" and (
+            "type_" in keywords
+            or any(
+                kw.arg == "nullable"
+                and not (isinstance(kw.value, ast.Constant) and kw.value.value)
+                for kw in node.keywords
+            )
+        ):
+            # DROP NOT NULL (``nullable=True``) only changes the catalog.
+            found.append(f"{path}:{node.lineno}: op.alter_column rewrites or scans")
+        elif name == "add_column":
+            for arg in ast.walk(node):
+                if (
+                    isinstance(arg, ast.keyword)
+                    and arg.arg == "nullable"
+                    and isinstance(arg.value, ast.Constant)
+                    and arg.value.value is False
+                    and not any(
+                        isinstance(kw, ast.keyword) and kw.arg == "server_default"
+                        for kw in ast.walk(node)
+                    )
+                ):
+                    found.append(
+                        f"{path}:{node.lineno}: op.add_column NOT NULL without default"
+                    )
+    return found
+
+
+if __name__ == "__main__":
+    problems = [
+        problem for path in sys.argv[1:] for problem in lint_revision(path)
+    ]
+    for problem in problems:
+        logger.warning(problem)
+    sys.exit(1 if problems else 0)
@@ -19,6 +19,7 @@ config.set_main_option(
 )
 
 from flux_orm.database import Model  # noqa: E402
+from flux_orm.migration_ops import flag_unsafe_operations  # noqa: E402
 
 logger.info(f"Tables found in metadata: {Model.metadata.tables.keys()}")
 target_metadata = Model.metadata
@@ -73,6 +74,10 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,  # Type tracking
             compare_server_default=True,  # Server default tracking
+            # One transaction per revision keeps locks short and lets revisions
+            # step out of it with autocommit_block (CREATE INDEX CONCURRENTLY).
+            transaction_per_migration=True,
+            process_revision_directives=flag_unsafe_operations,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,63 @@
+"""server side defaults for ids and timestamps
+
+Revision ID: 3c1f0e5a9b27
+Revises: 05431a48a4f8
+Create Date: 2026-10-19 10:12:41.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from flux_orm.models import server_defaults
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f0e5a9b27'
+down_revision: Union[str, None] = '05431a48a4f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIMARY_KEYS = {
+    'sport': 'sport_id',
+    'competition': 'competition_id',
+    'competition_category': 'category_id',
+    'team': 'team_id',
+    'team_member': 'player_id',
+    'match_status': 'status_id',
+    'match': 'match_id',
+    'match_ai_statement': 'statement_id',
+    'coach': 'coach_id',
+    'raw_news': 'raw_news_id',
+    'formatted_news': 'formatted_news_id',
+}
+
+TIMESTAMPED_TABLES = [
+    *PRIMARY_KEYS,
+    'substitution',
+    'filtered_match_in_news',
+]
+
+
+def upgrade() -> None:
+    op.execute(server_defaults.UUID7_FUNCTION)
+    op.execute(server_defaults.UPDATED_AT_FUNCTION)
+    for table, pk in PRIMARY_KEYS.items():
+        op.alter_column(table, pk, server_default=sa.text('uuid_generate_v7()'))
+    for table in TIMESTAMPED_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table, column, server_default=sa.text("timezone('utc', now())")
+            )
+        op.execute(server_defaults.create_updated_at_trigger(table))
+
+
+def downgrade() -> None:
+    for table in TIMESTAMPED_TABLES:
+        op.execute(server_defaults.drop_updated_at_trigger(table))
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None)
+    for table, pk in PRIMARY_KEYS.items():
+        op.alter_column(table, pk, server_default=None)
+    for statement in server_defaults.DROP_FUNCTIONS:
+        op.execute(statement)
@@ -0,0 +1,36 @@
+"""schedule indexes
+
+Revision ID: 5b7e9d1f3a62
+Revises: 8d2a4c6b1e93
+Create Date: 2026-10-19 13:21:05.114823
+
+"""
+from typing import Sequence, Union
+
+from flux_orm import migration_ops
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e9d1f3a62'
+down_revision: Union[str, None] = '8d2a4c6b1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    migration_ops.create_index_concurrently(
+        'ix_match_sport_planned_start',
+        'match',
+        ['sport_id', 'planned_start_datetime'],
+        postgresql_include=['status_id', 'end_datetime'],
+    )
+    migration_ops.create_index_concurrently(
+        'ix_team_in_match_match_id',
+        'team_in_match',
+        ['match_id'],
+        postgresql_include=['place'],
+    )
+
+
+def downgrade() -> None:
+    migration_ops.drop_index_concurrently('ix_team_in_match_match_id', 'team_in_match')
+    migration_ops.drop_index_concurrently('ix_match_sport_planned_start', 'match')
@@ -0,0 +1,66 @@
+"""database level cascades
+
+Revision ID: 8d2a4c6b1e93
+Revises: 3c1f0e5a9b27
+Create Date: 2026-10-19 11:02:17.904611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from flux_orm import migration_ops
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2a4c6b1e93'
+down_revision: Union[str, None] = '3c1f0e5a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table, referred column, ON DELETE action)
+FOREIGN_KEYS = [
+    ('competition', 'sport_id', 'sport', 'sport_id', 'CASCADE'),
+    ('match', 'competition_id', 'competition', 'competition_id', 'CASCADE'),
+    ('match', 'status_id', 'match_status', 'status_id', 'SET NULL'),
+    ('competition_in_category', 'competition_id', 'competition', 'competition_id', 'CASCADE'),
+    ('team_in_competition', 'team_id', 'team', 'team_id', 'CASCADE'),
+    ('team_in_competition', 'competition_id', 'competition', 'competition_id', 'CASCADE'),
+    ('player_in_team', 'player_id', 'team_member', 'player_id', 'CASCADE'),
+    ('player_in_team', 'team_id', 'team', 'team_id', 'CASCADE'),
+    ('team_in_match', 'team_id', 'team', 'team_id', 'CASCADE'),
+    ('team_in_match', 'match_id', 'match', 'match_id', 'CASCADE'),
+    ('ai_statement_in_match', 'statement_id', 'match_ai_statement', 'statement_id', 'CASCADE'),
+    ('ai_statement_in_match', 'match_id', 'match', 'match_id', 'CASCADE'),
+    ('coach_in_team', 'coach_id', 'coach', 'coach_id', 'CASCADE'),
+    ('coach_in_team', 'team_id', 'team', 'team_id', 'CASCADE'),
+    ('substitution', 'match_id', 'match', 'match_id', 'CASCADE'),
+    ('substitution', 'team_id', 'team', 'team_id', 'CASCADE'),
+    ('filtered_match_in_news', 'match_id', 'match', 'match_id', 'CASCADE'),
+    ('filtered_match_in_news', 'news_id', 'formatted_news', 'formatted_news_id', 'CASCADE'),
+]
+
+
+def _replace_foreign_keys(with_ondelete: bool) -> None:
+    for table, column, referred, referred_column, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        # Existing rows already satisfy the key: skip the validating scan under
+        # the ACCESS EXCLUSIVE lock and validate separately below.
+        migration_ops.add_foreign_key_not_valid(
+            name,
+            table,
+            referred,
+            [column],
+            [referred_column],
+            ondelete=ondelete if with_ondelete else None,
+        )
+    for table, column, *_ in FOREIGN_KEYS:
+        migration_ops.validate_constraint(f'{table}_{column}_fkey', table)
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(with_ondelete=True)
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(with_ondelete=False)
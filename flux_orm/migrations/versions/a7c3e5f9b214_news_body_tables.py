@@ -0,0 +1,104 @@
+"""news body tables
+
+Revision ID: a7c3e5f9b214
+Revises: 5b7e9d1f3a62
+Create Date: 2026-10-19 14:05:37.401260
+
+Expand step: the bodies are copied into 1:1 side tables while the old columns
+stay in place, nullable, for application instances that still read them.  A
+trigger mirrors what new instances write to the side tables back inline.  The
+next revision catches up with old instances' writes and drops the old columns.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from flux_orm import migration_ops
+from flux_orm.models.compression import set_compression_sql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f9b214'
+down_revision: Union[str, None] = '5b7e9d1f3a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (side table, news table, primary key)
+BODY_TABLES = [
+    ('raw_news_body', 'raw_news', 'raw_news_id'),
+    ('formatted_news_body', 'formatted_news', 'formatted_news_id'),
+]
+
+
+# Keeps the inline copy current for old instances until the contract step.
+def mirror_function(body_table: str, news_table: str, pk: str) -> str:
+    return f"""
+CREATE OR REPLACE FUNCTION {body_table}_mirror() RETURNS trigger AS $$
+BEGIN
+    UPDATE "{news_table}" SET text = NEW.text
+    WHERE "{pk}" = NEW."{pk}" AND text IS DISTINCT FROM NEW.text;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def mirror_trigger(body_table: str) -> str:
+    return (
+        f'CREATE TRIGGER "{body_table}_mirror" AFTER INSERT OR UPDATE OF text '
+        f'ON "{body_table}" FOR EACH ROW EXECUTE FUNCTION {body_table}_mirror()'
+    )
+
+
+def drop_mirror(body_table: str) -> tuple[str, str]:
+    return (
+        f'DROP TRIGGER IF EXISTS "{body_table}_mirror" ON "{body_table}"',
+        f"DROP FUNCTION IF EXISTS {body_table}_mirror()",
+    )
+
+
+def upgrade() -> None:
+    op.create_table('raw_news_body',
+    sa.Column('raw_news_id', sa.Uuid(), nullable=False),
+    sa.Column('text', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['raw_news_id'], ['raw_news.raw_news_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('raw_news_id')
+    )
+    op.create_table('formatted_news_body',
+    sa.Column('formatted_news_id', sa.Uuid(), nullable=False),
+    sa.Column('text', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['formatted_news_id'], ['formatted_news.formatted_news_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('formatted_news_id')
+    )
+    for body_table, news_table, pk in BODY_TABLES:
+        op.execute(set_compression_sql(body_table, 'text'))
+        # New instances only write the side table.
+        migration_ops.with_lock_timeout(
+            lambda news_table=news_table: op.alter_column(
+                news_table, 'text', nullable=True
+            )
+        )
+        op.execute(mirror_function(body_table, news_table, pk))
+        op.execute(mirror_trigger(body_table))
+        migration_ops.copy_in_batches(
+            news_table, body_table, pk, ['text'], where='text IS NOT NULL'
+        )
+
+
+def downgrade() -> None:
+    # Bodies written by new instances go back inline; news without a body
+    # keep a NULL text, so the column stays nullable.
+    for body_table, news_table, pk in BODY_TABLES:
+        for statement in drop_mirror(body_table):
+            op.execute(statement)
+        migration_ops.backfill_in_batches(
+            news_table,
+            pk,
+            f'text = (SELECT b.text FROM "{body_table}" b '
+            f'WHERE b."{pk}" = "{news_table}"."{pk}")',
+            f'text IS NULL AND EXISTS (SELECT 1 FROM "{body_table}" b '
+            f'WHERE b."{pk}" = "{news_table}"."{pk}")',
+        )
+    op.drop_table('formatted_news_body')
+    op.drop_table('raw_news_body')
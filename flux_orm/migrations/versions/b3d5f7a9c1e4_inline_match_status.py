@@ -0,0 +1,155 @@
+"""inline match status
+
+Revision ID: b3d5f7a9c1e4
+Revises: f2a6c8e0b351
+Create Date: 2026-10-19 17:02:44.215630
+
+Expand step: the status moves onto ``match`` (``status`` and
+``status_payload``) and transitions go to the append-only
+``match_status_history``, seeded with the current statuses.  ``match_status``
+and ``match.status_id`` stay for instances that still read them; until the
+next revision drops them, triggers copy what old instances write there onto
+``match``.  Inline writes of new instances are never touched.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from flux_orm import migration_ops
+from flux_orm.models import server_defaults
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e4'
+down_revision: Union[str, None] = 'f2a6c8e0b351'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ``image_url`` joins the payload, an empty payload is stored as NULL.
+OLD_PAYLOAD = (
+    "NULLIF(COALESCE(ms.status, '{}') "
+    "|| jsonb_strip_nulls(jsonb_build_object('image_url', ms.image_url)), '{}')"
+)
+OLD_STATUS = (
+    f'SELECT ms.name, {OLD_PAYLOAD} '
+    'FROM match_status ms WHERE ms.status_id = match.status_id'
+)
+
+# Old instances change a status in ``match_status`` or point
+# ``match.status_id`` at a new row; both are copied onto ``match``.
+SYNC_FUNCTIONS = (
+    f"""
+CREATE OR REPLACE FUNCTION sync_match_status_row() RETURNS trigger AS $$
+BEGIN
+    UPDATE match SET (status, status_payload) = (ms.name, {OLD_PAYLOAD})
+    FROM (SELECT NEW.name, NEW.status, NEW.image_url) ms
+    WHERE match.status_id = NEW.status_id
+    AND (match.status, match.status_payload) IS DISTINCT FROM (ms.name, {OLD_PAYLOAD});
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    f"""
+CREATE OR REPLACE FUNCTION sync_match_status_id() RETURNS trigger AS $$
+BEGIN
+    SELECT ms.name, {OLD_PAYLOAD} INTO NEW.status, NEW.status_payload
+    FROM match_status ms WHERE ms.status_id = NEW.status_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""",
+)
+SYNC_TRIGGERS = (
+    'CREATE TRIGGER "match_status_sync" AFTER INSERT OR UPDATE ON "match_status" '
+    "FOR EACH ROW EXECUTE FUNCTION sync_match_status_row()",
+    'CREATE TRIGGER "match_status_id_sync_insert" BEFORE INSERT ON "match" '
+    "FOR EACH ROW WHEN (NEW.status_id IS NOT NULL) "
+    "EXECUTE FUNCTION sync_match_status_id()",
+    'CREATE TRIGGER "match_status_id_sync_update" BEFORE UPDATE OF status_id ON "match" '
+    "FOR EACH ROW WHEN (NEW.status_id IS DISTINCT FROM OLD.status_id) "
+    "EXECUTE FUNCTION sync_match_status_id()",
+)
+DROP_SYNC = (
+    'DROP TRIGGER IF EXISTS "match_status_id_sync_update" ON "match"',
+    'DROP TRIGGER IF EXISTS "match_status_id_sync_insert" ON "match"',
+    'DROP TRIGGER IF EXISTS "match_status_sync" ON "match_status"',
+    "DROP FUNCTION IF EXISTS sync_match_status_id()",
+    "DROP FUNCTION IF EXISTS sync_match_status_row()",
+)
+
+
+def upgrade() -> None:
+    migration_ops.with_lock_timeout(
+        lambda: op.add_column(
+            'match',
+            sa.Column(
+                'status',
+                postgresql.ENUM(name='matchstatusenum', create_type=False),
+                nullable=True,
+            ),
+        )
+    )
+    migration_ops.with_lock_timeout(
+        lambda: op.add_column(
+            'match',
+            sa.Column('status_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        )
+    )
+    op.create_table('match_status_history',
+    sa.Column('history_id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('match_id', sa.Uuid(), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='matchstatusenum', create_type=False), nullable=False),
+    sa.Column('changed_at', sa.TIMESTAMP(), server_default=sa.text("timezone('utc', now())"), nullable=False),
+    sa.ForeignKeyConstraint(['match_id'], ['match.match_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('history_id')
+    )
+    # Before the backfill, so nothing written meanwhile is missed.
+    for function in SYNC_FUNCTIONS:
+        op.execute(function)
+    for trigger in SYNC_TRIGGERS:
+        migration_ops.with_lock_timeout(lambda trigger=trigger: op.execute(trigger))
+    migration_ops.backfill_in_batches(
+        'match',
+        'match_id',
+        f'(status, status_payload) = ({OLD_STATUS})',
+        'status IS NULL AND status_id IS NOT NULL',
+    )
+    # The current statuses open the history, dated by their last change.
+    op.execute(
+        'INSERT INTO match_status_history (match_id, status, changed_at) '
+        'SELECT m.match_id, ms.name, ms.updated_at '
+        'FROM match m JOIN match_status ms ON ms.status_id = m.status_id '
+        'ORDER BY ms.updated_at'
+    )
+    op.execute(server_defaults.STATUS_HISTORY_FUNCTION)
+    for trigger in server_defaults.STATUS_HISTORY_TRIGGERS:
+        op.execute(trigger)
+    migration_ops.create_index_concurrently(
+        'ix_match_status_history_match_id', 'match_status_history', ['match_id']
+    )
+    migration_ops.create_index_concurrently(
+        'ix_match_status_history_changed_at',
+        'match_status_history',
+        ['changed_at'],
+        postgresql_using='brin',
+    )
+    # Replaces ix_match_sport_planned_start (which covers status_id) in the
+    # contract step.
+    migration_ops.create_index_concurrently(
+        'ix_match_sport_planned_start_status',
+        'match',
+        ['sport_id', 'planned_start_datetime'],
+        postgresql_include=['status', 'end_datetime'],
+    )
+
+
+def downgrade() -> None:
+    migration_ops.drop_index_concurrently('ix_match_sport_planned_start_status', 'match')
+    for statement in DROP_SYNC:
+        op.execute(statement)
+    for statement in server_defaults.DROP_STATUS_HISTORY:
+        op.execute(statement)
+    op.drop_table('match_status_history')
+    op.drop_column('match', 'status_payload')
+    op.drop_column('match', 'status')
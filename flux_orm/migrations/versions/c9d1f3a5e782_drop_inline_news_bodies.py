@@ -0,0 +1,89 @@
+"""drop inline news bodies
+
+Revision ID: c9d1f3a5e782
+Revises: a7c3e5f9b214
+Create Date: 2026-10-19 14:06:02.118945
+
+Contract step of a7c3e5f9b214, deploy once no instance reads
+``raw_news.text``/``formatted_news.text`` any more.  Rows written by old
+instances since the expand step are copied first; the inline copies of what
+new instances wrote are kept current by the mirror triggers, so they match.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from flux_orm import migration_ops
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d1f3a5e782'
+down_revision: Union[str, None] = 'a7c3e5f9b214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (side table, news table, primary key, column type)
+BODY_TABLES = [
+    ('raw_news_body', 'raw_news', 'raw_news_id', postgresql.JSONB(astext_type=sa.Text())),
+    ('formatted_news_body', 'formatted_news', 'formatted_news_id', sa.String()),
+]
+
+
+# The mirror installed by a7c3e5f9b214, dropped here and restored on downgrade.
+def mirror_function(body_table: str, news_table: str, pk: str) -> str:
+    return f"""
+CREATE OR REPLACE FUNCTION {body_table}_mirror() RETURNS trigger AS $$
+BEGIN
+    UPDATE "{news_table}" SET text = NEW.text
+    WHERE "{pk}" = NEW."{pk}" AND text IS DISTINCT FROM NEW.text;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def mirror_trigger(body_table: str) -> str:
+    return (
+        f'CREATE TRIGGER "{body_table}_mirror" AFTER INSERT OR UPDATE OF text '
+        f'ON "{body_table}" FOR EACH ROW EXECUTE FUNCTION {body_table}_mirror()'
+    )
+
+
+def drop_mirror(body_table: str) -> tuple[str, str]:
+    return (
+        f'DROP TRIGGER IF EXISTS "{body_table}_mirror" ON "{body_table}"',
+        f"DROP FUNCTION IF EXISTS {body_table}_mirror()",
+    )
+
+
+def upgrade() -> None:
+    for body_table, news_table, pk, _ in BODY_TABLES:
+        migration_ops.copy_in_batches(
+            news_table, body_table, pk, ['text'], where='text IS NOT NULL', update=True
+        )
+        for statement in drop_mirror(body_table):
+            op.execute(statement)
+        migration_ops.with_lock_timeout(
+            lambda news_table=news_table: op.drop_column(news_table, 'text')
+        )
+
+
+def downgrade() -> None:
+    for body_table, news_table, pk, type_ in BODY_TABLES:
+        migration_ops.with_lock_timeout(
+            lambda news_table=news_table, type_=type_: op.add_column(
+                news_table, sa.Column('text', type_, nullable=True)
+            )
+        )
+        op.execute(mirror_function(body_table, news_table, pk))
+        op.execute(mirror_trigger(body_table))
+        migration_ops.backfill_in_batches(
+            news_table,
+            pk,
+            f'text = (SELECT b.text FROM "{body_table}" b '
+            f'WHERE b."{pk}" = "{news_table}"."{pk}")',
+            f'text IS NULL AND EXISTS (SELECT 1 FROM "{body_table}" b '
+            f'WHERE b."{pk}" = "{news_table}"."{pk}")',
+        )
+        # Stays nullable like after a7c3e5f9b214, news without a body have none.
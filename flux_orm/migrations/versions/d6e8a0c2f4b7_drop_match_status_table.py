@@ -0,0 +1,137 @@
+"""drop match status table
+
+Revision ID: d6e8a0c2f4b7
+Revises: b3d5f7a9c1e4
+Create Date: 2026-10-19 17:03:12.880417
+
+Contract step of b3d5f7a9c1e4, deploy once no instance reads ``match_status``
+or ``match.status_id`` any more.  Statuses written by old instances since the
+expand step are already on ``match``, so only the sync triggers go first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from flux_orm import migration_ops
+from flux_orm.models import server_defaults
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6e8a0c2f4b7'
+down_revision: Union[str, None] = 'b3d5f7a9c1e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ``image_url`` joins the payload, an empty payload is stored as NULL.
+OLD_PAYLOAD = (
+    "NULLIF(COALESCE(ms.status, '{}') "
+    "|| jsonb_strip_nulls(jsonb_build_object('image_url', ms.image_url)), '{}')"
+)
+OLD_STATUS = (
+    f'SELECT ms.name, {OLD_PAYLOAD} '
+    'FROM match_status ms WHERE ms.status_id = match.status_id'
+)
+
+# The sync installed by b3d5f7a9c1e4, dropped here and restored on downgrade.
+SYNC_FUNCTIONS = (
+    f"""
+CREATE OR REPLACE FUNCTION sync_match_status_row() RETURNS trigger AS $$
+BEGIN
+    UPDATE match SET (status, status_payload) = (ms.name, {OLD_PAYLOAD})
+    FROM (SELECT NEW.name, NEW.status, NEW.image_url) ms
+    WHERE match.status_id = NEW.status_id
+    AND (match.status, match.status_payload) IS DISTINCT FROM (ms.name, {OLD_PAYLOAD});
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    f"""
+CREATE OR REPLACE FUNCTION sync_match_status_id() RETURNS trigger AS $$
+BEGIN
+    SELECT ms.name, {OLD_PAYLOAD} INTO NEW.status, NEW.status_payload
+    FROM match_status ms WHERE ms.status_id = NEW.status_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""",
+)
+SYNC_TRIGGERS = (
+    'CREATE TRIGGER "match_status_sync" AFTER INSERT OR UPDATE ON "match_status" '
+    "FOR EACH ROW EXECUTE FUNCTION sync_match_status_row()",
+    'CREATE TRIGGER "match_status_id_sync_insert" BEFORE INSERT ON "match" '
+    "FOR EACH ROW WHEN (NEW.status_id IS NOT NULL) "
+    "EXECUTE FUNCTION sync_match_status_id()",
+    'CREATE TRIGGER "match_status_id_sync_update" BEFORE UPDATE OF status_id ON "match" '
+    "FOR EACH ROW WHEN (NEW.status_id IS DISTINCT FROM OLD.status_id) "
+    "EXECUTE FUNCTION sync_match_status_id()",
+)
+DROP_SYNC = (
+    'DROP TRIGGER IF EXISTS "match_status_id_sync_update" ON "match"',
+    'DROP TRIGGER IF EXISTS "match_status_id_sync_insert" ON "match"',
+    'DROP TRIGGER IF EXISTS "match_status_sync" ON "match_status"',
+    "DROP FUNCTION IF EXISTS sync_match_status_id()",
+    "DROP FUNCTION IF EXISTS sync_match_status_row()",
+)
+
+
+def upgrade() -> None:
+    for statement in DROP_SYNC:
+        migration_ops.with_lock_timeout(lambda statement=statement: op.execute(statement))
+    migration_ops.drop_index_concurrently('ix_match_sport_planned_start', 'match')
+    op.execute(
+        'ALTER INDEX ix_match_sport_planned_start_status '
+        'RENAME TO ix_match_sport_planned_start'
+    )
+    migration_ops.with_lock_timeout(lambda: op.drop_column('match', 'status_id'))
+    migration_ops.with_lock_timeout(lambda: op.drop_table('match_status'))
+
+
+def downgrade() -> None:
+    op.create_table('match_status',
+    sa.Column('status_id', sa.Uuid(), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('name', postgresql.ENUM(name='matchstatusenum', create_type=False), nullable=False),
+    sa.Column('status', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text("timezone('utc', now())"), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text("timezone('utc', now())"), nullable=False),
+    sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False),
+    sa.PrimaryKeyConstraint('status_id')
+    )
+    op.execute(server_defaults.create_updated_at_trigger('match_status'))
+    # One status row per match, keyed by the match id.
+    op.execute(
+        "INSERT INTO match_status (status_id, name, status, image_url) "
+        "SELECT match_id, status, "
+        "NULLIF(NULLIF(status_payload, 'null') - 'image_url', '{}'), "
+        "status_payload ->> 'image_url' FROM match WHERE status IS NOT NULL"
+    )
+    migration_ops.with_lock_timeout(
+        lambda: op.add_column('match', sa.Column('status_id', sa.Uuid(), nullable=True))
+    )
+    migration_ops.backfill_in_batches(
+        'match', 'match_id', 'status_id = match_id', 'status IS NOT NULL AND status_id IS NULL'
+    )
+    for function in SYNC_FUNCTIONS:
+        op.execute(function)
+    for trigger in SYNC_TRIGGERS:
+        migration_ops.with_lock_timeout(lambda trigger=trigger: op.execute(trigger))
+    migration_ops.add_foreign_key_not_valid(
+        'match_status_id_fkey',
+        'match',
+        'match_status',
+        ['status_id'],
+        ['status_id'],
+        ondelete='SET NULL',
+    )
+    migration_ops.validate_constraint('match_status_id_fkey', 'match')
+    op.execute(
+        'ALTER INDEX ix_match_sport_planned_start '
+        'RENAME TO ix_match_sport_planned_start_status'
+    )
+    migration_ops.create_index_concurrently(
+        'ix_match_sport_planned_start',
+        'match',
+        ['sport_id', 'planned_start_datetime'],
+        postgresql_include=['status_id', 'end_datetime'],
+    )
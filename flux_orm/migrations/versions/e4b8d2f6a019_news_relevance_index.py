@@ -0,0 +1,37 @@
+"""news relevance index
+
+Revision ID: e4b8d2f6a019
+Revises: c9d1f3a5e782
+Create Date: 2026-10-19 15:12:44.630172
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from flux_orm import migration_ops
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8d2f6a019'
+down_revision: Union[str, None] = 'c9d1f3a5e782'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    migration_ops.create_index_concurrently(
+        'ix_filtered_match_in_news_relevance',
+        'filtered_match_in_news',
+        [
+            'match_id',
+            sa.text('respective_relevance DESC NULLS LAST'),
+            sa.text('created_at DESC'),
+        ],
+        postgresql_include=['news_id'],
+    )
+
+
+def downgrade() -> None:
+    migration_ops.drop_index_concurrently(
+        'ix_filtered_match_in_news_relevance', 'filtered_match_in_news'
+    )
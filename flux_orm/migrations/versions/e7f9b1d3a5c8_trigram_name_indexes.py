@@ -0,0 +1,46 @@
+"""trigram name indexes
+
+Revision ID: e7f9b1d3a5c8
+Revises: d6e8a0c2f4b7
+Create Date: 2026-10-19 18:11:53.407218
+
+GIN trigram indexes for the fuzzy name lookups of ``flux_orm.fuzzy``.  Needs
+the ``pg_trgm`` extension (postgresql-contrib) on the server.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from flux_orm import migration_ops
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f9b1d3a5c8'
+down_revision: Union[str, None] = 'd6e8a0c2f4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = [
+    ('team', 'name'),
+    ('team', 'pretty_name'),
+    ('team_member', 'nickname'),
+    ('team_member', 'name'),
+    ('competition', 'name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in TRIGRAM_COLUMNS:
+        migration_ops.create_index_concurrently(
+            f'ix_{table}_{column}_trgm',
+            table,
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    # The extension stays, other objects of the database may use it.
+    for table, column in reversed(TRIGRAM_COLUMNS):
+        migration_ops.drop_index_concurrently(f'ix_{table}_{column}_trgm', table)
@@ -0,0 +1,40 @@
+"""match version columns
+
+Revision ID: f2a6c8e0b351
+Revises: e4b8d2f6a019
+Create Date: 2026-10-19 16:20:18.514902
+
+Version counters for optimistic concurrency.  A column with a constant default
+is added without rewriting the table; existing rows read version 1.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from flux_orm import migration_ops
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c8e0b351'
+down_revision: Union[str, None] = 'e4b8d2f6a019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ['match', 'match_status']
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        migration_ops.with_lock_timeout(
+            lambda table=table: op.add_column(
+                table,
+                sa.Column(
+                    'version', sa.Integer(), server_default=sa.text('1'), nullable=False
+                ),
+            )
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(VERSIONED_TABLES):
+        op.drop_column(table, 'version')
@@ -1,24 +1,51 @@
-from sqlalchemy import UniqueConstraint, TIMESTAMP
+from sqlalchemy import (
+    BigInteger,
+    FetchedValue,
+    Identity,
+    Index,
+    UniqueConstraint,
+    TIMESTAMP,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.ext.mutable import MutableDict, MutableList
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import declared_attr, relationship
 from datetime import datetime
-
-from uuid6 import uuid6
+from typing import NamedTuple
 
 
 from flux_orm.database import Model
 from flux_orm.models import mapped_column, ForeignKey, UUID, Mapped
-from flux_orm.models.utils import utcnow_naive
+from flux_orm.models import compression, server_defaults, trigram
+from flux_orm.models.server_defaults import utcnow, uuid7
 from flux_orm.models.enums import PipelineStatus, MatchStatusEnum
 
 
+class Versioned:
+    """
+    Optimistic concurrency: ORM updates and deletes check and bump ``version``.
+
+    An object whose row changed since it was loaded fails to flush with
+    ``StaleDataError``; see ``flux_orm.concurrency`` for the typed error and retries.
+    """
+
+    version: Mapped[int] = mapped_column(server_default=text("1"))
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict:
+        return {**Model.__mapper_args__, "version_id_col": cls.__table__.c.version}
+
+
 class Sport(Model):
     __tablename__ = "sport"
-    sport_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    sport_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     name: Mapped[str] = mapped_column(unique=True)
     description: Mapped[str | None]
     image_url: Mapped[str | None]
+    # Not passive: deleting competitions also deletes their categories in the ORM.
     competitions: Mapped[list["Competition"]] = relationship(
         back_populates="sport",
         uselist=True,
@@ -31,19 +58,23 @@ class Sport(Model):
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class Competition(Model):
     __tablename__ = "competition"
-    competition_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
-    sport_id: Mapped[UUID] = mapped_column(ForeignKey("sport.sport_id"))
+    competition_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
+    sport_id: Mapped[UUID] = mapped_column(
+        ForeignKey("sport.sport_id", ondelete="CASCADE")
+    )
     name: Mapped[str] = mapped_column(unique=True)
     prize_pool: Mapped[str | None]
     location: Mapped[str | None]
@@ -58,7 +89,9 @@ class Competition(Model):
         back_populates="competition",
         uselist=True,
         cascade="save-update, expunge, merge, delete",
+        passive_deletes=True,
     )
+    # Not passive: the categories themselves are deleted, not only the links.
     categories: Mapped[list["CompetitionCategory"] | None] = relationship(
         back_populates="competitions",
         uselist=True,
@@ -70,22 +103,23 @@ class Competition(Model):
         uselist=True,
         secondary="team_in_competition",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class CompetitionInCategory(Model):
     __tablename__ = "competition_in_category"
     competition_id: Mapped[UUID] = mapped_column(
-        ForeignKey("competition.competition_id"), primary_key=True
+        ForeignKey("competition.competition_id", ondelete="CASCADE"), primary_key=True
     )
     category_id: Mapped[UUID] = mapped_column(
         ForeignKey("competition_category.category_id", ondelete="CASCADE"),
@@ -95,7 +129,9 @@ class CompetitionInCategory(Model):
 
 class CompetitionCategory(Model):
     __tablename__ = "competition_category"
-    category_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    category_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     name: Mapped[str]
     description: Mapped[str | None]
     image_url: Mapped[str | None]
@@ -108,20 +144,22 @@ class CompetitionCategory(Model):
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class TeamInCompetition(Model):
     __tablename__ = "team_in_competition"
-    team_id: Mapped[UUID] = mapped_column(ForeignKey("team.team_id"), primary_key=True)
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("team.team_id", ondelete="CASCADE"), primary_key=True
+    )
     competition_id: Mapped[UUID] = mapped_column(
-        ForeignKey("competition.competition_id"),
+        ForeignKey("competition.competition_id", ondelete="CASCADE"),
         primary_key=True,
     )
 
@@ -131,7 +169,9 @@ class TeamInCompetition(Model):
 
 class Team(Model):
     __tablename__ = "team"
-    team_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    team_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     name: Mapped[str] = mapped_column(unique=True)
     pretty_name: Mapped[str | None]
     team_url: Mapped[str | None]
@@ -140,13 +180,16 @@ class Team(Model):
         uselist=True,
         secondary="team_in_match",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     competitions: Mapped[list["Competition"] | None] = relationship(
         back_populates="teams",
         uselist=True,
         secondary="team_in_competition",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
+    # Not passive: the members themselves are deleted, not only the links.
     members: Mapped[list["TeamMember"] | None] = relationship(
         back_populates="teams",
         uselist=True,
@@ -158,33 +201,48 @@ class Team(Model):
         uselist=True,
         secondary="coach_in_team",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     substitutions: Mapped[list["Substitution"] | None] = relationship(
         back_populates="team",
         uselist=True,
         cascade="save-update, expunge, merge, delete",
+        passive_deletes=True,
     )
     description: Mapped[str | None]
     image_url: Mapped[str | None]
-    stats: Mapped[dict | None] = mapped_column(MutableDict.as_mutable(JSONB()))
-    regalia: Mapped[dict | None] = mapped_column(MutableDict.as_mutable(JSONB()))
+    # Heavy documents are not loaded by default, add undefer_group("documents").
+    stats: Mapped[dict | None] = mapped_column(
+        MutableDict.as_mutable(JSONB()),
+        deferred=True,
+        deferred_group="documents",
+        deferred_raiseload=True,
+    )
+    regalia: Mapped[dict | None] = mapped_column(
+        MutableDict.as_mutable(JSONB()),
+        deferred=True,
+        deferred_group="documents",
+        deferred_raiseload=True,
+    )
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class PlayerInTeam(Model):
     __tablename__ = "player_in_team"
     player_id: Mapped[UUID] = mapped_column(
-        ForeignKey("team_member.player_id"), primary_key=True
+        ForeignKey("team_member.player_id", ondelete="CASCADE"), primary_key=True
+    )
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("team.team_id", ondelete="CASCADE"), primary_key=True
     )
-    team_id: Mapped[UUID] = mapped_column(ForeignKey("team.team_id"), primary_key=True)
 
 
 # class PlayerInMatchStats(Model):
@@ -204,67 +262,65 @@ class TeamMember(Model):
             name="team_member_nickname_name_image_unique",
         ),
     )
-    player_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    player_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     team_member_url: Mapped[str | None]
     teams: Mapped[list["Team"]] = relationship(
         back_populates="members",
         uselist=True,
         secondary="player_in_team",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     nickname: Mapped[str | None]
     name: Mapped[str | None]
     age: Mapped[int | None]
     country: Mapped[str | None]
-    stats = mapped_column(JSONB)
+    stats = mapped_column(JSONB, deferred=True, deferred_raiseload=True)
     description: Mapped[str | None]
     image_url: Mapped[str | None]
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class TeamInMatch(Model):
     __tablename__ = "team_in_match"
-    team_id: Mapped[UUID] = mapped_column(ForeignKey("team.team_id"), primary_key=True)
+    __table_args__ = (
+        # The primary key leads with team_id, teams of a match need their own index.
+        Index("ix_team_in_match_match_id", "match_id", postgresql_include=["place"]),
+    )
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("team.team_id", ondelete="CASCADE"), primary_key=True
+    )
     match_id: Mapped[UUID] = mapped_column(
-        ForeignKey("match.match_id"), primary_key=True
+        ForeignKey("match.match_id", ondelete="CASCADE"), primary_key=True
     )
     place: Mapped[int | None]
     stats = mapped_column(JSONB, nullable=True)
 
 
-class MatchStatus(Model):
-    __tablename__ = "match_status"
-    status_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
-    match: Mapped["Match"] = relationship(
-        back_populates="match_status",
-        uselist=False,
-        cascade="save-update, expunge, merge",
-    )
-    name: Mapped[MatchStatusEnum]
-    status: Mapped[dict[str, str] | None] = mapped_column(
-        MutableDict.as_mutable(JSONB())
-    )
-    image_url: Mapped[str | None]
+class MatchStatus(NamedTuple):
+    """
+    Status of a match as one value, for code written against the former
+    ``match_status`` table.  The status lives on ``match`` itself
+    (``Match.status``/``Match.status_payload``); assign a new ``MatchStatus`` to
+    ``Match.match_status`` to change it.
+    """
 
-    created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
-    )
+    name: MatchStatusEnum
+    status: dict[str, str] | None = None
+    image_url: str | None = None
 
 
-class Match(Model):
+class Match(Versioned, Model):
     __tablename__ = "match"
     __table_args__ = (
         UniqueConstraint(
@@ -272,13 +328,22 @@ class Match(Model):
             "planned_start_datetime",
             name="match_name_planned_start_datetime_unique",
         ),
+        # Schedule queries filter on the status and end without visiting the heap.
+        Index(
+            "ix_match_sport_planned_start",
+            "sport_id",
+            "planned_start_datetime",
+            postgresql_include=["status", "end_datetime"],
+        ),
+    )
+    match_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
     )
-    match_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
     sport_id: Mapped[UUID] = mapped_column(ForeignKey("sport.sport_id"))
     match_name: Mapped[str]
     pretty_match_name: Mapped[str | None]
     match_streams: Mapped[dict[str, tuple[str, str, str, str]] | None] = mapped_column(
-        MutableDict.as_mutable(JSONB())
+        MutableDict.as_mutable(JSONB()), deferred=True, deferred_raiseload=True
     )
     match_url: Mapped[str | None]
     tournament_url: Mapped[str | None]
@@ -292,30 +357,28 @@ class Match(Model):
         uselist=False,
         cascade="save-update, expunge, merge",
     )
-    match_status: Mapped["MatchStatus"] = relationship(
-        back_populates="match",
-        uselist=False,
-        cascade="save-update, expunge, merge",
-    )
     match_teams: Mapped[list["Team"] | None] = relationship(
         back_populates="matches",
         uselist=True,
         secondary="team_in_match",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     ai_statements: Mapped[list["MatchAIStatement"] | None] = relationship(
         back_populates="matches",
         uselist=True,
         secondary="ai_statement_in_match",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     substitutions: Mapped[list["Substitution"] | None] = relationship(
         back_populates="match",
         uselist=True,
         cascade="save-update, expunge, merge, delete",
+        passive_deletes=True,
     )
     competition_id: Mapped[UUID | None] = mapped_column(
-        ForeignKey("competition.competition_id")
+        ForeignKey("competition.competition_id", ondelete="CASCADE")
     )
     competition: Mapped["Competition"] = relationship(
         back_populates="matches",
@@ -327,55 +390,118 @@ class Match(Model):
         uselist=True,
         secondary="filtered_match_in_news",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
+    )
+    status: Mapped[MatchStatusEnum | None]
+    status_payload: Mapped[dict[str, str] | None] = mapped_column(
+        MutableDict.as_mutable(JSONB(none_as_null=True))
+    )
+    # Appended by a trigger whenever ``status`` changes, oldest first.
+    status_history: Mapped[list["MatchStatusHistory"]] = relationship(
+        back_populates="match",
+        order_by="MatchStatusHistory.history_id",
+        viewonly=True,
+        lazy="raise",
     )
-    status_id: Mapped[UUID | None] = mapped_column(ForeignKey("match_status.status_id"))
     planned_start_datetime: Mapped[datetime | None]
     end_datetime: Mapped[datetime | None]
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
+    )
+
+    @property
+    def match_status(self) -> MatchStatus | None:
+        if self.status is None:
+            return None
+        payload = dict(self.status_payload or {})
+        image_url = payload.pop("image_url", None)
+        return MatchStatus(self.status, payload or None, image_url)
+
+    @match_status.setter
+    def match_status(self, value: MatchStatus | None) -> None:
+        if value is None:
+            self.status = self.status_payload = None
+            return
+        payload = dict(value.status or {})
+        if value.image_url is not None:
+            payload["image_url"] = value.image_url
+        self.status = value.name
+        self.status_payload = payload or None
+
+
+class MatchStatusHistory(Model):
+    """Append-only log of status transitions, written by a trigger on ``match``."""
+
+    __tablename__ = "match_status_history"
+    __table_args__ = (
+        Index("ix_match_status_history_match_id", "match_id"),
+        # Rows arrive in time order, a BRIN index stays tiny on a huge log.
+        Index(
+            "ix_match_status_history_changed_at",
+            "changed_at",
+            postgresql_using="brin",
+        ),
+    )
+    history_id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=True), primary_key=True
+    )
+    match_id: Mapped[UUID] = mapped_column(
+        ForeignKey("match.match_id", ondelete="CASCADE")
+    )
+    match: Mapped["Match"] = relationship(
+        back_populates="status_history", viewonly=True, lazy="raise"
+    )
+    status: Mapped[MatchStatusEnum]
+    changed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
 
 
 class AIStatementInMatch(Model):
     __tablename__ = "ai_statement_in_match"
     statement_id: Mapped[UUID] = mapped_column(
-        ForeignKey("match_ai_statement.statement_id"),
+        ForeignKey("match_ai_statement.statement_id", ondelete="CASCADE"),
         primary_key=True,
     )
     match_id: Mapped[UUID] = mapped_column(
-        ForeignKey("match.match_id"), primary_key=True
+        ForeignKey("match.match_id", ondelete="CASCADE"), primary_key=True
     )
 
 
 class MatchAIStatement(Model):
     __tablename__ = "match_ai_statement"
-    statement_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    statement_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     matches: Mapped[list["Match"] | None] = relationship(
         back_populates="ai_statements",
         uselist=True,
         secondary="ai_statement_in_match",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class Coach(Model):
     __tablename__ = "coach"
-    coach_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    coach_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     name: Mapped[str]
     description: Mapped[str | None]
     image_url: Mapped[str | None]
@@ -384,32 +510,35 @@ class Coach(Model):
         uselist=True,
         secondary="coach_in_team",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     stats = mapped_column(JSONB)
     regalia = mapped_column(JSONB)
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class CoachInTeam(Model):
     __tablename__ = "coach_in_team"
     coach_id: Mapped[UUID] = mapped_column(
-        ForeignKey("coach.coach_id"), primary_key=True
+        ForeignKey("coach.coach_id", ondelete="CASCADE"), primary_key=True
+    )
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("team.team_id", ondelete="CASCADE"), primary_key=True
     )
-    team_id: Mapped[UUID] = mapped_column(ForeignKey("team.team_id"), primary_key=True)
 
 
 class Substitution(Model):
     __tablename__ = "substitution"
     match_id: Mapped[UUID] = mapped_column(
-        ForeignKey("match.match_id"), primary_key=True
+        ForeignKey("match.match_id", ondelete="CASCADE"), primary_key=True
     )
     match: Mapped["Match"] = relationship(
         back_populates="substitutions",
@@ -428,23 +557,37 @@ class Substitution(Model):
         ForeignKey("team_member.player_id"), primary_key=True
     )
     time: Mapped[int | None]
-    team_id: Mapped[UUID] = mapped_column(ForeignKey("team.team_id"))
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("team.team_id", ondelete="CASCADE")
+    )
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class RawNews(Model):
     __tablename__ = "raw_news"
-    raw_news_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    raw_news_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     sport_id: Mapped[UUID] = mapped_column(ForeignKey("sport.sport_id"))
     header: Mapped[str | None]
-    text: Mapped[list[str]] = mapped_column(MutableList.as_mutable(JSONB()))
+    # The body lives in raw_news_body: status updates rewrite narrow tuples and
+    # scans of the metadata do not read it.  Load with selectinload(RawNews.body).
+    body: Mapped["RawNewsBody"] = relationship(
+        uselist=False,
+        lazy="raise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    text: AssociationProxy[list[str]] = association_proxy(
+        "body", "text", creator=lambda text: RawNewsBody(text=text)
+    )
     url: Mapped[str]
     news_creation_time: Mapped[datetime | None] = mapped_column(
         TIMESTAMP(timezone=False)
@@ -454,24 +597,38 @@ class RawNews(Model):
         TIMESTAMP(timezone=False)
     )
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class FormattedNews(Model):
     __tablename__ = "formatted_news"
-    formatted_news_id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid6)
+    formatted_news_id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=uuid7()
+    )
     sport_id: Mapped[UUID] = mapped_column(ForeignKey("sport.sport_id"))
     header: Mapped[str | None]
-    text: Mapped[str]
+    # See RawNews.body.
+    body: Mapped["FormattedNewsBody"] = relationship(
+        uselist=False,
+        lazy="raise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    text: AssociationProxy[str] = association_proxy(
+        "body", "text", creator=lambda text: FormattedNewsBody(text=text)
+    )
     url: Mapped[str]
     keywords: Mapped[dict[str, list[str]]] = mapped_column(
-        MutableDict.as_mutable(JSONB())
+        MutableDict.as_mutable(JSONB()),
+        deferred=True,
+        deferred_group="body",
+        deferred_raiseload=True,
     )
     news_creation_time: Mapped[datetime | None] = mapped_column(
         TIMESTAMP(timezone=False)
@@ -481,32 +638,76 @@ class FormattedNews(Model):
         uselist=True,
         secondary="filtered_match_in_news",
         cascade="save-update, expunge, merge",
+        passive_deletes=True,
     )
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
     )
 
 
 class FilteredMatchInNews(Model):
     __tablename__ = "filtered_match_in_news"
+    __table_args__ = (
+        # Top-N news per match (flux_orm.news_ranking) in index order.
+        Index(
+            "ix_filtered_match_in_news_relevance",
+            "match_id",
+            text("respective_relevance DESC NULLS LAST"),
+            text("created_at DESC"),
+            postgresql_include=["news_id"],
+        ),
+    )
     match_id: Mapped[UUID] = mapped_column(
-        ForeignKey("match.match_id"), primary_key=True
+        ForeignKey("match.match_id", ondelete="CASCADE"), primary_key=True
     )
     news_id: Mapped[UUID] = mapped_column(
-        ForeignKey("formatted_news.formatted_news_id"), primary_key=True
+        ForeignKey("formatted_news.formatted_news_id", ondelete="CASCADE"),
+        primary_key=True,
     )
     respective_relevance: Mapped[int | None]
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=False), default=utcnow_naive()
+        TIMESTAMP(timezone=False), server_default=utcnow()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=False),
-        default=utcnow_naive(),
-        onupdate=utcnow_naive(),
+        server_default=utcnow(),
+        server_onupdate=FetchedValue(),
+    )
+
+
+class RawNewsBody(Model):
+    __tablename__ = "raw_news_body"
+    raw_news_id: Mapped[UUID] = mapped_column(
+        ForeignKey("raw_news.raw_news_id", ondelete="CASCADE"), primary_key=True
+    )
+    text: Mapped[list[str]] = mapped_column(MutableList.as_mutable(JSONB()))
+
+
+class FormattedNewsBody(Model):
+    __tablename__ = "formatted_news_body"
+    formatted_news_id: Mapped[UUID] = mapped_column(
+        ForeignKey("formatted_news.formatted_news_id", ondelete="CASCADE"),
+        primary_key=True,
     )
+    text: Mapped[str]
+
+
+compression.compress(RawNewsBody.__table__.c.text)
+compression.compress(FormattedNewsBody.__table__.c.text)
+# Names spelled differently by every source, see ``flux_orm.fuzzy``.
+for column in (
+    Team.__table__.c.name,
+    Team.__table__.c.pretty_name,
+    TeamMember.__table__.c.nickname,
+    TeamMember.__table__.c.name,
+    Competition.__table__.c.name,
+):
+    trigram.index(column)
+server_defaults.install(Model.metadata)
+trigram.install(Model.metadata)
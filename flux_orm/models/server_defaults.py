@@ -0,0 +1,120 @@
+"""Server-side generation of ids and timestamps.
+
+Primary keys come from ``uuid_generate_v7()`` (time ordered, like ``uuid6``),
+``created_at``/``updated_at`` from ``now()`` in UTC and ``updated_at`` is kept
+current by a trigger.  Core ``insert().values([...])`` and COPY therefore need no
+Python-side default processing.  Another trigger appends every change of
+``match.status`` to ``match_status_history``, whichever way it is written.
+"""
+
+from sqlalchemy import DDL, MetaData, Table, event, func
+
+UUID7_FUNCTION = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint)
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = timezone('utc', now());
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+STATUS_HISTORY_FUNCTION = """
+CREATE OR REPLACE FUNCTION append_match_status_history() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO match_status_history (match_id, status) VALUES (NEW.match_id, NEW.status);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+STATUS_HISTORY_TRIGGERS = (
+    'CREATE TRIGGER "match_status_history_insert" AFTER INSERT ON "match" '
+    "FOR EACH ROW WHEN (NEW.status IS NOT NULL) "
+    "EXECUTE FUNCTION append_match_status_history()",
+    'CREATE TRIGGER "match_status_history_update" AFTER UPDATE OF status ON "match" '
+    "FOR EACH ROW WHEN (NEW.status IS NOT NULL AND NEW.status IS DISTINCT FROM OLD.status) "
+    "EXECUTE FUNCTION append_match_status_history()",
+)
+
+# Tables written by the triggers above whenever the key table is written.
+TRIGGER_WRITES = {"match": ("match_status_history",)}
+
+DROP_STATUS_HISTORY = (
+    'DROP TRIGGER IF EXISTS "match_status_history_update" ON "match"',
+    'DROP TRIGGER IF EXISTS "match_status_history_insert" ON "match"',
+    "DROP FUNCTION IF EXISTS append_match_status_history()",
+)
+
+DROP_FUNCTIONS = (
+    "DROP FUNCTION IF EXISTS set_updated_at()",
+    "DROP FUNCTION IF EXISTS uuid_generate_v7()",
+)
+
+
+def uuid7():
+    """Server default for primary keys."""
+    return func.uuid_generate_v7()
+
+
+def utcnow():
+    """Server default for naive UTC timestamps, matching ``utcnow_naive``."""
+    return func.timezone("utc", func.now())
+
+
+def updated_at_trigger_name(table_name: str) -> str:
+    return f"{table_name}_set_updated_at"
+
+
+def create_updated_at_trigger(table_name: str) -> str:
+    return (
+        f'CREATE TRIGGER "{updated_at_trigger_name(table_name)}" '
+        f'BEFORE UPDATE ON "{table_name}" '
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+    )
+
+
+def drop_updated_at_trigger(table_name: str) -> str:
+    return (
+        f'DROP TRIGGER IF EXISTS "{updated_at_trigger_name(table_name)}" '
+        f'ON "{table_name}"'
+    )
+
+
+def install(metadata: MetaData) -> None:
+    """Create the functions and triggers together with ``metadata.create_all``."""
+    event.listen(metadata, "before_create", DDL(UUID7_FUNCTION))
+    event.listen(metadata, "before_create", DDL(UPDATED_AT_FUNCTION))
+
+    @event.listens_for(Table, "after_create")
+    def _add_updated_at_trigger(table: Table, connection, **kw) -> None:
+        if table.metadata is metadata and "updated_at" in table.c:
+            connection.exec_driver_sql(create_updated_at_trigger(table.name))
+
+    @event.listens_for(metadata, "after_create")
+    def _add_status_history_triggers(target, connection, tables=(), **kw) -> None:
+        if "match_status_history" in {table.name for table in tables}:
+            connection.exec_driver_sql(STATUS_HISTORY_FUNCTION)
+            for trigger in STATUS_HISTORY_TRIGGERS:
+                connection.exec_driver_sql(trigger)
@@ -0,0 +1,62 @@
+"""
+Trigram indexes for fuzzy name lookups.
+
+``pg_trgm`` ships with postgresql-contrib.  GIN indexes with ``gin_trgm_ops``
+serve the ``%`` similarity operator of ``flux_orm.fuzzy``.  Servers without
+the extension still get the rest of the schema from ``create_all``: the
+extension is skipped with a NOTICE and so are the indexes.  Migrations require
+it.
+"""
+
+from sqlalchemy import DDL, Column, Index, MetaData, event
+
+OPERATOR_CLASS = "gin_trgm_ops"
+
+CREATE_EXTENSION = """
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+EXCEPTION WHEN feature_not_supported OR undefined_file THEN
+    RAISE NOTICE 'pg_trgm is not available, trigram indexes are not created';
+END $$
+"""
+
+
+def index_name(column: Column) -> str:
+    return f"ix_{column.table.name}_{column.name}_trgm"
+
+
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    return bool(
+        bind.exec_driver_sql(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+        ).first()
+    )
+
+
+def index(column: Column) -> Index:
+    """Add a GIN trigram index on ``column`` to its table."""
+    return Index(
+        index_name(column),
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column.name: OPERATOR_CLASS},
+    ).ddl_if(dialect="postgresql", callable_=_pg_trgm_installed)
+
+
+def indexed_columns(table) -> list[Column]:
+    """Columns of ``table`` with a trigram index, in index name order."""
+    return [
+        index.columns[0]
+        for index in sorted(table.indexes, key=lambda index: index.name)
+        if OPERATOR_CLASS in (index.dialect_options["postgresql"]["ops"] or {}).values()
+    ]
+
+
+def install(metadata: MetaData) -> None:
+    """Create the extension, if available, together with ``metadata.create_all``."""
+    event.listen(
+        metadata,
+        "before_create",
+        DDL(CREATE_EXTENSION).execute_if(dialect="postgresql"),
+    )
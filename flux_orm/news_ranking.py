@@ -0,0 +1,157 @@
+"""Most relevant news per match, for many matches at once.
+
+``top_news`` reads the ``limit`` best links of every requested match from
+``ix_filtered_match_in_news_relevance`` with a ``LATERAL`` subquery: each
+match costs one short index range scan, however many news it has, and the
+news rows are joined only for the links that made the cut.  The order is
+``respective_relevance DESC NULLS LAST, created_at DESC``; the index has the
+same sort order, so no sort is needed.
+
+``upsert_relevance`` writes the scores of the news filter in one statement.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import ARRAY, Select, bindparam, cast, func, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
+
+from flux_orm.models.models import FilteredMatchInNews, FormattedNews, Match
+
+RELEVANCE_ORDER = (
+    FilteredMatchInNews.respective_relevance.desc().nulls_last(),
+    FilteredMatchInNews.created_at.desc(),
+)
+
+
+class RankedNews(NamedTuple):
+    news: FormattedNews
+    relevance: int | None
+
+
+def top_news_statement(
+    match_ids: Sequence[UUID], limit: int = 10, min_relevance: int | None = None
+) -> Select:
+    """Rows of ``(match_id, FormattedNews, respective_relevance)``, best first."""
+    id_type = FilteredMatchInNews.match_id.type
+    # The cast keeps the array typed when rendered with literal binds.
+    array = ARRAY(id_type)
+    ids = cast(bindparam("match_ids", list(match_ids), type_=array), array)
+    matches = (
+        func
+        .unnest(ids)
+        .table_valued("match_id", with_ordinality="position")
+        .render_derived(name="matches")
+    )
+    links = (
+        select(
+            FilteredMatchInNews.news_id,
+            FilteredMatchInNews.respective_relevance,
+            FilteredMatchInNews.created_at,
+        )
+        .where(FilteredMatchInNews.match_id == matches.c.match_id)
+        .order_by(*RELEVANCE_ORDER)
+        .limit(limit)
+    )
+    if min_relevance is not None:
+        links = links.where(FilteredMatchInNews.respective_relevance >= min_relevance)
+    links = links.lateral("links")
+    return (
+        select(matches.c.match_id, FormattedNews, links.c.respective_relevance)
+        .select_from(matches)
+        .join(links, true())
+        .join(FormattedNews, FormattedNews.formatted_news_id == links.c.news_id)
+        .order_by(
+            matches.c.position,
+            links.c.respective_relevance.desc().nulls_last(),
+            links.c.created_at.desc(),
+        )
+    )
+
+
+async def top_news(
+    session: AsyncSession,
+    match_ids: Iterable[UUID],
+    limit: int = 10,
+    min_relevance: int | None = None,
+    options: Sequence[ORMOption] = (),
+) -> dict[UUID, list[RankedNews]]:
+    """
+    The ``limit`` most relevant, then most recent, news of each match.
+
+    Every requested match is a key of the result, matches without news map to
+    an empty list.  ``options`` are applied to the news, for example
+    ``selectinload(FormattedNews.body)``.
+    """
+    match_ids = list(dict.fromkeys(match_ids))
+    result: dict[UUID, list[RankedNews]] = {match_id: [] for match_id in match_ids}
+    if not match_ids or limit <= 0:
+        return result
+    stmt = top_news_statement(match_ids, limit, min_relevance).options(*options)
+    for match_id, news, relevance in await session.execute(stmt):
+        result[match_id].append(RankedNews(news, relevance))
+    return result
+
+
+async def upsert_relevance(
+    session: AsyncSession, scores: Iterable[tuple[UUID, UUID, int | None]]
+) -> int:
+    """
+    Insert or update ``(match_id, news_id, relevance)`` links.
+
+    A pair given twice keeps its last score.  Links whose score does not change
+    are not rewritten.  Returns the number of inserted or updated links.
+    """
+    latest = {(match_id, news_id): score for match_id, news_id, score in scores}
+    if not latest:
+        return 0
+    table = FilteredMatchInNews.__table__
+    pairs = list(latest)
+    rows = (
+        func
+        .unnest(
+            bindparam(
+                "match_ids",
+                [match_id for match_id, _ in pairs],
+                type_=ARRAY(table.c.match_id.type),
+            ),
+            bindparam(
+                "news_ids",
+                [news_id for _, news_id in pairs],
+                type_=ARRAY(table.c.news_id.type),
+            ),
+            bindparam(
+                "relevances",
+                list(latest.values()),
+                type_=ARRAY(table.c.respective_relevance.type),
+            ),
+        )
+        .table_valued("match_id", "news_id", "respective_relevance")
+        .render_derived(name="scores")
+    )
+    stmt = insert(table).from_select(
+        ["match_id", "news_id", "respective_relevance"], select(rows)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.match_id, table.c.news_id],
+        set_={"respective_relevance": stmt.excluded.respective_relevance},
+        where=table.c.respective_relevance.is_distinct_from(
+            stmt.excluded.respective_relevance
+        ),
+    )
+    written = (await session.execute(stmt)).rowcount
+    # New links change the collections on both sides that are already loaded.
+    for model, ids, attribute in (
+        (Match, {match_id for match_id, _ in pairs}, "formatted_news"),
+        (FormattedNews, {news_id for _, news_id in pairs}, "relevant_matches"),
+    ):
+        for id_ in ids:
+            obj = session.sync_session.identity_map.get(
+                session.identity_key(model, id_)
+            )
+            if obj is not None:
+                session.expire(obj, [attribute])
+    return written
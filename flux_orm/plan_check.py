@@ -0,0 +1,459 @@
+"""Query plan regression harness.
+
+Runs a catalog of canonical queries with ``EXPLAIN (ANALYZE, BUFFERS, FORMAT
+JSON)`` against deterministic seed data and compares the plans with stored
+baselines.  Everything runs in one transaction that is rolled back, so it can
+be pointed at any development database::
+
+    python -m flux_orm.plan_check            # compare, exit 1 on regressions
+    python -m flux_orm.plan_check --update   # accept the current plans
+
+A regression is a structural change that makes a query scale worse: a new
+sequential scan, a sort or hash spilling to disk, or a total cost growing past
+``cost_factor`` times the baseline.  Other plan shape changes are reported
+without failing.
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
+
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from flux_orm.custom_logger import logger
+from flux_orm.models.enums import PipelineStatus
+from flux_orm.models.models import (
+    FilteredMatchInNews,
+    FormattedNews,
+    Match,
+    PlayerInTeam,
+    TeamMember,
+)
+from flux_orm.news_ranking import top_news_statement
+from flux_orm.schedule import LIVE_LOOKBACK, schedule_statement
+
+BASELINE_PATH = (
+    pathlib.Path(__file__).resolve().parent / "tests" / "plan_baselines.json"
+)
+
+SEED_START = datetime(2026, 1, 1)
+SEED_SPORTS = 4
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO sport (name)
+    SELECT 'plan-sport-' || i FROM generate_series(0, :sports - 1) i
+    """,
+    """
+    WITH s AS (
+        SELECT array_agg(sport_id ORDER BY name) AS ids
+        FROM sport WHERE name LIKE 'plan-sport-%'
+    )
+    INSERT INTO competition (sport_id, name)
+    SELECT s.ids[1 + i % :sports], 'plan-competition-' || i
+    FROM generate_series(0, :competitions - 1) i, s
+    """,
+    """
+    INSERT INTO team (name)
+    SELECT 'plan-team-' || i FROM generate_series(0, :teams - 1) i
+    """,
+    """
+    INSERT INTO team_member (nickname, name)
+    SELECT 'plan-player-' || i, 'Player ' || i
+    FROM generate_series(0, :teams * 5 - 1) i
+    """,
+    # Autovacuum may have analyzed the dead rows of an earlier rolled back
+    # seed and recorded the tables as empty; without fresh statistics the
+    # joins below run as nested loops over sequential scans.
+    """
+    ANALYZE team, team_member
+    """,
+    """
+    INSERT INTO player_in_team (player_id, team_id)
+    SELECT p.player_id, t.team_id
+    FROM team_member p
+    JOIN team t ON t.name = 'plan-team-' || (substr(p.nickname, 13)::int % :teams)
+    WHERE p.nickname LIKE 'plan-player-%'
+    """,
+    """
+    WITH s AS (
+        SELECT array_agg(sport_id ORDER BY name) AS ids
+        FROM sport WHERE name LIKE 'plan-sport-%'
+    ), c AS (
+        SELECT array_agg(competition_id ORDER BY name) AS ids
+        FROM competition WHERE name LIKE 'plan-competition-%'
+    )
+    INSERT INTO match (
+        sport_id, competition_id, match_name, external_id,
+        planned_start_datetime, pipeline_status, pipeline_update_time
+    )
+    SELECT
+        s.ids[1 + i % :sports],
+        c.ids[1 + i % :competitions],
+        'plan match ' || i,
+        'plan-match-' || i,
+        CAST(:start AS timestamp) + i * interval '10 minutes',
+        CASE WHEN i % 10 = 0 THEN 'NEW' ELSE 'PROCESSED' END::pipelinestatus,
+        CAST(:start AS timestamp) + i * interval '1 minute'
+    FROM generate_series(0, :matches - 1) i, s, c
+    """,
+    """
+    WITH t AS (
+        SELECT array_agg(team_id ORDER BY name) AS ids
+        FROM team WHERE name LIKE 'plan-team-%'
+    )
+    INSERT INTO team_in_match (team_id, match_id, place)
+    SELECT t.ids[1 + (substr(m.external_id, 12)::int + side) % :teams], m.match_id, side
+    FROM match m, t, generate_series(0, 1) side
+    WHERE m.external_id LIKE 'plan-match-%'
+    """,
+    """
+    UPDATE match SET status = CASE
+        WHEN planned_start_datetime < CAST(:start AS timestamp) + interval '30 days'
+        THEN 'FINISHED'
+        ELSE 'SCHEDULED'
+    END::matchstatusenum
+    WHERE external_id LIKE 'plan-match-%'
+    """,
+    """
+    WITH s AS (
+        SELECT array_agg(sport_id ORDER BY name) AS ids
+        FROM sport WHERE name LIKE 'plan-sport-%'
+    )
+    INSERT INTO formatted_news (sport_id, header, url, keywords, news_creation_time)
+    SELECT
+        s.ids[1 + i % :sports],
+        'plan news ' || i,
+        'https://news.example/' || i,
+        '{}'::jsonb,
+        CAST(:start AS timestamp) + i * interval '20 minutes'
+    FROM generate_series(0, :matches / 2 - 1) i, s
+    """,
+    """
+    ANALYZE match, formatted_news
+    """,
+    """
+    INSERT INTO filtered_match_in_news (match_id, news_id, respective_relevance)
+    SELECT DISTINCT ON (m.match_id, n.formatted_news_id)
+        m.match_id, n.formatted_news_id, (k.i * 7) % 100
+    FROM formatted_news n
+    JOIN LATERAL (
+        SELECT substr(n.header, 11)::int AS i
+    ) k ON true
+    JOIN match m ON m.external_id IN (
+        'plan-match-' || (k.i * 2),
+        'plan-match-' || ((k.i * 7) % :matches)
+    )
+    WHERE n.header LIKE 'plan news %'
+    """,
+]
+
+ANALYZED_TABLES = [
+    "sport",
+    "competition",
+    "team",
+    "team_member",
+    "player_in_team",
+    "match",
+    "team_in_match",
+    "match_status_history",
+    "formatted_news",
+    "filtered_match_in_news",
+]
+
+
+def _match_by_external_id(sample: dict):
+    return select(Match).where(Match.external_id == sample["external_id"])
+
+
+def _matches_by_sport_and_window(sample: dict):
+    return (
+        select(Match)
+        .where(
+            Match.sport_id == sample["sport_id"],
+            Match.planned_start_datetime >= sample["window_start"],
+            Match.planned_start_datetime < sample["window_end"],
+        )
+        .order_by(Match.planned_start_datetime)
+        .limit(50)
+    )
+
+
+def _news_for_match(sample: dict):
+    return (
+        select(FormattedNews)
+        .join(
+            FilteredMatchInNews,
+            FilteredMatchInNews.news_id == FormattedNews.formatted_news_id,
+        )
+        .where(FilteredMatchInNews.match_id == sample["match_id"])
+        .order_by(FormattedNews.news_creation_time.desc())
+        .limit(20)
+    )
+
+
+def _team_roster(sample: dict):
+    return (
+        select(TeamMember)
+        .join(PlayerInTeam, PlayerInTeam.player_id == TeamMember.player_id)
+        .where(PlayerInTeam.team_id == sample["team_id"])
+    )
+
+
+def _schedule(sample: dict):
+    return schedule_statement(
+        sample["sport_id"],
+        sample["window_start"] - LIVE_LOOKBACK,
+        sample["window_start"] + timedelta(hours=24),
+    )
+
+
+def _top_news(sample: dict):
+    return top_news_statement(sample["match_ids"], limit=10)
+
+
+def _pipeline_claim(sample: dict):
+    claimable = (
+        select(Match.match_id)
+        .where(Match.pipeline_status == PipelineStatus.NEW)
+        .order_by(Match.pipeline_update_time)
+        .limit(100)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(Match)
+        .where(Match.match_id.in_(claimable.scalar_subquery()))
+        .values(pipeline_status=PipelineStatus.SENT)
+        .returning(Match.match_id)
+    )
+
+
+CANONICAL_QUERIES: dict[str, Callable[[dict], Any]] = {
+    "match_by_external_id": _match_by_external_id,
+    "matches_by_sport_and_window": _matches_by_sport_and_window,
+    "news_for_match": _news_for_match,
+    "team_roster": _team_roster,
+    "schedule": _schedule,
+    "top_news": _top_news,
+    "pipeline_claim": _pipeline_claim,
+}
+
+
+class PlanSummary(NamedTuple):
+    shape: list[str]
+    total_cost: float
+    seq_scans: list[str]
+    spills: list[str]
+    execution_ms: float
+    shared_blocks: int
+
+    def to_baseline(self) -> dict:
+        # Timings and buffer counts are too noisy to compare, keep them for reading.
+        return self._asdict()
+
+
+class PlanDiff(NamedTuple):
+    regressions: list[str]
+    changes: list[str]
+
+
+async def seed(conn: AsyncConnection, matches: int = 20_000) -> dict:
+    """Insert deterministic data and return sample parameters for the catalog."""
+    params = {
+        "sports": SEED_SPORTS,
+        "competitions": 200,
+        "teams": 1_000,
+        "matches": matches,
+        "start": SEED_START,
+    }
+    for statement in SEED_STATEMENTS:
+        await conn.execute(text(statement), params)
+    for table in ANALYZED_TABLES:
+        await conn.execute(text(f'ANALYZE "{table}"'))
+
+    row = (
+        await conn.execute(
+            text(
+                "SELECT m.match_id, m.sport_id, m.external_id, t.team_id "
+                "FROM match m, team t "
+                "WHERE m.external_id = :external_id AND t.name = 'plan-team-42'"
+            ),
+            {"external_id": f"plan-match-{matches // 2}"},
+        )
+    ).one()
+    match_ids = (
+        await conn.execute(
+            text(
+                "SELECT match_id FROM match "
+                "WHERE external_id = ANY(:external_ids) ORDER BY external_id"
+            ),
+            {"external_ids": [f"plan-match-{i * 2}" for i in range(50)]},
+        )
+    ).scalars().all()
+    window_start = SEED_START + timedelta(days=30)
+    return {
+        "match_id": row.match_id,
+        "sport_id": row.sport_id,
+        "external_id": row.external_id,
+        "team_id": row.team_id,
+        "match_ids": match_ids,
+        "window_start": window_start,
+        "window_end": window_start + timedelta(days=2),
+    }
+
+
+def _label(node: dict) -> str:
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    return label
+
+
+def _walk(node: dict, depth: int = 0):
+    yield depth, node
+    for child in node.get("Plans", ()):
+        yield from _walk(child, depth + 1)
+
+
+def summarize(explained: list | str) -> PlanSummary:
+    """Extract shape, cost, seq scans and spills from ``EXPLAIN (FORMAT JSON)`` output."""
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    root = explained[0]
+    plan = root["Plan"]
+    shape, seq_scans, spills = [], [], []
+    for depth, node in _walk(plan):
+        label = _label(node)
+        shape.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.append(node["Relation Name"])
+        if node.get("Sort Space Type") == "Disk":
+            spills.append(f"{label}: {node.get('Sort Method')}")
+        if node.get("Hash Batches", 1) > 1:
+            spills.append(f"{label}: {node['Hash Batches']} batches")
+    return PlanSummary(
+        shape=shape,
+        total_cost=plan["Total Cost"],
+        seq_scans=sorted(set(seq_scans)),
+        spills=spills,
+        execution_ms=root.get("Execution Time", 0.0),
+        shared_blocks=plan.get("Shared Hit Blocks", 0)
+        + plan.get("Shared Read Blocks", 0),
+    )
+
+
+async def explain(conn: AsyncConnection, statement) -> PlanSummary:
+    """``EXPLAIN ANALYZE`` ``statement`` in a savepoint that is rolled back."""
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    savepoint = await conn.begin_nested()
+    try:
+        result = await conn.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+        )
+        return summarize(result.scalar_one())
+    finally:
+        await savepoint.rollback()
+
+
+async def run_catalog(
+    conn: AsyncConnection, matches: int = 20_000
+) -> dict[str, PlanSummary]:
+    """Seed ``conn`` and explain every canonical query; the caller rolls back."""
+    # Parallel workers and JIT make plans depend on the machine.
+    await conn.execute(text("SET LOCAL max_parallel_workers_per_gather = 0"))
+    await conn.execute(text("SET LOCAL jit = off"))
+    sample = await seed(conn, matches)
+    return {
+        name: await explain(conn, build(sample))
+        for name, build in CANONICAL_QUERIES.items()
+    }
+
+
+def compare(baseline: dict, current: PlanSummary, cost_factor: float = 2.0) -> PlanDiff:
+    regressions, changes = [], []
+    for relation in sorted(set(current.seq_scans) - set(baseline["seq_scans"])):
+        regressions.append(f"new sequential scan on {relation}")
+    for spill in current.spills:
+        if spill not in baseline["spills"]:
+            regressions.append(f"spills to disk: {spill}")
+    if current.total_cost > baseline["total_cost"] * cost_factor:
+        regressions.append(
+            f"total cost {current.total_cost} > {cost_factor} x {baseline['total_cost']}"
+        )
+    if current.shape != baseline["shape"]:
+        changes.append(
+            "plan shape changed:\n"
+            + "\n".join(baseline["shape"])
+            + "\n->\n"
+            + "\n".join(current.shape)
+        )
+    return PlanDiff(regressions, changes)
+
+
+def load_baselines(path: pathlib.Path = BASELINE_PATH) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baselines(
+    plans: dict[str, PlanSummary], path: pathlib.Path = BASELINE_PATH
+) -> None:
+    path.write_text(
+        json.dumps({name: plan.to_baseline() for name, plan in plans.items()}, indent=2)
+        + "\n"
+    )
+
+
+def check(
+    plans: dict[str, PlanSummary], baselines: dict, cost_factor: float = 2.0
+) -> dict[str, PlanDiff]:
+    """Compare every plan with its baseline; queries without one are reported as changes."""
+    diffs = {}
+    for name, plan in plans.items():
+        if name not in baselines:
+            diffs[name] = PlanDiff([], ["no baseline"])
+        else:
+            diffs[name] = compare(baselines[name], plan, cost_factor)
+    return diffs
+
+
+async def _main(engine: AsyncEngine, update_baselines: bool, cost_factor: float) -> int:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            plans = await run_catalog(conn)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    if update_baselines:
+        save_baselines(plans)
+        logger.info(f"Saved {len(plans)} plan baselines to {BASELINE_PATH}")
+        return 0
+    failed = False
+    for name, diff in check(plans, load_baselines(), cost_factor).items():
+        for change in diff.changes:
+            logger.info(f"{name}: {change}")
+        for regression in diff.regressions:
+            failed = True
+            logger.error(f"{name}: {regression}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    from flux_orm.database import async_engine
+
+    parser = argparse.ArgumentParser(prog="python -m flux_orm.plan_check")
+    parser.add_argument("--update", action="store_true", help="store current plans")
+    parser.add_argument("--cost-factor", type=float, default=2.0)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(async_engine, args.update, args.cost_factor)))
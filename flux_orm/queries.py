@@ -0,0 +1,167 @@
+"""Catalog of the hot read queries, built as cached lambda statements.
+
+Building ``select(Match).where(...)`` and generating its cache key costs more
+than running a primary key lookup on a warm connection.  The statements below
+are ``lambda_stmt``: the lambda runs once per process, later calls only pull
+the new parameter values out of its closure and find the compiled SQL in the
+engine's compiled cache.
+
+Values in a lambda's closure must only be used as bound parameters; anything
+that changes the shape of the statement (an optional filter, options) is added
+with ``stmt += lambda s: ...`` outside of it.  ``python -m
+flux_orm.benchmarks.hot_queries`` compares the catalog with ad-hoc statements.
+"""
+
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import StatementLambdaElement, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
+
+from flux_orm.models.models import (
+    FilteredMatchInNews,
+    FormattedNews,
+    Match,
+    PlayerInTeam,
+    Sport,
+    Team,
+    TeamMember,
+)
+
+
+def _with_options(
+    stmt: StatementLambdaElement, options: Sequence[ORMOption]
+) -> StatementLambdaElement:
+    if options:
+        options = tuple(options)
+        stmt += lambda s: s.options(*options)
+    return stmt
+
+
+def match_by_external_id_statement(external_id: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Match).where(Match.external_id == external_id))
+
+
+def matches_by_external_ids_statement(
+    external_ids: Sequence[str],
+) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: (
+            select(Match)
+            .where(Match.external_id.in_(external_ids))
+            .order_by(Match.external_id)
+        )
+    )
+
+
+def sport_by_name_statement(name: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Sport).where(Sport.name == name))
+
+
+def teams_by_names_statement(names: Sequence[str]) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Team).where(Team.name.in_(names)).order_by(Team.name)
+    )
+
+
+def matches_in_window_statement(
+    sport_id: UUID, start: datetime, end: datetime, limit: int = 50
+) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: (
+            select(Match)
+            .where(
+                Match.sport_id == sport_id,
+                Match.planned_start_datetime >= start,
+                Match.planned_start_datetime < end,
+            )
+            .order_by(Match.planned_start_datetime, Match.match_id)
+            .limit(limit)
+        )
+    )
+
+
+def team_roster_statement(team_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: (
+            select(TeamMember)
+            .join(PlayerInTeam, PlayerInTeam.player_id == TeamMember.player_id)
+            .where(PlayerInTeam.team_id == team_id)
+            .order_by(TeamMember.name)
+        )
+    )
+
+
+def news_for_match_statement(match_id: UUID, limit: int = 20) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: (
+            select(FormattedNews)
+            .join(
+                FilteredMatchInNews,
+                FilteredMatchInNews.news_id == FormattedNews.formatted_news_id,
+            )
+            .where(FilteredMatchInNews.match_id == match_id)
+            .order_by(FormattedNews.news_creation_time.desc())
+            .limit(limit)
+        )
+    )
+
+
+async def match_by_external_id(
+    session: AsyncSession, external_id: str, options: Sequence[ORMOption] = ()
+) -> Match | None:
+    stmt = _with_options(match_by_external_id_statement(external_id), options)
+    return (await session.scalars(stmt)).one_or_none()
+
+
+async def matches_by_external_ids(
+    session: AsyncSession,
+    external_ids: Iterable[str],
+    options: Sequence[ORMOption] = (),
+) -> list[Match]:
+    """Matches with any of ``external_ids``, ordered by external id."""
+    stmt = matches_by_external_ids_statement(list(dict.fromkeys(external_ids)))
+    return list(await session.scalars(_with_options(stmt, options)))
+
+
+async def sport_by_name(session: AsyncSession, name: str) -> Sport | None:
+    return (await session.scalars(sport_by_name_statement(name))).first()
+
+
+async def teams_by_names(
+    session: AsyncSession, names: Iterable[str], options: Sequence[ORMOption] = ()
+) -> list[Team]:
+    """Teams named exactly one of ``names``, ordered by name."""
+    stmt = teams_by_names_statement(list(dict.fromkeys(names)))
+    return list(await session.scalars(_with_options(stmt, options)))
+
+
+async def matches_in_window(
+    session: AsyncSession,
+    sport_id: UUID,
+    start: datetime,
+    end: datetime,
+    limit: int = 50,
+    options: Sequence[ORMOption] = (),
+) -> list[Match]:
+    """The first ``limit`` matches of ``sport_id`` planned in ``[start, end)``."""
+    stmt = matches_in_window_statement(sport_id, start, end, limit)
+    return list(await session.scalars(_with_options(stmt, options)))
+
+
+async def team_roster(session: AsyncSession, team_id: UUID) -> list[TeamMember]:
+    """Current players of ``team_id``, ordered by name."""
+    return list(await session.scalars(team_roster_statement(team_id)))
+
+
+async def news_for_match(
+    session: AsyncSession,
+    match_id: UUID,
+    limit: int = 20,
+    options: Sequence[ORMOption] = (),
+) -> list[FormattedNews]:
+    """The ``limit`` newest news linked to ``match_id``."""
+    stmt = _with_options(news_for_match_statement(match_id, limit), options)
+    return list(await session.scalars(stmt))
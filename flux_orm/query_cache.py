@@ -0,0 +1,356 @@
+"""Opt-in result cache for read queries, invalidated on commit.
+
+A statement is cached only when it asks for it::
+
+    query_cache.install()
+
+    stmt = cached(select(Match).where(Match.sport_id == sport_id), ttl=10)
+    matches = (await session.execute(stmt)).scalars().all()
+
+Entries are keyed on the compiled statement plus its parameters and tagged with
+every table the statement reads.  Writes made through a session (flushed ORM
+objects and ``insert``/``update``/``delete`` statements, also inside CTEs) are
+collected per transaction, together with the tables the database changes in
+turn through ``ON DELETE``/``ON UPDATE`` actions and triggers, and their tags
+are invalidated in ``after_commit``.  Invalidation bumps a per-table generation
+instead of scanning entries, so a result read while a conflicting transaction
+commits is never served afterwards.
+
+Writes issued with ``text()`` or by other processes are not seen; ``ttl``
+bounds how stale such entries can get.  ``MemoryBackend`` is local to the
+process; any object implementing ``CacheBackend`` (e.g. on top of Redis) can be
+passed to share entries and generations between processes.
+"""
+
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple, Protocol
+
+from sqlalchemy import Table, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import FrozenResult
+from sqlalchemy.orm import ORMExecuteState, Session, loading
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.expression import Delete, Insert, UpdateBase
+
+from flux_orm.models.server_defaults import TRIGGER_WRITES
+
+CACHE_OPTION = "query_cache"
+TTL_OPTION = "query_cache_ttl"
+_WRITES_KEY = "query_cache_writes"
+# Referential actions that change rows of the referencing table.
+_CHANGING_ACTIONS = {"CASCADE", "SET NULL", "SET DEFAULT"}
+_DIALECT = postgresql.dialect()
+
+
+class CacheEntry(NamedTuple):
+    result: FrozenResult
+    generations: tuple[int, ...]
+    expires_at: float
+    size: int
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    stale: int
+    evictions: int
+    invalidations: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheBackend(Protocol):
+    """Storage of entries and per-tag generations."""
+
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def generations(self, tags: Iterable[str]) -> tuple[int, ...]: ...
+
+    def bump(self, tags: Iterable[str]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """Process-local LRU bounded by entry count and by approximate size in bytes."""
+
+    def __init__(self, max_entries: int = 1_024, max_bytes: int | None = 64 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.size
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None
+                and self.bytes > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry.size
+
+    def generations(self, tags: Iterable[str]) -> tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def bump(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+def cached(statement, ttl: float | None = None):
+    """Mark ``statement`` as cacheable, optionally with its own ``ttl`` in seconds."""
+    options = {CACHE_OPTION: True}
+    if ttl is not None:
+        options[TTL_OPTION] = ttl
+    return statement.execution_options(**options)
+
+
+def tables_of(statement) -> tuple[str, ...]:
+    """Sorted names of the tables referenced anywhere in ``statement``."""
+    return tuple(
+        sorted(
+            {
+                element.name
+                for element in visitors.iterate(statement)
+                if isinstance(element, Table)
+            }
+        )
+    )
+
+
+def _dml_kind(statement: UpdateBase) -> str:
+    if isinstance(statement, Insert):
+        return "insert"
+    return "delete" if isinstance(statement, Delete) else "update"
+
+
+def _referential_actions(table: Table, kind: str):
+    """Tables changed by ``ON DELETE``/``ON UPDATE`` actions of keys to ``table``."""
+    for other in table.metadata.tables.values():
+        for fk in other.foreign_keys:
+            action = ((fk.ondelete if kind == "delete" else fk.onupdate) or "").upper()
+            if action in _CHANGING_ACTIONS and fk.column.table.name == table.name:
+                deleted = kind == "delete" and action == "CASCADE"
+                yield other, "delete" if deleted else "update"
+
+
+def _approximate_size(result: FrozenResult) -> int:
+    try:
+        return len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(result.data) + sum(
+            sys.getsizeof(row) for row in result.data
+        )
+
+
+class QueryCache:
+    """
+    Result cache hooked into ``Session`` events.
+
+    ``install`` registers it on the ``Session`` class (the sync class behind
+    ``AsyncSession``); only statements marked with ``cached`` are affected.
+    ``trigger_writes`` maps a table to the tables its triggers write.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl: float = 30.0,
+        trigger_writes: Mapping[str, Iterable[str]] = TRIGGER_WRITES,
+    ):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.trigger_writes = {
+            table: tuple(written) for table, written in trigger_writes.items()
+        }
+        self._affected_cache: dict[tuple, frozenset[str]] = {}
+        self._target = None
+        self._hits = self._misses = self._stale = self._invalidations = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self._hits,
+            self._misses,
+            self._stale,
+            getattr(self.backend, "evictions", 0),
+            self._invalidations,
+            len(self.backend) if hasattr(self.backend, "__len__") else -1,
+            getattr(self.backend, "bytes", -1),
+        )
+
+    def install(self, target=Session) -> "QueryCache":
+        self._target = target
+        event.listen(target, "do_orm_execute", self._on_execute)
+        event.listen(target, "after_flush", self._on_flush)
+        event.listen(target, "after_commit", self._on_commit)
+        event.listen(target, "after_soft_rollback", self._on_rollback)
+        return self
+
+    def uninstall(self) -> None:
+        if self._target is None:
+            return
+        event.remove(self._target, "do_orm_execute", self._on_execute)
+        event.remove(self._target, "after_flush", self._on_flush)
+        event.remove(self._target, "after_commit", self._on_commit)
+        event.remove(self._target, "after_soft_rollback", self._on_rollback)
+        self._target = None
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """Drop every entry reading one of ``tables``, e.g. after a ``text()`` write."""
+        tables = set(tables)
+        if tables:
+            self._invalidations += 1
+            self.backend.bump(sorted(tables))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    @staticmethod
+    def _writes(session: Session) -> set[str]:
+        return session.info.setdefault(_WRITES_KEY, set())
+
+    def _affected(self, table: Table, kind: str) -> frozenset[str]:
+        """``table`` and every table the database changes when it is written."""
+        key = (table.metadata, table.name, kind)
+        if key not in self._affected_cache:
+            seen = set()
+            pending = [(table, kind)]
+            while pending:
+                table, kind = pending.pop()
+                if (table.name, kind) in seen:
+                    continue
+                seen.add((table.name, kind))
+                for name in self.trigger_writes.get(table.name, ()):
+                    if name in table.metadata.tables:
+                        pending.append((table.metadata.tables[name], "insert"))
+                if kind != "insert":
+                    pending.extend(_referential_actions(table, kind))
+            self._affected_cache[key] = frozenset(name for name, _ in seen)
+        return self._affected_cache[key]
+
+    def _statement_writes(self, statement) -> set[str]:
+        return {
+            name
+            for element in visitors.iterate(statement)
+            if isinstance(element, UpdateBase) and isinstance(element.table, Table)
+            for name in self._affected(element.table, _dml_kind(element))
+        }
+
+    def _unflushed_tables(self, session: Session) -> set[str]:
+        return {
+            name
+            for objects, kind in (
+                (session.new, "insert"),
+                (session.dirty, "update"),
+                (session.deleted, "delete"),
+            )
+            for obj in objects
+            for table in obj.__mapper__.tables
+            for name in self._affected(table, kind)
+        }
+
+    def _on_flush(self, session: Session, flush_context) -> None:
+        self._writes(session).update(self._unflushed_tables(session))
+
+    def _on_commit(self, session: Session) -> None:
+        self.invalidate(session.info.pop(_WRITES_KEY, ()))
+
+    def _on_rollback(self, session: Session, previous_transaction) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(_WRITES_KEY, None)
+
+    @staticmethod
+    def _key(state: ORMExecuteState) -> str:
+        compiled = state.statement.compile(dialect=_DIALECT)
+        parameters = compiled.construct_params(state.parameters or None)
+        return f"{compiled.string}\n{sorted(parameters.items())!r}"
+
+    def _on_execute(self, state: ORMExecuteState):
+        written = self._statement_writes(state.statement)
+        if written:
+            self._writes(state.session).update(written)
+        if not (state.is_select and state.execution_options.get(CACHE_OPTION)):
+            return None
+        tags = tables_of(state.statement)
+        session = state.session
+        if self._writes(session).union(self._unflushed_tables(session)).intersection(
+            tags
+        ):
+            # Read your own uncommitted writes.
+            return None
+
+        key = self._key(state)
+        generations = self.backend.generations(tags)
+        entry = self.backend.get(key)
+        if entry is not None:
+            if entry.generations == generations and entry.expires_at > time.monotonic():
+                self._hits += 1
+                return loading.merge_frozen_result(
+                    session, state.statement, entry.result, load=False
+                )()
+            self._stale += 1
+            self.backend.delete(key)
+        self._misses += 1
+
+        frozen = state.invoke_statement().freeze()
+        ttl = state.execution_options.get(TTL_OPTION, self.ttl)
+        self.backend.set(
+            key,
+            CacheEntry(
+                frozen,
+                generations,
+                time.monotonic() + ttl,
+                _approximate_size(frozen),
+            ),
+        )
+        return frozen()
+
+
+query_cache = QueryCache()
@@ -0,0 +1,201 @@
+"""Name to id resolution with an in-process cache and single-flight get-or-create.
+
+Scrapers resolve team, competition and sport names to ids for every match.
+``EntityResolver`` keeps a ``name -> id`` cache, coalesces concurrent lookups of
+the same name into one pending future and resolves all misses collected during
+one event loop iteration with a single ``INSERT ... ON CONFLICT DO NOTHING
+RETURNING`` statement, so concurrent workers never race on the unique name.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy import select, union_all
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import InstrumentedAttribute
+
+from flux_orm.database import new_session
+
+
+def default_normalize(name: str) -> str:
+    """Collapse inner whitespace and strip the name."""
+    return " ".join(name.split())
+
+
+class EntityResolver:
+    """
+    Resolve unique names of ``model`` to primary keys, creating missing rows.
+
+    Example::
+
+        teams = EntityResolver(Team, Team.name)
+        team_id = await teams.resolve("Natus Vincere")
+        competition_id = await EntityResolver(Competition, Competition.name).resolve(
+            "IEM Cologne", sport_id=sport_id
+        )
+
+    Extra keyword arguments of ``resolve`` are only used when the row has to be
+    created.  Cached ids are never revalidated: call ``invalidate`` after
+    deleting or renaming rows.
+    """
+
+    def __init__(
+        self,
+        model,
+        key: InstrumentedAttribute,
+        normalize: Callable[[str], str] | None = default_normalize,
+        session_factory: async_sessionmaker = new_session,
+        max_size: int = 100_000,
+        max_batch: int = 500,
+    ):
+        pk = sa_inspect(model).primary_key
+        if len(pk) != 1:
+            raise ValueError(f"{model.__name__} must have a single-column primary key")
+        self.model = model
+        self.key = key
+        self.pk = pk[0]
+        self.normalize = normalize or (lambda name: name)
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.max_batch = max_batch
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def cached(self, name: str):
+        """Return the cached id of ``name`` or ``None``."""
+        key = self.normalize(name)
+        ident = self._cache.get(key)
+        if ident is not None:
+            self._cache.move_to_end(key)
+        return ident
+
+    def invalidate(self, name: str) -> None:
+        self._cache.pop(self.normalize(name), None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    async def resolve(self, name: str, **values):
+        """Return the id of ``name``, creating the row with ``values`` if needed."""
+        key = self.normalize(name)
+        ident = self._cache.get(key)
+        if ident is not None:
+            self._cache.move_to_end(key)
+            return ident
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._pending[key] = values
+            self._schedule_flush()
+        # shield: a cancelled caller must not cancel the lookup shared by others
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, names: Iterable[str], **values) -> dict[str, Any]:
+        """Resolve many names at once; the misses share a single statement."""
+        names = list(names)
+        ids = await asyncio.gather(*(self.resolve(name, **values) for name in names))
+        return dict(zip(names, ids, strict=True))
+
+    def _schedule_flush(self) -> None:
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        asyncio.get_running_loop().call_soon(self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_scheduled = False
+        while self._pending:
+            batch = dict(list(self._pending.items())[: self.max_batch])
+            for key in batch:
+                del self._pending[key]
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: dict[str, dict[str, Any]]) -> None:
+        try:
+            found = await self._get_or_create(batch)
+        except BaseException as exc:
+            for key in batch:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for key in batch:
+            future = self._inflight.pop(key)
+            ident = found.get(key)
+            if ident is None:
+                future.set_exception(
+                    LookupError(f"{self.model.__name__} {key!r} could not be resolved")
+                )
+                continue
+            self._remember(key, ident)
+            if not future.done():
+                future.set_result(ident)
+
+    def _remember(self, key: str, ident) -> None:
+        self._cache[key] = ident
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _statement(self, batch: dict[str, dict[str, Any]]):
+        table = self.model.__table__
+        key_column = table.c[self.key.key]
+        rows = []
+        for key, values in batch.items():
+            row = {self.key.key: key, **values}
+            pk_default = self.pk.default
+            if self.pk.key not in row and pk_default is not None:
+                row[self.pk.key] = pk_default.arg(None)
+            rows.append(row)
+
+        # Rows inserted by this statement are invisible to its own snapshot, so
+        # the two branches never overlap.
+        inserted = (
+            insert(table)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[key_column])
+            .returning(key_column, table.c[self.pk.key])
+            .cte("inserted")
+        )
+        return union_all(
+            select(inserted.c[self.key.key], inserted.c[self.pk.key]),
+            select(key_column, table.c[self.pk.key]).where(
+                key_column.in_(list(batch))
+            ),
+        )
+
+    async def _get_or_create(self, batch: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        table = self.model.__table__
+        key_column = table.c[self.key.key]
+        # A multi-row VALUES needs the same columns in every row.
+        groups: dict[frozenset[str], dict[str, dict[str, Any]]] = {}
+        for key, values in batch.items():
+            groups.setdefault(frozenset(values), {})[key] = values
+        async with self.session_factory() as session:
+            found = {}
+            for group in groups.values():
+                result = await session.execute(self._statement(group))
+                found.update(result.tuples().all())
+            missing = [key for key in batch if key not in found]
+            if missing:
+                # Rows committed by a concurrent transaction after our snapshot.
+                late = await session.execute(
+                    select(key_column, table.c[self.pk.key]).where(
+                        key_column.in_(missing)
+                    )
+                )
+                found.update(late.tuples().all())
+            await session.commit()
+        return found
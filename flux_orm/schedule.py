@@ -0,0 +1,275 @@
+"""Upcoming and live matches of a sport, ready to render.
+
+``upcoming_and_live`` returns matches that are live or start within the next
+``hours`` in one round trip: the status is a column of ``match`` and the teams
+are aggregated into a JSON array by a correlated subquery, so nothing is
+lazy-loaded afterwards.  The range condition on
+``(sport_id, planned_start_datetime)`` is served by
+``ix_match_sport_planned_start``, which also carries ``status`` and
+``end_datetime``.  The statement is built once per process as a lambda
+statement (``cached_schedule_statement``), later calls only bind new values.
+
+``ScheduleCache`` keeps a sliding window of one sport in memory and refreshes
+it from the rows whose ``updated_at`` moved since the last refresh.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import (
+    JSON,
+    Select,
+    StatementLambdaElement,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from flux_orm.database import new_session
+from flux_orm.models.enums import MatchStatusEnum
+from flux_orm.models.models import Match, Team, TeamInMatch
+from flux_orm.models.utils import utcnow_naive
+
+HIDDEN_STATUSES = (MatchStatusEnum.FINISHED, MatchStatusEnum.CANCELLED)
+# Live matches started at most this long ago are still looked for.
+LIVE_LOOKBACK = timedelta(hours=12)
+
+
+class ScheduleTeam(NamedTuple):
+    team_id: UUID
+    name: str
+    pretty_name: str | None
+    image_url: str | None
+    place: int | None
+
+
+class ScheduleRow(NamedTuple):
+    match_id: UUID
+    sport_id: UUID
+    competition_id: UUID | None
+    match_name: str
+    pretty_match_name: str | None
+    planned_start_datetime: datetime | None
+    end_datetime: datetime | None
+    status: MatchStatusEnum | None
+    match_streams: dict | None
+    teams: list[ScheduleTeam]
+    updated_at: datetime
+
+
+def _teams_subquery():
+    team = func.json_build_object(
+        "team_id",
+        Team.team_id,
+        "name",
+        Team.name,
+        "pretty_name",
+        Team.pretty_name,
+        "image_url",
+        Team.image_url,
+        "place",
+        TeamInMatch.place,
+    )
+    return (
+        select(
+            type_coerce(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(team, TeamInMatch.place, Team.name)
+                    ),
+                    func.json_build_array(),
+                ),
+                JSON,
+            )
+        )
+        .join(Team, Team.team_id == TeamInMatch.team_id)
+        .where(TeamInMatch.match_id == Match.match_id)
+        .correlate(Match)
+        .scalar_subquery()
+    )
+
+
+def schedule_statement(
+    sport_id: UUID,
+    start: datetime,
+    end: datetime,
+    changed_since: datetime | None = None,
+) -> Select:
+    """
+    Matches of ``sport_id`` planned in ``[start, end)``.
+
+    Without ``changed_since`` finished, cancelled and ended matches are left
+    out.  With it, every match changed after that moment is returned so the
+    caller can also drop the ones that became hidden.
+    """
+    stmt = (
+        select(
+            Match.match_id,
+            Match.sport_id,
+            Match.competition_id,
+            Match.match_name,
+            Match.pretty_match_name,
+            Match.planned_start_datetime,
+            Match.end_datetime,
+            Match.status,
+            Match.match_streams,
+            _teams_subquery().label("teams"),
+            Match.updated_at,
+        )
+        .where(
+            Match.sport_id == sport_id,
+            Match.planned_start_datetime >= start,
+            Match.planned_start_datetime < end,
+        )
+        .order_by(Match.planned_start_datetime, Match.match_id)
+    )
+    if changed_since is not None:
+        return stmt.where(Match.updated_at > changed_since)
+    return stmt.where(
+        Match.end_datetime.is_(None),
+        or_(Match.status.is_(None), Match.status.not_in(HIDDEN_STATUSES)),
+    )
+
+
+def cached_schedule_statement(
+    sport_id: UUID,
+    start: datetime,
+    end: datetime,
+    changed_since: datetime | None = None,
+) -> StatementLambdaElement:
+    """``schedule_statement`` as a lambda statement, constructed only once."""
+    # Whether ``changed_since`` is given changes the statement, so each case
+    # gets its own lambda.
+    if changed_since is None:
+        return lambda_stmt(lambda: schedule_statement(sport_id, start, end))
+    return lambda_stmt(
+        lambda: schedule_statement(sport_id, start, end, changed_since)
+    )
+
+
+def _is_visible(row: ScheduleRow) -> bool:
+    return row.end_datetime is None and row.status not in HIDDEN_STATUSES
+
+
+def _to_row(row) -> ScheduleRow:
+    return ScheduleRow(
+        *row[:9],
+        teams=[
+            ScheduleTeam(**{**team, "team_id": UUID(team["team_id"])})
+            for team in row.teams
+        ],
+        updated_at=row.updated_at,
+    )
+
+
+async def upcoming_and_live(
+    session: AsyncSession,
+    sport_id: UUID,
+    hours: float = 24,
+    now: datetime | None = None,
+    live_lookback: timedelta = LIVE_LOOKBACK,
+) -> list[ScheduleRow]:
+    """Live matches and matches starting within ``hours``, ordered by start."""
+    now = now or utcnow_naive()
+    stmt = cached_schedule_statement(
+        sport_id, now - live_lookback, now + timedelta(hours=hours)
+    )
+    return [_to_row(row) for row in await session.execute(stmt)]
+
+
+class ScheduleCache:
+    """
+    In-memory sliding window of one sport's schedule.
+
+    The window covers ``[now - live_lookback, now + horizon)``.  ``get`` serves
+    from memory and refreshes at most every ``refresh_interval`` seconds:
+    usually only the matches updated since the previous refresh are read, with
+    ``overlap`` to catch transactions that committed late; a full reload every ``full_refresh_interval`` seconds picks up what
+    ``updated_at`` does not show, such as deleted matches or changed teams.
+    """
+
+    def __init__(
+        self,
+        sport_id: UUID,
+        session_factory: async_sessionmaker = new_session,
+        horizon: timedelta = timedelta(days=1),
+        live_lookback: timedelta = LIVE_LOOKBACK,
+        refresh_interval: float = 5.0,
+        full_refresh_interval: float = 300.0,
+        overlap: timedelta = timedelta(seconds=5),
+    ):
+        self.sport_id = sport_id
+        self.session_factory = session_factory
+        self.horizon = horizon
+        self.live_lookback = live_lookback
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.overlap = overlap
+        self._rows: dict[UUID, ScheduleRow] = {}
+        self._watermark: datetime | None = None
+        self._refreshed_at = self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    async def get(
+        self, hours: float = 24, now: datetime | None = None
+    ) -> list[ScheduleRow]:
+        """Same rows as ``upcoming_and_live``, within the cached horizon."""
+        now = now or utcnow_naive()
+        if time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            await self.refresh(now)
+        start = now - self.live_lookback
+        end = now + min(timedelta(hours=hours), self.horizon)
+        return sorted(
+            (
+                row
+                for row in self._rows.values()
+                if start <= row.planned_start_datetime < end
+            ),
+            key=lambda row: (row.planned_start_datetime, row.match_id),
+        )
+
+    async def refresh(self, now: datetime | None = None, full: bool = False) -> int:
+        """Update the window and return the number of rows read."""
+        now = now or utcnow_naive()
+        async with self._lock:
+            full = (
+                full
+                or self._watermark is None
+                or time.monotonic() - self._loaded_at >= self.full_refresh_interval
+            )
+            start, end = now - self.live_lookback, now + self.horizon
+            changed_since = None if full else self._watermark - self.overlap
+            stmt = cached_schedule_statement(self.sport_id, start, end, changed_since)
+            async with self.session_factory() as session:
+                rows = [_to_row(row) for row in await session.execute(stmt)]
+
+            if full:
+                self._rows = {row.match_id: row for row in rows}
+                self._loaded_at = time.monotonic()
+            else:
+                for row in rows:
+                    if _is_visible(row):
+                        self._rows[row.match_id] = row
+                    else:
+                        self._rows.pop(row.match_id, None)
+                # Slide the window.
+                for match_id, row in list(self._rows.items()):
+                    if not start <= row.planned_start_datetime < end:
+                        del self._rows[match_id]
+            if rows:
+                latest = max(row.updated_at for row in rows)
+                self._watermark = max(self._watermark or latest, latest)
+            elif self._watermark is None:
+                self._watermark = now
+            self._refreshed_at = time.monotonic()
+            return len(rows)
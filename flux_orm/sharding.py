@@ -0,0 +1,440 @@
+"""Horizontal sharding by sport.
+
+Tables with a ``sport_id`` (match, competition, raw and formatted news) live
+on the shard of their sport, together with the tables that reference them
+(team in match, news bodies, ...).  Every other table (sport, team,
+team member, ...) is shared: it lives on the home shard and, with
+``replicate_shared``, is copied to every shard so that foreign keys hold and
+sharded rows join shared ones locally.
+
+Sessions of a ``ShardRouter`` are SQLAlchemy ``ShardedSession``s::
+
+    router = router_from_settings()
+    async with router.sessionmaker()() as session:
+        matches = await session.scalars(
+            select(Match).where(Match.sport_id == sport_id)
+        )  # only the shard of that sport
+        everything = await session.scalars(select(Match))  # every shard, merged
+
+Statements are routed by the ``sport_id == ...`` / ``sport_id IN (...)``
+criteria of their WHERE clause, lazy loads go to the shard of the parent
+object and new objects to the shard of their sport (or of their parent).
+``router.fan_out()`` queries the shards concurrently instead of one after
+the other and merges ordered results.
+
+Shared objects flushed through a session are copied to the other shards in
+the same transaction; flush shared rows before sharded rows that reference
+them.  Bulk ``INSERT`` statements into shared tables only reach the home
+shard, ``router.sync_shared()`` copies them to the others; into sharded
+tables they go to the shard of the rows' ``sport_id``, which must be the same
+for every row of the statement, and run as plain ``executemany`` (parameter
+keys are column names, ``RETURNING`` gives rows, not objects).  Many-to-many
+collections between sharded and shared rows (``Match.match_teams``) are
+written on the home shard; add the association objects (``TeamInMatch``)
+instead.  With ``replicate_shared=False`` the shared tables exist on the home
+shard only, which needs a schema without foreign keys from sharded to shared
+tables on the other shards.
+"""
+
+import asyncio
+import heapq
+from collections.abc import Callable, Iterable, Mapping
+from itertools import islice
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Table, delete, event, select, tuple_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Mapper, ORMExecuteState
+from sqlalchemy.orm.interfaces import MANYTOONE
+from sqlalchemy.sql import Executable, operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+
+from flux_orm.config import (
+    ShardingSettings,
+    postgresql_connection_settings,
+    sharding_settings,
+)
+from flux_orm.database import Model, make_fork_safe
+
+
+class ShardRoutingError(Exception):
+    pass
+
+
+def _sharded_tables() -> frozenset[Table]:
+    tables = Model.metadata.tables.values()
+    sharded = {
+        table for table in tables if "sport_id" in table.c and table.name != "sport"
+    }
+    grown = True
+    while grown:
+        children = {
+            table
+            for table in tables
+            if table not in sharded
+            and any(fk.column.table in sharded for fk in table.foreign_keys)
+        }
+        sharded |= children
+        grown = bool(children)
+    return frozenset(sharded)
+
+
+SHARDED_TABLES = _sharded_tables()
+_MAPPERS = {mapper.local_table: mapper for mapper in Model.registry.mappers}
+SHARED_TABLES = [
+    table for table in Model.metadata.sorted_tables if table not in SHARDED_TABLES
+]
+
+
+def _conjuncts(clause) -> Iterable:
+    if isinstance(clause, BooleanClauseList) and clause.operator is operators.and_:
+        for inner in clause.clauses:
+            yield from _conjuncts(inner)
+    elif clause is not None:
+        yield clause
+
+
+def _bind_value(bind: BindParameter, parameters: Mapping) -> Any:
+    if bind.key in parameters:
+        return parameters[bind.key]
+    return bind.effective_value
+
+
+def sport_ids_of(statement: Executable, parameters: Mapping = {}) -> set | None:
+    """
+    Sport ids a statement is restricted to by its WHERE clause, ``None`` if any.
+
+    Only top-level ``AND``-ed ``sport_id = x`` and ``sport_id IN (...)``
+    criteria on sharded tables count.
+    """
+    sport_ids = None
+    for criterion in _conjuncts(getattr(statement, "whereclause", None)):
+        if not isinstance(criterion, BinaryExpression):
+            continue
+        column, bind = criterion.left, criterion.right
+        if (
+            getattr(column, "name", None) != "sport_id"
+            or getattr(column, "table", None) not in SHARDED_TABLES
+            or not isinstance(bind, BindParameter)
+            or criterion.operator not in {operators.eq, operators.in_op}
+        ):
+            continue
+        value = _bind_value(bind, parameters)
+        values = set(value) if criterion.operator is operators.in_op else {value}
+        sport_ids = values if sport_ids is None else sport_ids & values
+    return sport_ids
+
+
+class ShardRouter:
+    """The shard engines and the rules of where rows live."""
+
+    def __init__(
+        self,
+        engines: Mapping[str, AsyncEngine],
+        sport_shards: Mapping[UUID, str],
+        home: str,
+        replicate_shared: bool = True,
+    ):
+        unknown = (set(sport_shards.values()) | {home}) - set(engines)
+        if unknown:
+            raise ValueError(f"Unknown shards: {sorted(unknown)}")
+        self.engines = dict(engines)
+        self.sport_shards = dict(sport_shards)
+        self.home = home
+        self.replicate_shared = replicate_shared
+
+    @property
+    def shard_ids(self) -> list[str]:
+        return list(self.engines)
+
+    def shard_for_sport(self, sport_id: UUID) -> str:
+        return self.sport_shards.get(sport_id, self.home)
+
+    def is_shared(self, mapper: Mapper) -> bool:
+        return mapper.local_table not in SHARDED_TABLES
+
+    def _instance_shard(self, mapper: Mapper, instance) -> str | None:
+        state = sa_inspect(instance)
+        if state.key is not None:
+            return state.key[2]
+        if state.identity_token is not None:
+            return state.identity_token
+        if self.is_shared(mapper):
+            return self.home
+        if "sport_id" in mapper.local_table.c:
+            key = mapper.get_property_by_column(mapper.local_table.c.sport_id).key
+            sport_id = state.dict.get(key)
+            if sport_id is None and state.dict.get("sport") is not None:
+                sport_id = state.dict["sport"].sport_id
+            if sport_id is not None:
+                return self.shard_for_sport(sport_id)
+        for relationship in mapper.relationships:
+            parent = state.dict.get(relationship.key)
+            if (
+                relationship.direction is MANYTOONE
+                and parent is not None
+                and not self.is_shared(relationship.mapper)
+            ):
+                return self._instance_shard(relationship.mapper, parent)
+        if state.session is not None:
+            return self._parent_shard_in_session(state)
+        return None
+
+    def _parent_shard_in_session(self, state) -> str | None:
+        """Shard of a parent referenced by foreign key and present in the session."""
+        mapper = state.mapper
+        for fk in mapper.local_table.foreign_keys:
+            parent_mapper = _MAPPERS.get(fk.column.table)
+            if parent_mapper is None or self.is_shared(parent_mapper):
+                continue
+            value = state.dict.get(mapper.get_property_by_column(fk.parent).key)
+            if value is None:
+                continue
+            for shard_id in self.shard_ids:
+                key = parent_mapper.identity_key_from_primary_key(
+                    (value,), identity_token=shard_id
+                )
+                if key in state.session.identity_map:
+                    return shard_id
+        return None
+
+    def shard_chooser(self, mapper: Mapper, instance, clause=None, **kw) -> str:
+        if instance is None:
+            if mapper is None or self.is_shared(mapper):
+                return self.home
+            raise ShardRoutingError(
+                f"No shard for {mapper.class_.__name__}, "
+                f"pass bind_arguments={{'shard_id': ...}}"
+            )
+        shard_id = self._instance_shard(mapper, instance)
+        if shard_id is None:
+            raise ShardRoutingError(
+                f"No shard for {instance!r}: set its sport, its parent object "
+                "or load the parent into the session"
+            )
+        return shard_id
+
+    def identity_chooser(self, mapper: Mapper, primary_key, *, lazy_loaded_from, **kw):
+        if self.is_shared(mapper):
+            return [self.home]
+        if lazy_loaded_from is not None and lazy_loaded_from.identity_token:
+            return [lazy_loaded_from.identity_token]
+        return self.shard_ids
+
+    def execute_chooser(self, context: ORMExecuteState) -> list[str]:
+        mappers = context.all_mappers
+        if not mappers:
+            return [self.home]
+        if all(self.is_shared(mapper) for mapper in mappers):
+            if self.replicate_shared and (context.is_update or context.is_delete):
+                return self.shard_ids
+            return [self.home]
+        if context.is_insert:
+            shard_id = self._insert_shard(context)
+            if context.parameters:
+                # ``ShardedSession`` refuses the ORM "bulk" strategy, run
+                # the rows as a plain executemany on their shard instead.
+                context.update_execution_options(dml_strategy="raw")
+            return [shard_id]
+        if context.is_select and context.lazy_loaded_from is not None:
+            token = context.lazy_loaded_from.identity_token
+            if token is not None:
+                return [token]
+        sport_ids = sport_ids_of(context.statement, context.parameters or {})
+        if sport_ids is None:
+            return self.shard_ids
+        return sorted({self.shard_for_sport(sport_id) for sport_id in sport_ids})
+
+    def _insert_shard(self, context: ORMExecuteState) -> str:
+        """The one shard of the sports of the rows an ``INSERT`` writes."""
+        mapper = context.bind_mapper
+        table = mapper.local_table
+        if "sport_id" not in table.c:
+            raise ShardRoutingError(
+                f"No shard for an INSERT into {table.name}, "
+                f"pass bind_arguments={{'shard_id': ...}}"
+            )
+        keys = {"sport_id", mapper.get_property_by_column(table.c.sport_id).key}
+        rows = context.parameters or [context.statement.compile().params]
+        if isinstance(rows, Mapping):
+            rows = [rows]
+        shards = set()
+        for row in rows:
+            sport_id = next((row[key] for key in keys if key in row), None)
+            if sport_id is None:
+                raise ShardRoutingError(
+                    f"No shard for an INSERT into {table.name} without sport_id"
+                )
+            shards.add(self.shard_for_sport(sport_id))
+        if len(shards) != 1:
+            raise ShardRoutingError(
+                f"INSERT into {table.name} spans shards {sorted(shards)}, "
+                "insert the rows of each shard separately"
+            )
+        return shards.pop()
+
+    def sessionmaker(self, **kwargs) -> async_sessionmaker:
+        kwargs.setdefault("expire_on_commit", True)
+        return async_sessionmaker(
+            sync_session_class=RoutedSession, router=self, **kwargs
+        )
+
+    async def fan_out(
+        self,
+        stmt: Executable,
+        shards: Iterable[str] | None = None,
+        key: Callable[[Any], Any] | None = None,
+        reverse: bool = False,
+        limit: int | None = None,
+    ) -> list:
+        """
+        Run a read-only ``stmt`` on ``shards`` (default all) at the same time.
+
+        One column gives scalars, otherwise rows.  With ``key`` the per-shard
+        results, each already sorted by the same ``ORDER BY``, are merged in
+        order; ``limit`` cuts the merged result.  ORM objects are detached.
+        """
+        shards = list(shards) if shards is not None else self.shard_ids
+
+        async def run(shard_id: str) -> list:
+            async with AsyncSession(
+                self.engines[shard_id], expire_on_commit=False
+            ) as session:
+                result = await session.execute(stmt)
+                if len(result.keys()) == 1:
+                    return list(result.scalars())
+                return list(result)
+
+        parts = await asyncio.gather(*(run(shard_id) for shard_id in shards))
+        if key is not None:
+            merged = heapq.merge(*parts, key=key, reverse=reverse)
+        else:
+            merged = (item for part in parts for item in part)
+        return list(islice(merged, limit))
+
+    async def sync_shared(
+        self, tables: Iterable[Table] | None = None, batch_size: int = 1_000
+    ) -> dict[str, int]:
+        """Copy shared tables from the home shard to the others, rows per table."""
+        tables = SHARED_TABLES if tables is None else tables
+        copied = {}
+        replicas = [self.engines[name] for name in self.shard_ids if name != self.home]
+        async with self.engines[self.home].connect() as source:
+            for table in tables:
+                copied[table.name] = 0
+                result = await source.stream(
+                    select(table), execution_options={"yield_per": batch_size}
+                )
+                async for partition in result.mappings().partitions():
+                    rows = [dict(row) for row in partition]
+                    for engine in replicas:
+                        async with engine.begin() as conn:
+                            await conn.execute(_upsert(table), rows)
+                    copied[table.name] += len(rows)
+        return copied
+
+    async def dispose(self) -> None:
+        await asyncio.gather(*(engine.dispose() for engine in self.engines.values()))
+
+
+def _upsert(table: Table, columns: Iterable[str] | None = None):
+    stmt = insert(table)
+    primary_key = [column.name for column in table.primary_key]
+    columns = [
+        name
+        for name in (columns if columns is not None else table.c.keys())
+        if name not in primary_key
+    ]
+    if not columns:
+        return stmt.on_conflict_do_nothing(index_elements=primary_key)
+    return stmt.on_conflict_do_update(
+        index_elements=primary_key,
+        set_={name: stmt.excluded[name] for name in columns},
+    )
+
+
+def _column_values(state, mapper: Mapper) -> dict[str, Any]:
+    values = {}
+    for column in mapper.local_table.columns:
+        key = mapper.get_property_by_column(column).key
+        if key in state.dict:
+            values[column.name] = state.dict[key]
+    return values
+
+
+class RoutedSession(ShardedSession):
+    """``ShardedSession`` following a ``ShardRouter``, replicating shared rows."""
+
+    def __init__(self, router: ShardRouter, **kwargs):
+        super().__init__(
+            shard_chooser=router.shard_chooser,
+            identity_chooser=router.identity_chooser,
+            execute_chooser=router.execute_chooser,
+            shards={
+                shard_id: engine.sync_engine
+                for shard_id, engine in router.engines.items()
+            },
+            **kwargs,
+        )
+        self.router = router
+        if router.replicate_shared and len(router.engines) > 1:
+            event.listen(self, "after_flush", self._replicate_shared)
+
+    def _replicate_shared(self, session, flush_context) -> None:
+        order = {table: i for i, table in enumerate(SHARED_TABLES)}
+        written, deleted = [], []
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            state = sa_inspect(obj)
+            table = state.mapper.local_table
+            if table not in order:
+                continue
+            if obj in session.deleted:
+                deleted.append((order[table], state))
+            elif obj in session.new or session.is_modified(obj):
+                written.append((order[table], state))
+        replicas = [name for name in self.router.shard_ids if name != self.router.home]
+        for shard_id in replicas:
+            conn = self.connection(bind_arguments={"shard_id": shard_id})
+            for _, state in sorted(written, key=lambda item: item[0]):
+                values = _column_values(state, state.mapper)
+                conn.execute(_upsert(state.mapper.local_table, values), values)
+            for _, state in sorted(deleted, key=lambda item: -item[0]):
+                table = state.mapper.local_table
+                identity = state.mapper.primary_key_from_instance(state.obj())
+                conn.execute(
+                    delete(table).where(
+                        tuple_(*table.primary_key.columns) == tuple_(*identity)
+                    )
+                )
+
+
+def router_from_settings(
+    settings: ShardingSettings = sharding_settings,
+) -> ShardRouter | None:
+    """The router configured by the ``DB_*SHARD*`` settings, ``None`` if unsharded."""
+    if not settings.DB_SHARD_URLS:
+        return None
+    engines = {
+        settings.DB_HOME_SHARD: create_async_engine(
+            postgresql_connection_settings.async_url
+        )
+    }
+    for name, url in settings.DB_SHARD_URLS.items():
+        engines[name] = create_async_engine(url.get_secret_value())
+    for engine in engines.values():
+        make_fork_safe(engine)
+    return ShardRouter(
+        engines,
+        settings.DB_SPORT_SHARDS,
+        settings.DB_HOME_SHARD,
+        settings.DB_REPLICATE_SHARED,
+    )
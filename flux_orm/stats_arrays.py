@@ -0,0 +1,213 @@
+"""Numeric values of JSONB stats as NumPy arrays.
+
+``fetch_stats`` extracts JSON paths server-side and reads the result with a
+binary ``COPY``: every field has a fixed width, so the whole buffer is parsed
+by one ``numpy.frombuffer`` with a structured dtype, without a Python object
+per row or value::
+
+    stats = await fetch_stats(
+        session,
+        TeamInMatch.stats,
+        {"kills": "kills", "rating": ("players", "avg", "rating")},
+        dtypes={"kills": "int"},
+        where=[TeamInMatch.match_id.in_(match_ids)],
+    )
+    stats.values["rating"].mean()  # masked where missing
+
+Values that are missing, null or not a JSON number are masked.  Integer paths
+round fractional numbers.  The keys are the primary key of the table unless
+``keys`` is given; UUID keys are ``V16`` arrays of the raw 16 bytes (see
+``as_uuids``), which sort, compare and ``np.unique`` like the UUIDs.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import NamedTuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Boolean,
+    Double,
+    Integer,
+    SmallInteger,
+    Text,
+    Uuid,
+    case,
+    cast,
+    func,
+    Select,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from flux_orm.jsonb import JSONPath
+
+# Binary COPY: 11 byte signature, 4 byte flags, 4 byte header extension length.
+COPY_HEADER_BYTES = 19
+COPY_TRAILER_BYTES = 2
+
+VALUE_TYPES = {
+    "float": (Double(), ">f8", np.float64),
+    "int": (BigInteger(), ">i8", np.int64),
+}
+
+
+class StatsArrays(NamedTuple):
+    keys: dict[str, np.ndarray]
+    values: dict[str, np.ma.MaskedArray]
+
+
+def as_uuids(array: np.ndarray) -> list[UUID]:
+    """UUID objects of a ``V16`` key array."""
+    return [UUID(bytes=item.tobytes()) for item in array]
+
+
+def _key_format(column: ColumnElement) -> str:
+    if isinstance(column.type, Uuid):
+        return "V16"
+    if isinstance(column.type, SmallInteger):
+        return ">i2"
+    if isinstance(column.type, BigInteger):
+        return ">i8"
+    if isinstance(column.type, Integer):
+        return ">i4"
+    raise ValueError(f"{column} has no fixed-width key type: {column.type}")
+
+
+def _number(document: ColumnElement, path: JSONPath | str, type_) -> ColumnElement:
+    path = [path] if isinstance(path, str) else list(path)
+    node = document.op("#>", return_type=JSONB)(cast(path, ARRAY(Text)))
+    return case((func.jsonb_typeof(node) == "number", cast(node, type_)))
+
+
+def _key_columns(
+    column: InstrumentedAttribute, keys: Sequence[ColumnElement] | None
+) -> list[ColumnElement]:
+    if keys is not None:
+        return list(keys)
+    return list(column.property.columns[0].table.primary_key.columns)
+
+
+def _value_types(paths: Mapping, dtypes: Mapping[str, str] | None) -> list[tuple]:
+    dtypes = dtypes or {}
+    unknown = set(dtypes.values()) - set(VALUE_TYPES)
+    if unknown:
+        raise ValueError(f"dtypes must be 'float' or 'int', not {sorted(unknown)}")
+    return [VALUE_TYPES[dtypes.get(name, "float")] for name in paths]
+
+
+def stats_statement(
+    column: InstrumentedAttribute,
+    paths: Mapping[str, JSONPath | str],
+    dtypes: Mapping[str, str] | None = None,
+    keys: Sequence[ColumnElement] | None = None,
+    where: Iterable[ColumnElement] = (),
+) -> Select:
+    """
+    SELECT of the keys and, per path, the value (0 when missing) and its mask.
+
+    Every column is NOT NULL and fixed-width, which ``fetch_stats`` relies on.
+    """
+    keys = _key_columns(column, keys)
+    types = _value_types(paths, dtypes)
+    inner = (
+        select(
+            *(key.label(f"k{i}") for i, key in enumerate(keys)),
+            *(
+                _number(column, path, type_).label(f"v{i}")
+                for i, (path, (type_, _, _)) in enumerate(
+                    zip(paths.values(), types, strict=True)
+                )
+            ),
+        )
+        .where(*where)
+        .subquery("stats")
+    )
+    values = []
+    for i, (type_, _, _) in enumerate(types):
+        value = inner.c[f"v{i}"]
+        values.extend([
+            func.coalesce(value, cast(0, type_)),
+            cast(value.is_(None), Boolean),
+        ])
+    return select(*(inner.c[f"k{i}"] for i in range(len(keys))), *values)
+
+
+async def _copy_binary(conn: AsyncConnection, sql: str) -> bytes:
+    raw = await conn.get_raw_connection()
+    chunks = []
+
+    # A coroutine sink, a file object would be written from a thread pool.
+    async def collect(chunk: bytes) -> None:
+        chunks.append(chunk)
+
+    await raw.driver_connection.copy_from_query(sql, output=collect, format="binary")
+    return b"".join(chunks)
+
+
+async def fetch_stats(
+    conn: AsyncConnection | AsyncSession,
+    column: InstrumentedAttribute,
+    paths: Mapping[str, JSONPath | str],
+    dtypes: Mapping[str, str] | None = None,
+    keys: Sequence[ColumnElement] | None = None,
+    where: Iterable[ColumnElement] = (),
+) -> StatsArrays:
+    """
+    Read ``paths`` of the JSONB ``column`` into masked NumPy arrays.
+
+    ``paths`` maps output names to a key or a path of keys; ``dtypes`` maps
+    output names to ``"float"`` (default) or ``"int"``.  Parameters of
+    ``where`` are rendered inline because ``COPY`` takes no bind parameters.
+    """
+    if isinstance(conn, AsyncSession):
+        conn = await conn.connection()
+    key_columns = _key_columns(column, keys)
+    types = _value_types(paths, dtypes)
+    stmt = stats_statement(column, paths, dtypes, key_columns, where)
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+
+    formats = [_key_format(key) for key in key_columns]
+    for _, copy_format, _ in types:
+        formats.extend([copy_format, "?"])
+    # Per row: field count, then per field its byte length and the value.
+    fields = [("count", ">i2")]
+    for i, fmt in enumerate(formats):
+        fields.extend([(f"l{i}", ">i4"), (f"f{i}", fmt)])
+    row_type = np.dtype(fields)
+
+    data = await _copy_binary(conn, str(sql))
+    rows, rest = divmod(
+        len(data) - COPY_HEADER_BYTES - COPY_TRAILER_BYTES, row_type.itemsize
+    )
+    table = np.frombuffer(data, dtype=row_type, count=rows, offset=COPY_HEADER_BYTES)
+    # Values are never NULL, a NULL key shortens its row and shifts the rest.
+    if rest or any(
+        (table[f"l{i}"] != np.dtype(formats[i]).itemsize).any()
+        for i in range(len(key_columns))
+    ):
+        raise ValueError("a key column returned NULL")
+
+    result_keys = {}
+    for i, key in enumerate(key_columns):
+        field = table[f"f{i}"]
+        result_keys[key.key] = (
+            field.copy()
+            if formats[i] == "V16"
+            else field.astype(field.dtype.newbyteorder("="))
+        )
+    values = {}
+    for j, (name, (_, _, native)) in enumerate(zip(paths, types, strict=True)):
+        i = len(key_columns) + 2 * j
+        values[name] = np.ma.MaskedArray(
+            table[f"f{i}"].astype(native), mask=table[f"f{i + 1}"].copy()
+        )
+    return StatsArrays(result_keys, values)
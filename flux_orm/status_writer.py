@@ -0,0 +1,206 @@
+"""Write-behind buffer for ``pipeline_status`` transitions.
+
+Workers report status changes of ``Match``/``RawNews`` rows thousands of times per
+minute.  ``PipelineStatusWriter`` keeps only the latest transition per id and
+writes the buffer every ``flush_interval`` seconds (or as soon as ``max_batch``
+ids are pending) with a single ``UPDATE ... FROM (VALUES ...)``.
+
+Guarantees:
+
+* at-least-once: a failed flush is retried with the next one, ``close()``
+  flushes what is left and raises if that fails;
+* last-write-wins per id: a newer submission replaces a pending one, and a row
+  is only updated when the transition is not older than the stored
+  ``pipeline_update_time``, so retries never overwrite newer states;
+* ``submit`` waits while ``max_pending`` ids are buffered (backpressure).
+"""
+
+import asyncio
+from collections.abc import Hashable
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import column, or_, update, values
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from flux_orm.custom_logger import logger
+from flux_orm.database import new_session
+from flux_orm.models.enums import PipelineStatus
+from flux_orm.models.utils import utcnow_naive
+
+
+class WriterStats(NamedTuple):
+    submitted: int
+    coalesced: int
+    written: int
+    flushes: int
+    failures: int
+    pending: int
+
+
+class PipelineStatusWriter:
+    """
+    Coalescing write-behind writer for one model with a pipeline status.
+
+    Example::
+
+        async with PipelineStatusWriter(Match) as writer:
+            await writer.submit(match_id, PipelineStatus.SENT)
+    """
+
+    def __init__(
+        self,
+        model,
+        session_factory: async_sessionmaker = new_session,
+        flush_interval: float = 0.05,
+        max_batch: int = 1_000,
+        max_pending: int = 10_000,
+    ):
+        pk = sa_inspect(model).primary_key
+        if len(pk) != 1:
+            raise ValueError(f"{model.__name__} must have a single-column primary key")
+        self.model = model
+        self.pk = pk[0]
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._pending: dict[Hashable, tuple[PipelineStatus, datetime]] = {}
+        self._wake = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._submitted = self._coalesced = self._written = 0
+        self._flushes = self._failures = 0
+
+    @property
+    def stats(self) -> WriterStats:
+        return WriterStats(
+            self._submitted,
+            self._coalesced,
+            self._written,
+            self._flushes,
+            self._failures,
+            len(self._pending),
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def submit(
+        self, ident, status: PipelineStatus, at: datetime | None = None
+    ) -> None:
+        """Buffer a transition of row ``ident`` to ``status`` made at ``at``."""
+        if self._closing:
+            raise RuntimeError("PipelineStatusWriter is closed")
+        self.start()
+        at = at or utcnow_naive()
+        if ident not in self._pending and len(self._pending) >= self.max_pending:
+            self._wake.set()
+            async with self._space:
+                await self._space.wait_for(
+                    lambda: len(self._pending) < self.max_pending or self._closing
+                )
+            if self._closing:
+                raise RuntimeError("PipelineStatusWriter is closed")
+        self._submitted += 1
+        previous = self._pending.get(ident)
+        if previous is not None:
+            self._coalesced += 1
+            if previous[1] > at:
+                return
+        self._pending[ident] = (status, at)
+        if len(self._pending) >= self.max_batch:
+            self._wake.set()
+
+    async def flush(self) -> None:
+        """Write everything buffered so far; raises if the write fails."""
+        while self._pending:
+            batch = self._take_batch()
+            try:
+                await self._write(batch)
+            except Exception:
+                self._restore(batch)
+                raise
+            finally:
+                await self._notify_space()
+
+    async def close(self) -> None:
+        """Stop the background task and flush the remaining transitions."""
+        self._closing = True
+        if self._task is not None:
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def _take_batch(self) -> dict:
+        batch = dict(list(self._pending.items())[: self.max_batch])
+        for ident in batch:
+            del self._pending[ident]
+        return batch
+
+    def _restore(self, batch: dict) -> None:
+        self._failures += 1
+        for ident, (status, at) in batch.items():
+            newer = self._pending.get(ident)
+            if newer is None or newer[1] < at:
+                self._pending[ident] = (status, at)
+
+    async def _notify_space(self) -> None:
+        async with self._space:
+            self._space.notify_all()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            while self._pending and not self._closing:
+                batch = self._take_batch()
+                try:
+                    await self._write(batch)
+                except Exception:
+                    self._restore(batch)
+                    logger.exception(
+                        f"Failed to flush {len(batch)} {self.model.__name__} statuses"
+                    )
+                    break
+                finally:
+                    await self._notify_space()
+
+    async def _write(self, batch: dict) -> None:
+        table = self.model.__table__
+        rows = values(
+            column("ident", self.pk.type),
+            column("status", table.c.pipeline_status.type),
+            column("at", table.c.pipeline_update_time.type),
+            name="status_rows",
+        ).data([(ident, status, at) for ident, (status, at) in batch.items()])
+        stmt = (
+            update(table)
+            .where(
+                table.c[self.pk.key] == rows.c.ident,
+                or_(
+                    table.c.pipeline_update_time.is_(None),
+                    table.c.pipeline_update_time <= rows.c.at,
+                ),
+            )
+            .values(pipeline_status=rows.c.status, pipeline_update_time=rows.c.at)
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+        self._flushes += 1
+        self._written += len(batch)
@@ -0,0 +1,228 @@
+"""Chunked iteration over large result sets with bounded memory.
+
+``session.execute(select(RawNews)).scalars().all()`` builds every object at
+once and keeps all of them in the identity map.  ``stream_chunks`` hands them
+out ``chunk_size`` at a time and expunges each chunk once the next one is
+requested, so memory stays at about two chunks::
+
+    chunks = stream_chunks(session, select(RawNews).where(...), chunk_size=500)
+    async for chunk in chunks:
+        ...
+    logger.info(chunks.progress)
+
+Two ways of reading:
+
+* ``mode="cursor"`` (default) keeps one server-side cursor open
+  (``yield_per``).  The transaction must stay open until the end, so commit
+  the work of each chunk through another session.
+* ``mode="keyset"`` runs one ``ORDER BY key LIMIT chunk_size`` query per
+  chunk, continuing after the last key seen.  Nothing stays open between
+  chunks, so it works behind PgBouncer in transaction mode and the same
+  session may commit between chunks.  ``key`` defaults to the single-column
+  primary key of the selected entity and must be unique, a table column needs
+  a unique constraint or index.  The order is the order of ``key``, ``stmt``
+  must not have its own ``ORDER BY``.
+
+With ``prefetch=True`` the next chunk is read while the current one is being
+processed; the reading session must then not be used inside the loop.  Close
+the stream (``contextlib.aclosing``) when leaving the loop early in cursor
+mode.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Any, NamedTuple
+
+from sqlalchemy import (
+    Column,
+    Index,
+    PrimaryKeyConstraint,
+    Select,
+    Table,
+    UniqueConstraint,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from flux_orm.custom_logger import logger
+
+
+class StreamProgress(NamedTuple):
+    rows: int
+    chunks: int
+    seconds: float
+    total: int | None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.total:
+            return None
+        return min(self.rows / self.total, 1.0)
+
+
+def _default_key(stmt: Select) -> ColumnElement:
+    descriptions = stmt.column_descriptions
+    entity = descriptions[0]["entity"] if len(descriptions) == 1 else None
+    if entity is None or descriptions[0]["expr"] is not entity:
+        raise ValueError("key is required unless a single entity is selected")
+    pk = sa_inspect(entity).primary_key
+    if len(pk) != 1:
+        raise ValueError(f"{entity.__name__} must have a single-column primary key")
+    return getattr(entity, sa_inspect(entity).get_property_by_column(pk[0]).key)
+
+
+def _check_keyset(stmt: Select, key: ColumnElement) -> None:
+    if not stmt.compare(stmt.order_by(None)):
+        raise ValueError("keyset mode orders by key, stmt must not have an ORDER BY")
+    column = getattr(key, "expression", key)
+    if not isinstance(column, Column) or not isinstance(column.table, Table):
+        return
+    table = column.table
+    unique = column.unique or any(
+        list(constraint.columns.keys()) == [column.key]
+        for constraint in (*table.constraints, *table.indexes)
+        if isinstance(constraint, PrimaryKeyConstraint | UniqueConstraint)
+        or (isinstance(constraint, Index) and constraint.unique)
+    )
+    if not unique:
+        raise ValueError(f"key {column} must be unique")
+
+
+class ChunkedStream:
+    """Async iterable of lists of objects (or rows when several columns are selected)."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        stmt: Select,
+        chunk_size: int = 1_000,
+        mode: str = "cursor",
+        key: ColumnElement | None = None,
+        expunge: bool = True,
+        prefetch: bool = False,
+        total: int | None = None,
+        log_every: float | None = None,
+    ):
+        if mode not in {"cursor", "keyset"}:
+            raise ValueError(f"mode must be 'cursor' or 'keyset', not {mode!r}")
+        self.session = session
+        self.stmt = stmt
+        self.chunk_size = chunk_size
+        self.mode = mode
+        self.key = key if key is not None or mode == "cursor" else _default_key(stmt)
+        if mode == "keyset":
+            _check_keyset(stmt, self.key)
+        self.expunge = expunge
+        self.prefetch = prefetch
+        self.total = total
+        self.log_every = log_every
+        self._scalars = len(stmt.column_descriptions) == 1
+        self._rows = self._chunks = 0
+        self._started: float | None = None
+        self._finished: float | None = None
+        self._iterator: AsyncIterator[list] | None = None
+
+    @property
+    def progress(self) -> StreamProgress:
+        if self._started is None:
+            return StreamProgress(0, 0, 0.0, self.total)
+        end = self._finished or time.monotonic()
+        return StreamProgress(self._rows, self._chunks, end - self._started, self.total)
+
+    def __aiter__(self) -> AsyncIterator[list]:
+        if self._iterator is None:
+            self._iterator = self._iterate()
+        return self._iterator
+
+    async def aclose(self) -> None:
+        if self._iterator is not None:
+            await self._iterator.aclose()
+
+    async def items(self) -> AsyncIterator[Any]:
+        """The objects one by one."""
+        async for chunk in self:
+            for item in chunk:
+                yield item
+
+    def _last_key(self, chunk: list):
+        last = chunk[-1]
+        if self._scalars:
+            return getattr(last, self.key.key)
+        return last._mapping[self.key]
+
+    def _detach(self, chunk: list) -> None:
+        for item in chunk:
+            for obj in (item,) if self._scalars else item:
+                if sa_inspect(obj, raiseerr=False) is not None and obj in self.session:
+                    self.session.expunge(obj)
+
+    async def _iterate(self) -> AsyncIterator[list]:
+        self._started = time.monotonic()
+        logged = self._started
+        result = None
+        last = None
+
+        async def fetch_keyset() -> list:
+            stmt = self.stmt.order_by(self.key).limit(self.chunk_size)
+            if last is not None:
+                stmt = stmt.where(self.key > last)
+            fetched = await self.session.execute(stmt)
+            return list(fetched.scalars() if self._scalars else fetched)
+
+        if self.mode == "cursor":
+            result = await self.session.stream(
+                self.stmt.execution_options(yield_per=self.chunk_size)
+            )
+            partitions = (result.scalars() if self._scalars else result).partitions(
+                self.chunk_size
+            )
+
+            async def fetch() -> list:
+                return await anext(partitions, [])
+
+        else:
+            fetch = fetch_keyset
+
+        pending = asyncio.ensure_future(fetch())
+        try:
+            while True:
+                chunk = await pending
+                pending = None
+                if not chunk:
+                    break
+                if self.mode == "keyset":
+                    last = self._last_key(chunk)
+                if self.prefetch and len(chunk) == self.chunk_size:
+                    pending = asyncio.ensure_future(fetch())
+                self._rows += len(chunk)
+                self._chunks += 1
+                yield chunk
+                if self.expunge:
+                    self._detach(chunk)
+                if self.log_every is not None:
+                    now = time.monotonic()
+                    if now - logged >= self.log_every:
+                        logged = now
+                        logger.info(f"Streamed {self.progress}")
+                if pending is None:
+                    if self.mode == "keyset" and len(chunk) < self.chunk_size:
+                        break
+                    pending = asyncio.ensure_future(fetch())
+        finally:
+            self._finished = time.monotonic()
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+            if result is not None:
+                await result.close()
+
+
+def stream_chunks(session: AsyncSession, stmt: Select, **kwargs) -> ChunkedStream:
+    """Iterate over ``stmt`` in chunks, see ``ChunkedStream`` for the options."""
+    return ChunkedStream(session, stmt, **kwargs)
@@ -1,3 +1,188 @@
+"""
+Isolated test databases.
+
+The schema is created once into a template database whose name carries a
+fingerprint of the DDL, so it is rebuilt only when the models change.  Every
+xdist worker clones it with ``CREATE DATABASE ... TEMPLATE`` and every test runs
+in a transaction that is rolled back at the end; ``session.commit()`` inside a
+test only releases a SAVEPOINT.
+"""
+
+import hashlib
+import os
+import pathlib
+
+import pytest
 import pytest_asyncio
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+import flux_orm
+from flux_orm.config import postgresql_connection_settings
+from flux_orm.database import Model
+from flux_orm.models import server_defaults, trigram
+from flux_orm.models.models import Sport
+
+SPORTS = [
+    ("Soccer", "A popular sport"),
+    ("Basketball", "With a basket"),
+    ("Test Sport", None),
+    ("Sport with Competitions", None),
+    ("New Sport", None),
+    ("Team Competition Sport", None),
+    ("Competition for Match Sport", None),
+    ("Category Sport", None),
+    ("AI Statement Sport", None),
+    ("Delete Test Sport", None),
+]
+
+BASE_URL = postgresql_connection_settings.sync_url
+BASE_NAME = postgresql_connection_settings.DB_NAME.get_secret_value()
+# Serializes template creation between xdist workers.
+TEMPLATE_LOCK_ID = 0x466C7578
+SCRIPTS = ScriptDirectory(str(pathlib.Path(flux_orm.__file__).parent / "migrations"))
+
+
+def schema_fingerprint() -> str:
+    dialect = postgresql.dialect()
+    ddl = [
+        server_defaults.UUID7_FUNCTION,
+        server_defaults.UPDATED_AT_FUNCTION,
+        server_defaults.STATUS_HISTORY_FUNCTION,
+        *server_defaults.STATUS_HISTORY_TRIGGERS,
+        trigram.CREATE_EXTENSION,
+    ]
+    for table in Model.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+    return hashlib.md5("\n".join(ddl).encode()).hexdigest()[:10]  # noqa: S324
+
+
+def _database_exists(conn, name: str) -> bool:
+    return bool(
+        conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": name}
+        ).first()
+    )
+
+
+def build_template(admin, template: str) -> None:
+    with admin.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": TEMPLATE_LOCK_ID})
+        try:
+            if _database_exists(conn, template):
+                return
+            stale = conn.execute(
+                text(
+                    "SELECT datname FROM pg_database "
+                    "WHERE datname LIKE :prefix AND datname <> :name"
+                ),
+                {"prefix": f"{BASE_NAME}_template_%", "name": template},
+            ).scalars().all()
+            for name in stale:
+                conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+            conn.execute(text(f'CREATE DATABASE "{template}"'))
+            engine = create_engine(BASE_URL.set(database=template), poolclass=NullPool)
+            try:
+                with engine.begin() as template_conn:
+                    Model.metadata.create_all(template_conn)
+            finally:
+                engine.dispose()
+        finally:
+            conn.execute(
+                text("SELECT pg_advisory_unlock(:id)"), {"id": TEMPLATE_LOCK_ID}
+            )
+
+
+@pytest.fixture(scope="session")
+def database_name():
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    template = f"{BASE_NAME}_template_{schema_fingerprint()}"
+    name = f"{BASE_NAME}_test_{worker}"
+    admin = create_engine(
+        BASE_URL.set(database="postgres"),
+        isolation_level="AUTOCOMMIT",
+        poolclass=NullPool,
+    )
+    build_template(admin, template)
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{name}" TEMPLATE "{template}"'))
+    yield name
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    admin.dispose()
+
+
+@pytest.fixture
+def scratch(database_name):
+    """A throwaway copy of the test schema, free to migrate up and down."""
+    name = f"{database_name}_migration"
+    admin = create_engine(
+        BASE_URL.set(database="postgres"),
+        isolation_level="AUTOCOMMIT",
+        poolclass=NullPool,
+    )
+    template = f"{BASE_NAME}_template_{schema_fingerprint()}"
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{name}" TEMPLATE "{template}"'))
+    engine = create_engine(BASE_URL.set(database=name), poolclass=NullPool)
+    yield engine
+    engine.dispose()
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    admin.dispose()
+
+
+def migrate(engine, revision: str, direction: str) -> None:
+    module = SCRIPTS.get_revision(revision).module
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn)
+        with Operations.context(context), context.begin_transaction():
+            getattr(module, direction)()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def engine(database_name):
+    engine = create_async_engine(
+        BASE_URL.set(drivername="postgresql+asyncpg", database=database_name)
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def connection(engine):
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        yield conn
+        await transaction.rollback()
+
+
+@pytest.fixture
+def new_session(connection):
+    """Drop-in replacement of ``flux_orm.database.new_session`` bound to the test transaction."""
+    return async_sessionmaker(
+        bind=connection,
+        expire_on_commit=True,
+        join_transaction_mode="create_savepoint",
+    )
+
 
-from flux_orm.database import new_session
+@pytest_asyncio.fixture(loop_scope="session")
+async def sports(new_session):
+    async with new_session(expire_on_commit=False) as session:
+        sports = [Sport(name=name, description=description) for name, description in SPORTS]
+        session.add_all(sports)
+        await session.commit()
+    return sports
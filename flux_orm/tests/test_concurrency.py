@@ -0,0 +1,138 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from flux_orm.concurrency import (
+    ConcurrentUpdateError,
+    commit,
+    conditional_update,
+    retry_on_conflict,
+)
+from flux_orm.models.models import Match, Sport
+
+ENDED_AT = datetime(2026, 1, 1, 20, 0)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def writers(engine):
+    """Sessions on their own connections, like concurrent scrapers; commits are real."""
+    async with engine.begin() as conn:
+        sport = (
+            await conn.execute(
+                insert(Sport).values(name="Versioned Sport").returning(Sport)
+            )
+        ).one()
+    yield async_sessionmaker(engine, expire_on_commit=True), sport
+    async with engine.begin() as conn:
+        await conn.execute(delete(Match).where(Match.sport_id == sport.sport_id))
+        await conn.execute(delete(Sport).where(Sport.sport_id == sport.sport_id))
+
+
+async def _add_matches(new_session, sport, count: int) -> list:
+    async with new_session() as session:
+        matches = [
+            Match(
+                sport_id=sport.sport_id,
+                match_name=f"Versioned Match {i}",
+                external_id=f"versioned-{i}",
+            )
+            for i in range(count)
+        ]
+        session.add_all(matches)
+        await session.flush()
+        ids = [match.match_id for match in matches]
+        await session.commit()
+    return ids
+
+
+async def _bump(new_session, match_id) -> None:
+    async with new_session() as session:
+        await session.execute(
+            update(Match)
+            .where(Match.match_id == match_id)
+            .values(version=Match.version + 1, match_url="https://other.example")
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_commit_raises_typed_conflict(writers):
+    new_session, sport = writers
+    [match_id] = await _add_matches(new_session, sport, 1)
+
+    async with new_session() as session:
+        match = await session.get(Match, match_id)
+        assert match.version == 1
+        await _bump(new_session, match_id)
+        match.end_datetime = ENDED_AT
+        with pytest.raises(ConcurrentUpdateError) as error:
+            await commit(session)
+
+    assert error.value.model is Match
+    assert error.value.ids == [match_id]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_orm_update_bumps_version(new_session, sports):
+    [match_id] = await _add_matches(new_session, sports[0], 1)
+
+    async with new_session() as session:
+        match = await session.get(Match, match_id)
+        match.end_datetime = ENDED_AT
+        await commit(session)
+        assert await session.scalar(select(Match.version)) == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_retry_on_conflict_reapplies_mutation(writers):
+    new_session, sport = writers
+    [match_id] = await _add_matches(new_session, sport, 1)
+    calls = []
+
+    async def finish(match: Match) -> int:
+        calls.append(match.version)
+        if len(calls) == 1:
+            # Another writer gets in between the read and the write.
+            await _bump(new_session, match_id)
+        match.end_datetime = ENDED_AT
+        return len(calls)
+
+    assert await retry_on_conflict(new_session, Match, match_id, finish) == 2
+    async with new_session() as session:
+        assert (await session.get(Match, match_id)).end_datetime == ENDED_AT
+
+    async def always_late(match: Match) -> None:
+        await _bump(new_session, match_id)
+        match.end_datetime = datetime(2026, 1, 1, 21, 0)
+
+    with pytest.raises(ConcurrentUpdateError) as error:
+        await retry_on_conflict(
+            new_session, Match, match_id, always_late, attempts=2, backoff=0
+        )
+    assert error.value.attempts == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_conditional_update_reports_lost_races(new_session, sports):
+    first, second = await _add_matches(new_session, sports[0], 2)
+    await _bump(new_session, second)
+
+    async with new_session() as session:
+        result = await conditional_update(
+            session,
+            Match,
+            [
+                {"match_id": first, "version": 1, "end_datetime": ENDED_AT},
+                {"match_id": second, "version": 1, "end_datetime": ENDED_AT},
+            ],
+        )
+        versions = dict(
+            (await session.execute(select(Match.match_id, Match.version))).all()
+        )
+
+    assert result.updated == [first]
+    assert result.conflicts == [second]
+    assert versions == {first: 2, second: 2}
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload, undefer_group
+
+from flux_orm.models.models import FormattedNews
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_news_body_is_deferred_with_raiseload(new_session, sports):
+    async with new_session() as session:
+        session.add(
+            FormattedNews(
+                sport_id=sports[0].sport_id,
+                header="Deferred",
+                text="body " * 100,
+                url="https://news.example/deferred",
+                keywords={"teams": ["a"]},
+            )
+        )
+        await session.commit()
+
+    listing = select(FormattedNews).filter_by(header="Deferred")
+    assert "formatted_news.text" not in str(listing)
+
+    async with new_session() as session:
+        news = (await session.execute(listing)).scalar_one()
+        assert news.header == "Deferred"
+        with pytest.raises(InvalidRequestError, match="raiseload"):
+            _ = news.keywords
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            _ = news.text
+
+    async with new_session() as session:
+        news = (
+            await session.execute(
+                listing.options(undefer_group("body"), selectinload(FormattedNews.body))
+            )
+        ).scalar_one()
+        assert news.text.startswith("body")
+        assert news.keywords == {"teams": ["a"]}
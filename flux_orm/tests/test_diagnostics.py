@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from flux_orm import diagnostics
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_every_report_runs_and_serializes(connection):
+    reports = {
+        name: await report(connection) for name, report in diagnostics.REPORTS.items()
+    }
+
+    tables = {row["table"]: row for row in reports["tables"]}
+    assert {"match", "formatted_news", "sport"} <= tables.keys()
+    assert tables["match"]["total_bytes"] >= tables["match"]["index_bytes"]
+    assert json.loads(diagnostics.to_json(reports)).keys() == reports.keys()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_duplicate_indexes(connection):
+    await connection.execute(text("CREATE INDEX ix_dup_sport_name ON sport (name)"))
+    await connection.execute(
+        text("CREATE INDEX ix_dup_sport_name_desc ON sport (name, description)")
+    )
+    await connection.execute(text("CREATE INDEX ix_dup_sport_name_2 ON sport (name)"))
+
+    found = {
+        row["index"]: (row["covered_by"], row["kind"])
+        for row in await diagnostics.duplicate_indexes(connection)
+        if row["table"] == "sport"
+    }
+
+    # sport.name is also unique, so both single-column indexes are redundant.
+    assert found == {
+        "ix_dup_sport_name": ("sport_name_key", "duplicate"),
+        "ix_dup_sport_name_2": ("sport_name_key", "duplicate"),
+    }
+
+
+def test_to_table():
+    table = diagnostics.to_table(
+        [{"table": "match", "rows": 10}, {"table": "x", "rows": None}]
+    )
+    assert table.splitlines() == [
+        "table  rows",
+        "-----  ----",
+        "match  10",
+        "x",
+    ]
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, literal, select
+
+from flux_orm.models.models import Match, Team, TeamInMatch
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from flux_orm.export import export  # noqa: E402
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_streams_batches_into_partitions(connection, sports, tmp_path):
+    matches = [
+        {
+            "sport_id": sports[i % 2].sport_id,
+            "match_name": f"Export Match {i}",
+            "external_id": f"export-{i}",
+            "match_streams": {"main": [f"https://stream.example/{i}"]},
+        }
+        for i in range(25)
+    ]
+    await connection.execute(Match.__table__.insert(), matches)
+    source = select(Match.__table__).where(Match.external_id.like("export-%"))
+
+    result = await export(
+        connection,
+        source,
+        tmp_path,
+        name="match",
+        batch_size=4,
+        rows_per_file=8,
+        partition_by="sport_id",
+    )
+
+    assert result.rows == 25
+    assert {path.parent.name for path in result.files} == {
+        f"sport_id={sports[0].sport_id}",
+        f"sport_id={sports[1].sport_id}",
+    }
+    assert all(pq.read_metadata(path).num_rows <= 8 for path in result.files)
+    table = pq.read_table(tmp_path / "match")
+    assert table.num_rows == 25
+    # The mapping defers match_streams, the export does not.
+    assert '"main"' in table.column("match_streams")[0].as_py()
+    assert not list(tmp_path.rglob(".*"))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_flattens_json_and_continues_from_watermark(connection, tmp_path):
+    an_hour_ago = func.timezone("utc", func.now()) - timedelta(hours=1)
+    teams = [{"name": f"Export Team {i}", "stats": {"wins": i}} for i in range(5)]
+    teams.append({"name": "Export Team 5", "stats": None})
+    await connection.execute(
+        Team.__table__.insert().values(updated_at=an_hour_ago), teams
+    )
+    source = select(Team.__table__).where(Team.name.like("Export Team %"))
+
+    first = await export(
+        connection,
+        source,
+        tmp_path,
+        name="team",
+        json_mode="flatten",
+        incremental=True,
+        settle=timedelta(minutes=30),
+    )
+    assert first.rows == 6
+    table = pq.read_table(first.files[0]).sort_by("name")
+    assert "stats" not in table.column_names
+    assert table.column("stats.wins").to_pylist() == ["0", "1", "2", "3", "4", None]
+
+    # Written now, i.e. after the first watermark.
+    await connection.execute(
+        Team.__table__.insert(), {"name": "Export Team 6", "stats": {"wins": 6}}
+    )
+    second = await export(
+        connection, source, tmp_path, name="team", incremental=True, settle=timedelta(0)
+    )
+    assert second.rows == 1
+    assert pq.read_table(second.files[0]).column("name").to_pylist() == [
+        "Export Team 6"
+    ]
+    assert second.watermark > first.watermark
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_requires_name_for_select(connection, tmp_path):
+    with pytest.raises(ValueError, match="name is required"):
+        await export(connection, select(TeamInMatch.__table__), tmp_path)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_failing_midstream_leaves_no_files(connection, tmp_path):
+    series = func.generate_series(1, 200).table_valued("n").render_derived()
+    # Division by zero on row 130, rows are fetched 50 at a time, so after
+    # the first files were written.
+    source = select(series.c.n, (literal(100) / (series.c.n - 130)).label("ratio"))
+
+    # asyncpg's error surfaces unwrapped from the streamed cursor.
+    with pytest.raises(Exception, match="division by zero"):
+        await export(
+            connection, source, tmp_path, name="ratio", batch_size=10, rows_per_file=20
+        )
+
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from flux_orm.fuzzy import (
+    fuzzy_lookup,
+    fuzzy_lookup_many,
+    fuzzy_lookup_many_statement,
+    fuzzy_lookup_statement,
+)
+from flux_orm.models import trigram
+from flux_orm.models.models import Competition, Match, Team, TeamMember
+
+
+async def _pg_trgm_installed(connection) -> bool:
+    found = await connection.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    )
+    return found.first() is not None
+
+
+@pytest.fixture
+async def pg_trgm(connection):
+    if not await _pg_trgm_installed(connection):
+        pytest.skip("pg_trgm is not available on the test server")
+
+
+def test_trigram_indexed_columns():
+    def names(model):
+        return [c.name for c in trigram.indexed_columns(model.__table__)]
+
+    assert names(Team) == ["name", "pretty_name"]
+    assert names(TeamMember) == ["name", "nickname"]
+    assert names(Competition) == ["name"]
+    assert names(Match) == []
+
+
+def test_fuzzy_lookup_statements():
+    dialect = postgresql.dialect()
+    single = str(fuzzy_lookup_statement(Team, "navi").compile(dialect=dialect))
+    assert "(team.name %% %(text)s) OR (team.pretty_name %% %(text)s)" in single
+    assert "greatest(similarity(team.name" in single
+
+    many = str(fuzzy_lookup_many_statement(Team, ["a", "b"]).compile(dialect=dialect))
+    assert "WITH ORDINALITY AS queries" in many
+    assert "LATERAL" in many
+
+    with pytest.raises(ValueError, match="no trigram indexed columns"):
+        fuzzy_lookup_statement(Match, "final")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fuzzy_lookup_arguments(new_session):
+    async with new_session() as session:
+        assert await fuzzy_lookup(session, Team, "   ") == []
+        assert await fuzzy_lookup_many(session, Team, ["", " "]) == {"": [], " ": []}
+        with pytest.raises(ValueError, match="threshold"):
+            await fuzzy_lookup(session, Team, "navi", threshold=1.5)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_trigram_indexes_follow_extension(connection):
+    indexes = await connection.execute(
+        text("SELECT indexname FROM pg_indexes WHERE indexname LIKE '%_trgm'")
+    )
+    expected = {
+        trigram.index_name(column)
+        for model in (Team, TeamMember, Competition)
+        for column in trigram.indexed_columns(model.__table__)
+    }
+    created = set(indexes.scalars())
+    assert created == (expected if await _pg_trgm_installed(connection) else set())
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fuzzy_lookup(new_session, pg_trgm):
+    async with new_session(expire_on_commit=False) as session:
+        navi = Team(name="Natus Vincere", pretty_name="NaVi")
+        g2 = Team(name="G2 Esports")
+        session.add_all([navi, g2, Team(name="Vitality")])
+        session.add(TeamMember(name="Oleksandr Kostyliev", nickname="s1mple"))
+        await session.commit()
+
+    async with new_session() as session:
+        found = await fuzzy_lookup(session, Team, "natus vincere esports")
+        assert found[0].entity.team_id == navi.team_id
+        assert 0.3 <= found[0].similarity <= 1
+
+        assert [
+            m.entity.team_id for m in await fuzzy_lookup(session, Team, "NaVi")
+        ] == [navi.team_id]
+        assert await fuzzy_lookup(session, Team, "natus", threshold=0.9) == []
+
+        matches = await fuzzy_lookup_many(
+            session, Team, ["g2 esport", "natus vincere", "unknown squad"]
+        )
+        assert list(matches) == ["g2 esport", "natus vincere", "unknown squad"]
+        assert [m.entity.team_id for m in matches["g2 esport"]] == [g2.team_id]
+        assert [m.entity.team_id for m in matches["natus vincere"]] == [navi.team_id]
+        assert matches["unknown squad"] == []
+
+        players = await fuzzy_lookup(session, TeamMember, "simple")
+        assert [p.entity.nickname for p in players] == ["s1mple"]
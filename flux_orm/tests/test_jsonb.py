@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import undefer, undefer_group
+
+from flux_orm.jsonb import patch_jsonb, patch_jsonb_many
+from flux_orm.models.models import Team
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_patch_jsonb_keeps_loaded_object_in_sync(new_session):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        team = Team(name="Patch Team", stats={"wins": 5, "losses": 2, "map": {}})
+        session.add(team)
+        await session.commit()
+
+        await patch_jsonb(
+            session,
+            Team.stats,
+            [team.team_id],
+            set_={"wins": 6},
+            remove=["losses"],
+            paths={("map", "dust2"): 3},
+        )
+        assert team.stats == {"wins": 6, "map": {"dust2": 3}}
+        assert team not in session.dirty
+        await session.commit()
+
+    async with new_session() as session:
+        stored = (
+            await session.execute(
+                select(Team).filter_by(name="Patch Team").options(undefer(Team.stats))
+            )
+        ).scalars().first()
+        assert stored.stats == {"wins": 6, "map": {"dust2": 3}}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_patch_jsonb_many_rows_in_one_statement(new_session):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        t1 = Team(name="Patch Many 1", regalia={"cups": 1})
+        t2 = Team(name="Patch Many 2")
+        session.add_all([t1, t2])
+        await session.commit()
+
+        updated = await patch_jsonb_many(
+            session,
+            Team.regalia,
+            {t1.team_id: {"cups": 2}, t2.team_id: {"medals": 1}},
+        )
+        await session.commit()
+        # regalia of t2 was never loaded, it is deferred until asked for.
+        await session.refresh(t2, ["regalia"])
+
+        assert updated == 2
+        assert t1.regalia == {"cups": 2}
+        assert t2.regalia == {"medals": 1}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_patch_jsonb_null_document_stays_tracked(new_session):
+    async with new_session() as session:
+        session.add(Team(name="Patch Null"))
+        await session.commit()
+
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        team = (
+            await session.execute(
+                select(Team)
+                .filter_by(name="Patch Null")
+                .options(undefer_group("documents"))
+            )
+        ).scalars().one()
+        assert team.stats is None
+
+        await patch_jsonb(session, Team.stats, [team.team_id], set_={"wins": 1})
+        assert team.stats == {"wins": 1}
+        assert team not in session.dirty
+
+        team.stats["losses"] = 2
+        assert team in session.dirty
+        await session.commit()
+
+    async with new_session() as session:
+        stored = (
+            await session.execute(
+                select(Team).filter_by(name="Patch Null").options(undefer(Team.stats))
+            )
+        ).scalars().one()
+        assert stored.stats == {"wins": 1, "losses": 2}
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import select
+
+from flux_orm.links import sync_links, sync_links_many
+from flux_orm.models.models import Coach, CoachInTeam, PlayerInTeam, Team, TeamMember
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sync_links_replaces_team_members(new_session):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        m1, m2, m3 = (TeamMember(name=f"Sync Player {i}") for i in range(3))
+        team = Team(name="Sync Team", members=[m1, m2])
+        session.add_all([team, m3])
+        await session.commit()
+
+        result = await sync_links(
+            session, Team.members, team.team_id, [m2.player_id, m3.player_id]
+        )
+        await session.commit()
+        assert result == (1, 1)
+
+        linked = (
+            await session.execute(
+                select(PlayerInTeam.player_id).filter_by(team_id=team.team_id)
+            )
+        ).scalars().all()
+        assert set(linked) == {m2.player_id, m3.player_id}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sync_links_many_with_association_table(new_session):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        c1, c2 = Coach(name="Sync Coach 1"), Coach(name="Sync Coach 2")
+        t1 = Team(name="Sync Coach Team 1", coaches=[c1])
+        t2 = Team(name="Sync Coach Team 2", coaches=[c1, c2])
+        session.add_all([t1, t2])
+        await session.commit()
+
+        result = await sync_links_many(
+            session,
+            CoachInTeam,
+            {t1.team_id: [c2.coach_id], t2.team_id: []},
+            owner_column="team_id",
+        )
+        await session.commit()
+        assert result == (1, 3)
+
+        rows = (
+            await session.execute(
+                select(CoachInTeam.team_id, CoachInTeam.coach_id).filter(
+                    CoachInTeam.team_id.in_([t1.team_id, t2.team_id])
+                )
+            )
+        ).all()
+        assert rows == [(t1.team_id, c2.coach_id)]
@@ -0,0 +1,132 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from flux_orm.models.enums import MatchStatusEnum
+from flux_orm.models.models import Match, MatchStatus, Sport
+from flux_orm.tests.conftest import migrate
+
+CONTRACT = "d6e8a0c2f4b7"
+
+
+def statuses(conn) -> dict[str, tuple]:
+    rows = conn.execute(
+        text("SELECT match_name, status, status_payload FROM match ORDER BY match_name")
+    )
+    return {name: (status, payload) for name, status, payload in rows}
+
+
+def test_downgrade_keeps_statuses_written_after_expand(scratch):
+    with Session(scratch) as session:
+        sport = Sport(name="Downgrade Sport")
+        session.add_all(
+            [
+                Match(
+                    match_name="bare",
+                    external_id="bare",
+                    sport=sport,
+                    match_status=MatchStatus(MatchStatusEnum.SCHEDULED),
+                ),
+                Match(
+                    match_name="full",
+                    external_id="full",
+                    sport=sport,
+                    match_status=MatchStatus(
+                        MatchStatusEnum.LIVE, {"score": "1:0"}, "https://img/1"
+                    ),
+                ),
+            ]
+        )
+        session.commit()
+    with scratch.begin() as conn:
+        assert conn.scalar(
+            text("SELECT status_payload IS NULL FROM match WHERE match_name = 'bare'")
+        )
+        # Written before ``status_payload`` stored None as SQL NULL.
+        conn.execute(
+            text(
+                "INSERT INTO match (sport_id, match_name, external_id, status, "
+                "status_payload) SELECT sport_id, 'json null', 'json null', "
+                "'FINISHED', 'null' FROM sport WHERE name = 'Downgrade Sport'"
+            )
+        )
+
+    migrate(scratch, CONTRACT, "downgrade")
+
+    with scratch.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT m.match_name, ms.name, ms.status, ms.image_url FROM match m "
+                "JOIN match_status ms ON ms.status_id = m.status_id ORDER BY 1"
+            )
+        ).all()
+    assert [tuple(row) for row in rows] == [
+        ("bare", "SCHEDULED", None, None),
+        ("full", "LIVE", {"score": "1:0"}, "https://img/1"),
+        ("json null", "FINISHED", None, None),
+    ]
+
+
+def test_old_instance_writes_reach_match_without_reverting_inline_ones(scratch):
+    migrate(scratch, CONTRACT, "downgrade")
+    with scratch.begin() as conn:
+        sport_id = conn.scalar(
+            text("INSERT INTO sport (name) VALUES ('Window Sport') RETURNING sport_id")
+        )
+        # Old instances: a status row, then the match pointing at it.
+        for name, image_url in (("old", "https://img/old"), ("new", None)):
+            status_id = conn.scalar(
+                text(
+                    "INSERT INTO match_status (name, image_url) "
+                    "VALUES ('SCHEDULED', :image_url) RETURNING status_id"
+                ),
+                {"image_url": image_url},
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO match (sport_id, match_name, external_id, status_id) "
+                    "VALUES (:sport_id, :name, :name, :status_id)"
+                ),
+                {"sport_id": sport_id, "name": name, "status_id": status_id},
+            )
+        assert statuses(conn) == {
+            "new": ("SCHEDULED", None),
+            "old": ("SCHEDULED", {"image_url": "https://img/old"}),
+        }
+
+    # Inside the window: a new instance writes inline, an old one its row.
+    with scratch.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE match SET status = 'LIVE', status_payload = '{\"score\": \"0:0\"}' "
+                "WHERE match_name = 'new'"
+            )
+        )
+        conn.execute(
+            text(
+                "UPDATE match_status SET name = 'FINISHED' WHERE status_id = "
+                "(SELECT status_id FROM match WHERE match_name = 'old')"
+            )
+        )
+
+    migrate(scratch, CONTRACT, "upgrade")
+
+    with scratch.connect() as conn:
+        assert statuses(conn) == {
+            "new": ("LIVE", {"score": "0:0"}),
+            "old": ("FINISHED", {"image_url": "https://img/old"}),
+        }
+        history = conn.execute(
+            text(
+                "SELECT m.match_name, h.status FROM match_status_history h "
+                "JOIN match m USING (match_id) ORDER BY h.history_id"
+            )
+        ).all()
+        assert [tuple(row) for row in history] == [
+            ("old", "SCHEDULED"),
+            ("new", "SCHEDULED"),
+            ("new", "LIVE"),
+            ("old", "FINISHED"),
+        ]
+        assert not conn.scalar(
+            text("SELECT count(*) FROM pg_trigger WHERE tgname LIKE 'match_status%sync%'")
+        )
@@ -0,0 +1,113 @@
+import threading
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from flux_orm.migration_ops import backfill_in_batches, copy_in_batches, lint_revision
+from flux_orm.tests.conftest import BASE_URL
+
+REVISION = '''
+def upgrade() -> None:
+    op.create_index("ix_match_a", "match", ["a"])
+    op.create_index("ix_match_b", "match", ["b"], postgresql_concurrently=True)
+    op.add_column("match", sa.Column("c", sa.Integer(), nullable=False))
+    op.add_column(
+        "match", sa.Column("d", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.create_foreign_key("fk", "match", "sport", ["sport_id"], ["sport_id"])
+    op.alter_column("match", "e", nullable=True)
+    op.alter_column("match", "f", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("match", "c")
+'''
+
+
+def test_lint_revision_flags_locking_operations(tmp_path):
+    path = tmp_path / "revision.py"
+    path.write_text(REVISION)
+
+    problems = lint_revision(path)
+
+    assert [problem.split(": ", 1)[1] for problem in problems] == [
+        "op.create_index",
+        "op.add_column NOT NULL without default",
+        "op.create_foreign_key",
+        "op.alter_column rewrites or scans",
+    ]
+
+
+def test_backfill_in_batches_waits_for_locked_rows(database_name):
+    engine = create_engine(BASE_URL.set(database=database_name), poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE backfilled (id int PRIMARY KEY, value int)"))
+        conn.execute(text("INSERT INTO backfilled SELECT generate_series(1, 10)"))
+    try:
+        with engine.connect() as application:
+            application.begin()
+            application.execute(
+                text("SELECT 1 FROM backfilled WHERE id = 7 FOR UPDATE")
+            )
+            release = threading.Timer(0.5, application.rollback)
+            release.start()
+            with (
+                engine.connect() as conn,
+                Operations.context(MigrationContext.configure(conn)),
+            ):
+                updated = backfill_in_batches(
+                    "backfilled", "id", "value = id", "value IS NULL", batch_size=3
+                )
+                conn.commit()
+            release.join()
+        with engine.connect() as conn:
+            left = conn.scalar(
+                text("SELECT count(*) FROM backfilled WHERE value IS NULL")
+            )
+        assert (updated, left) == (10, 0)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE backfilled"))
+        engine.dispose()
+
+
+def test_copy_in_batches_updates_only_changed_rows(database_name):
+    engine = create_engine(BASE_URL.set(database=database_name), poolclass=NullPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE copied_from (id int PRIMARY KEY, value text)"))
+        conn.execute(text("CREATE TABLE copied_to (id int PRIMARY KEY, value text)"))
+        conn.execute(
+            text(
+                "INSERT INTO copied_from "
+                "SELECT i, 'v' || i FROM generate_series(1, 10) AS i"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO copied_to VALUES (1, 'v1'), (2, 'stale'), (3, NULL)")
+        )
+        unchanged = conn.scalar(text("SELECT xmin::text FROM copied_to WHERE id = 1"))
+    try:
+        with engine.connect() as conn:
+            context = MigrationContext.configure(conn)
+            with Operations.context(context), context.begin_transaction():
+                visited = copy_in_batches(
+                    "copied_from",
+                    "copied_to",
+                    "id",
+                    ["value"],
+                    batch_size=3,
+                    update=True,
+                )
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id, value FROM copied_to ORDER BY id"))
+            assert [tuple(row) for row in rows] == [(i, f"v{i}") for i in range(1, 11)]
+            assert conn.scalar(
+                text("SELECT xmin::text FROM copied_to WHERE id = 1")
+            ) == unchanged
+        assert visited == 10
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE copied_from, copied_to"))
+        engine.dispose()
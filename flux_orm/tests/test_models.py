@@ -1,8 +1,8 @@
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, event, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
-from flux_orm.database import new_session
 from flux_orm.models.models import (
     Sport,
     Competition,
@@ -11,6 +11,7 @@ from flux_orm.models.models import (
     Coach,
     Match,
     MatchStatus,
+    MatchStatusHistory,
     Substitution,
     CompetitionCategory,
     MatchAIStatement,
@@ -37,27 +38,15 @@ async def clear_cache(session):
 
 # -------------------- базовая инициализация -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_setup_sports():
+async def test_setup_sports(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
-        sports = [
-            Sport(name="Soccer", description="A popular sport"),
-            Sport(name="Basketball", description="With a basket"),
-            Sport(name="Test Sport"),
-            Sport(name="Sport with Competitions"),
-            Sport(name="New Sport"),
-            Sport(name="Team Competition Sport"),
-            Sport(name="Competition for Match Sport"),
-            Sport(name="Category Sport"),
-            Sport(name="AI Statement Sport"),
-            Sport(name="Delete Test Sport"),
-        ]
-        session.add_all(sports)
-        await session.commit()
+        names = (await session.execute(select(Sport.name))).scalars().all()
+        assert sorted(names) == sorted(s.name for s in sports)
 
 
 # -------------------- ON DELETE CASCADE (M-M Category) -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_delete_cascade_with_ondelete():
+async def test_delete_cascade_with_ondelete(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
@@ -86,7 +75,7 @@ async def test_delete_cascade_with_ondelete():
 
 # -------------------- Competition-Match каскад -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_competition():
+async def test_cascade_delete_competition(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
@@ -101,8 +90,6 @@ async def test_cascade_delete_competition():
         await session.commit()
 
         status = MatchStatus(name=MatchStatusEnum.SCHEDULED)
-        session.add(status)
-        await session.commit()
 
         match = Match(
             match_name="M-del",
@@ -131,7 +118,7 @@ async def test_cascade_delete_competition():
 
 # -------------------- Team ↔ Members -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_save_team_with_members():
+async def test_cascade_save_team_with_members(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team = Team(
             name="Team F",
@@ -151,7 +138,7 @@ async def test_cascade_save_team_with_members():
 
 
 @pytest.mark.asyncio(loop_scope="session")
-async def test_delete_team_and_check_members():
+async def test_delete_team_and_check_members(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         member = TeamMember(name="Solo Player")
         team = Team(name="Team G", members=[member])
@@ -168,7 +155,7 @@ async def test_delete_team_and_check_members():
 
 # -------------------- Coach rename -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_update_coach_and_check_teams():
+async def test_update_coach_and_check_teams(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         coach = Coach(name="Coach Update")
         teams = [Team(name="Team H", coaches=[coach]), Team(name="Team I", coaches=[coach])]
@@ -194,7 +181,7 @@ async def test_update_coach_and_check_teams():
 
 # -------------------- Match create -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_add_match_with_teams():
+async def test_add_match_with_teams(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(
@@ -203,8 +190,6 @@ async def test_add_match_with_teams():
         ).scalars().first()
 
         status = MatchStatus(name=MatchStatusEnum.SCHEDULED)
-        session.add(status)
-        await session.commit()
 
         competition = Competition(name="Competition for Match", sport=sport)
         session.add(competition)
@@ -236,7 +221,7 @@ async def test_add_match_with_teams():
 
 # -------------------- Delete TeamMember -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_team_member():
+async def test_cascade_delete_team_member(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         m = TeamMember(name="Transient")
         t1, t2 = Team(name="L", members=[m]), Team(name="M", members=[m])
@@ -258,7 +243,7 @@ async def test_cascade_delete_team_member():
 
 # -------------------- Delete whole Team -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_team():
+async def test_cascade_delete_team(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team = Team(
             name="Team N",
@@ -281,15 +266,13 @@ async def test_cascade_delete_team():
 
 # -------------------- Match + substitutions -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_create_match_with_status_and_substitutions():
+async def test_create_match_with_status_and_substitutions(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
         ).scalars().first()
 
         status = MatchStatus(name=MatchStatusEnum.SCHEDULED)
-        session.add(status)
-        await session.flush()
 
         competition = Competition(name="Competition with Substitutions", sport=sport)
         session.add(competition)
@@ -333,15 +316,13 @@ async def test_create_match_with_status_and_substitutions():
 
 # -------------------- Delete Match & cascading substitutions -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_match():
+async def test_cascade_delete_match(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
         ).scalars().first()
 
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         competition = Competition(name="Competition for Deletion Test", sport=sport)
         session.add(competition)
@@ -383,15 +364,16 @@ async def test_cascade_delete_match():
             await session.execute(select(Substitution).filter_by(match_id=match.match_id))
         ).scalars().all()
 
-        still_exists = (
-            await session.execute(select(MatchStatus).filter_by(name=MatchStatusEnum.LIVE))
-        ).scalars().first()
-        assert still_exists is not None
+        assert not (
+            await session.execute(
+                select(MatchStatusHistory).filter_by(match_id=match.match_id)
+            )
+        ).scalars().all()
 
 
 # -------------------- Competition ↔ Teams relation -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_relationship_team_competition():
+async def test_relationship_team_competition(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Team Competition Sport"))
@@ -427,7 +409,7 @@ async def test_relationship_team_competition():
 
 # -------------------- JSON-field stats update -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_update_team_stats():
+async def test_update_team_stats(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team = Team(name="Team U", stats={"wins": 5, "losses": 2})
         session.add(team)
@@ -444,7 +426,7 @@ async def test_update_team_stats():
 
 # -------------------- Delete Coach only -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_coach():
+async def test_cascade_delete_coach(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         coach = Coach(name="Del Coach")
         t1, t2 = Team(name="V", coaches=[coach]), Team(name="W", coaches=[coach])
@@ -466,7 +448,7 @@ async def test_cascade_delete_coach():
 
 # -------------------- Competition with categories (save) -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_save_competition_with_categories():
+async def test_cascade_save_competition_with_categories(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         cat1, cat2 = CompetitionCategory(name="Category 1"), CompetitionCategory(name="Category 2")
         session.add_all([cat1, cat2])
@@ -489,7 +471,7 @@ async def test_cascade_save_competition_with_categories():
         assert comp and len(comp.categories) == 2
 
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_save_sport_with_competitions():
+async def test_cascade_save_sport_with_competitions(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(
@@ -527,7 +509,7 @@ async def test_cascade_save_sport_with_competitions():
 
 # -------------------- Delete CompetitionCategory -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_competition_category():
+async def test_cascade_delete_competition_category(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         cat = CompetitionCategory(name="Cat-Del")
         session.add(cat)
@@ -556,11 +538,9 @@ async def test_cascade_delete_competition_category():
 
 # -------------------- Delete MatchStatus -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_match_status():
+async def test_cascade_delete_match_status(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         sport = (
             await session.execute(select(Sport).filter_by(name="Delete Test Sport"))
@@ -580,22 +560,25 @@ async def test_cascade_delete_match_status():
         session.add(match)
         await session.commit()
 
-        await session.delete(status)
+        match.match_status = None
         await session.commit()
         await clear_cache(session)
 
         match = (
             await session.execute(
                 eager(select(Match).filter_by(match_name="Match-Status"),
-                      selectinload(Match.match_status), fresh=True)
+                      selectinload(Match.status_history), fresh=True)
             )
         ).scalars().first()
         assert match.match_status is None
+        assert match.status_payload is None
+        # Clearing the status is not a transition, the history keeps LIVE.
+        assert [h.status for h in match.status_history] == [MatchStatusEnum.LIVE]
 
 
 # -------------------- Delete Substitution only -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_delete_substitution():
+async def test_delete_substitution(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
@@ -610,8 +593,6 @@ async def test_delete_substitution():
         await session.commit()
 
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         match = Match(
             match_name="Match for Substitution Deletion",
@@ -657,7 +638,7 @@ async def test_delete_substitution():
 
 # -------------------- Delete AI-statement only -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_ai_statement():
+async def test_cascade_delete_ai_statement(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="AI Statement Sport"))
@@ -668,8 +649,6 @@ async def test_cascade_delete_ai_statement():
         await session.commit()
 
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         match = Match(
             match_name="Match with AI Statement",
@@ -699,7 +678,7 @@ async def test_cascade_delete_ai_statement():
 
 # -------------------- Update TeamMember -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_update_team_member():
+async def test_update_team_member(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         member = TeamMember(name="Updatable Player", age=25, country="Country A")
         session.add(member)
@@ -717,7 +696,7 @@ async def test_update_team_member():
 
 # -------------------- Dynamic add/remove members -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_add_remove_team_member_from_team():
+async def test_add_remove_team_member_from_team(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team, m1, m2 = Team(name="Dynamic Team"), TeamMember(name="Dynamic Player 1"), TeamMember(name="Dynamic Player 2")
         session.add_all([team, m1, m2])
@@ -755,7 +734,7 @@ async def test_add_remove_team_member_from_team():
 
 # -------------------- Dynamic add/remove coaches -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_add_remove_coach_from_team():
+async def test_add_remove_coach_from_team(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team, c1, c2 = Team(name="Coachable Team"), Coach(name="Coach A"), Coach(name="Coach B")
         session.add_all([team, c1, c2])
@@ -792,7 +771,7 @@ async def test_add_remove_coach_from_team():
 
 # -------------------- Competition delete with matches -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_competition_with_matches():
+async def test_cascade_delete_competition_with_matches(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Delete Test Sport"))
@@ -803,8 +782,6 @@ async def test_cascade_delete_competition_with_matches():
         await session.commit()
 
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         match1 = Match(
             match_name="Match 1",
@@ -835,7 +812,7 @@ async def test_cascade_delete_competition_with_matches():
 
 # -------------------- Delete Sport + categories -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_sport_with_categories():
+async def test_cascade_delete_sport_with_categories(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         cat1, cat2 = CompetitionCategory(name="Sport Deletion Category 1"), CompetitionCategory(name="Sport Deletion Category 2")
         session.add_all([cat1, cat2])
@@ -872,11 +849,9 @@ async def test_cascade_delete_sport_with_categories():
 
 # -------------------- Update MatchStatus -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_update_match_status():
+async def test_update_match_status(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
@@ -896,21 +871,30 @@ async def test_update_match_status():
         session.add(match)
         await session.commit()
 
-        status.name = MatchStatusEnum.SCHEDULED
+        match.match_status = MatchStatus(
+            name=MatchStatusEnum.SCHEDULED, image_url="https://img.example/s.png"
+        )
         await session.commit()
+        await clear_cache(session)
 
         updated_match = (
             await session.execute(
-                with_(select(Match).filter_by(match_name="Match for Status Update"),
-                      selectinload(Match.match_status))
+                eager(select(Match).filter_by(match_name="Match for Status Update"),
+                      selectinload(Match.status_history), fresh=True)
             )
         ).scalars().first()
-        assert updated_match.match_status.name == MatchStatusEnum.SCHEDULED
+        assert updated_match.match_status == MatchStatus(
+            MatchStatusEnum.SCHEDULED, None, "https://img.example/s.png"
+        )
+        assert [h.status for h in updated_match.status_history] == [
+            MatchStatusEnum.LIVE,
+            MatchStatusEnum.SCHEDULED,
+        ]
 
 
 # -------------------- Delete Team in Competition -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_delete_team_in_competition():
+async def test_delete_team_in_competition(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="Test Sport"))
@@ -948,7 +932,7 @@ async def test_delete_team_in_competition():
 
 # -------------------- Delete Player in Team -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_player_in_team():
+async def test_cascade_delete_player_in_team(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team = Team(name="Team-Player-Del")
         member = TeamMember(name="Player-Del")
@@ -980,7 +964,7 @@ async def test_cascade_delete_player_in_team():
 
 # -------------------- Delete Coach in Team -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_coach_in_team():
+async def test_cascade_delete_coach_in_team(new_session):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team = Team(name="Team-Coach-Del")
         coach = Coach(name="Coach-Del")
@@ -1012,7 +996,7 @@ async def test_cascade_delete_coach_in_team():
 
 # -------------------- Delete Match with AI-statements -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_match_with_ai_statements():
+async def test_cascade_delete_match_with_ai_statements(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         sport = (
             await session.execute(select(Sport).filter_by(name="AI Statement Sport"))
@@ -1023,8 +1007,6 @@ async def test_cascade_delete_match_with_ai_statements():
         await session.commit()
 
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         match = Match(
             match_name="Match-AI-Del",
@@ -1054,7 +1036,7 @@ async def test_cascade_delete_match_with_ai_statements():
 
 # -------------------- Delete Team with substitutions -------------------- #
 @pytest.mark.asyncio(loop_scope="session")
-async def test_cascade_delete_team_with_substitutions():
+async def test_cascade_delete_team_with_substitutions(new_session, sports):
     async with new_session(expire_on_commit=False, autoflush=False) as session:
         team = Team(name="Team with Substitutions")
         session.add(team)
@@ -1069,8 +1051,6 @@ async def test_cascade_delete_team_with_substitutions():
         await session.commit()
 
         status = MatchStatus(name=MatchStatusEnum.LIVE)
-        session.add(status)
-        await session.commit()
 
         match = Match(
             match_name="Match with Substitutions",
@@ -1109,3 +1089,75 @@ async def test_cascade_delete_team_with_substitutions():
             await session.execute(select(Match).filter_by(match_name=match.match_name))
         ).scalars().first()
         assert remaining_match
+
+
+# -------------------- Passive deletes -------------------- #
+@pytest.mark.asyncio(loop_scope="session")
+async def test_delete_competition_does_not_load_matches(new_session, sports, connection):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        sport = (
+            await session.execute(select(Sport).filter_by(name="Test Sport"))
+        ).scalars().first()
+
+        competition = Competition(name="Passive Competition", sport=sport)
+        team = Team(name="Passive Team")
+        match = Match(
+            match_name="Passive Match",
+            competition=competition,
+            sport=sport,
+            external_id="passive-1",
+            match_teams=[team],
+        )
+        pin, pout = TeamMember(name="Passive In"), TeamMember(name="Passive Out")
+        session.add_all([match, pin, pout])
+        await session.flush()
+        session.add(
+            Substitution(
+                match=match,
+                prev_player_id=pout.player_id,
+                new_player_id=pin.player_id,
+                team=team,
+            )
+        )
+        await session.commit()
+        competition_id, match_id = competition.competition_id, match.match_id
+        session.expunge_all()
+
+        statements = []
+        event.listen(
+            connection.sync_connection,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        competition = await session.get(Competition, competition_id)
+        await session.delete(competition)
+        await session.commit()
+
+        assert not any("FROM match " in s or "FROM substitution" in s for s in statements)
+        assert not (
+            await session.execute(select(Match).filter_by(match_id=match_id))
+        ).scalars().all()
+        assert not (
+            await session.execute(select(Substitution).filter_by(match_id=match_id))
+        ).scalars().all()
+        assert (
+            await session.execute(select(Team).filter_by(name="Passive Team"))
+        ).scalars().first()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_delete_sport_with_matches_is_refused(new_session, sports):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        sport = Sport(name="Sport with Matches")
+        session.add(
+            Match(match_name="Kept Match", sport=sport, external_id="kept-1")
+        )
+        await session.commit()
+
+        with pytest.raises(IntegrityError, match="match_sport_id_fkey"):
+            await session.execute(delete(Sport).filter_by(sport_id=sport.sport_id))
+        await session.rollback()
+
+        assert (
+            await session.execute(select(Match).filter_by(external_id="kept-1"))
+        ).scalars().first()
@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
+
+from flux_orm.benchmarks.news_bodies import run
+from flux_orm.models.models import RawNews, RawNewsBody, Sport
+from flux_orm.tests.conftest import migrate
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_raw_news_body_is_stored_in_side_table(new_session, sports):
+    async with new_session() as session:
+        news = RawNews(
+            sport_id=sports[0].sport_id,
+            header="Side table",
+            text=["first paragraph"],
+            url="https://news.example/side-table",
+        )
+        session.add(news)
+        await session.flush()
+        news_id = news.raw_news_id
+        await session.commit()
+
+    listing = select(RawNews).filter_by(raw_news_id=news_id)
+    async with new_session() as session:
+        news = (await session.execute(listing)).scalar_one()
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            _ = news.text
+
+    async with new_session() as session:
+        news = (
+            await session.execute(listing.options(selectinload(RawNews.body)))
+        ).scalar_one()
+        assert news.text == ["first paragraph"]
+        news.text.append("second paragraph")
+        await session.commit()
+
+    async with new_session() as session:
+        body = await session.get(RawNewsBody, news_id)
+        assert body.text == ["first paragraph", "second paragraph"]
+
+        await session.delete(await session.get(RawNews, news_id))
+        await session.commit()
+        count = (
+            select(func.count()).select_from(RawNewsBody).filter_by(raw_news_id=news_id)
+        )
+        assert await session.scalar(count) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_news_bodies_benchmark_runs(engine):
+    report = await run(engine, rows=200, body_bytes=1_500, batch=50, runs=2)
+
+    assert [row["layout"] for row in report] == ["inline", "side table"]
+    inline, side = report
+    assert inline["heap_bytes"] > side["heap_bytes"]
+
+
+def test_contract_keeps_body_writes_from_both_instances(scratch):
+    with Session(scratch) as session:
+        sport = Sport(name="Window News Sport")
+        session.add(sport)
+        session.flush()
+        sport_id = sport.sport_id
+        session.add_all(
+            RawNews(
+                sport_id=sport_id,
+                header=header,
+                text=["copied"],
+                url=f"https://news.example/{header}",
+            )
+            for header in ("old edit", "new edit")
+        )
+        session.commit()
+
+    migrate(scratch, "c9d1f3a5e782", "downgrade")
+    # Inside the window: old instances write inline, new ones the side table.
+    with scratch.begin() as conn:
+        conn.execute(
+            text(
+                """UPDATE raw_news SET text = '["old edited"]' """
+                "WHERE header = 'old edit'"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO raw_news (sport_id, header, text, url) "
+                """VALUES (:sport_id, 'old insert', '["old inserted"]', """
+                "'https://news.example/old-insert')"
+            ),
+            {"sport_id": sport_id},
+        )
+        conn.execute(
+            text(
+                """UPDATE raw_news_body SET text = '["new edited"]' """
+                "WHERE raw_news_id = "
+                "(SELECT raw_news_id FROM raw_news WHERE header = 'new edit')"
+            )
+        )
+        inline = conn.scalar(
+            text("SELECT text FROM raw_news WHERE header = 'new edit'")
+        )
+        assert inline == ["new edited"]
+
+    migrate(scratch, "c9d1f3a5e782", "upgrade")
+
+    with scratch.connect() as conn:
+        bodies = conn.execute(
+            text(
+                "SELECT n.header, b.text FROM raw_news n "
+                "JOIN raw_news_body b USING (raw_news_id) ORDER BY n.header"
+            )
+        )
+        assert [tuple(row) for row in bodies] == [
+            ("new edit", ["new edited"]),
+            ("old edit", ["old edited"]),
+            ("old insert", ["old inserted"]),
+        ]
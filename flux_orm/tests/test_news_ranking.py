@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import select
+
+from flux_orm.models.models import FilteredMatchInNews, FormattedNews, Match
+from flux_orm.news_ranking import top_news, upsert_relevance
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_top_news_per_match(new_session, sports):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        sport_id = sports[0].sport_id
+        m1, m2, m3 = (
+            Match(
+                sport_id=sport_id,
+                match_name=f"Ranked Match {i}",
+                external_id=f"ranked-{i}",
+            )
+            for i in range(3)
+        )
+        news = [
+            FormattedNews(
+                sport_id=sport_id,
+                header=f"Ranked {i}",
+                text="body",
+                url=f"https://news.example/ranked/{i}",
+                keywords={},
+            )
+            for i in range(5)
+        ]
+        session.add_all([m1, m2, m3, *news])
+        await session.commit()
+
+        written = await upsert_relevance(
+            session,
+            [
+                (m1.match_id, news[0].formatted_news_id, 10),
+                (m1.match_id, news[1].formatted_news_id, 90),
+                (m1.match_id, news[2].formatted_news_id, None),
+                (m1.match_id, news[3].formatted_news_id, 50),
+                (m2.match_id, news[4].formatted_news_id, 5),
+                (m2.match_id, news[4].formatted_news_id, 7),
+            ],
+        )
+        assert written == 5
+
+        top = await top_news(session, [m1.match_id, m2.match_id, m3.match_id], limit=3)
+        assert list(top) == [m1.match_id, m2.match_id, m3.match_id]
+        assert [(r.news.header, r.relevance) for r in top[m1.match_id]] == [
+            ("Ranked 1", 90),
+            ("Ranked 3", 50),
+            ("Ranked 0", 10),
+        ]
+        assert [(r.news.header, r.relevance) for r in top[m2.match_id]] == [
+            ("Ranked 4", 7)
+        ]
+        assert top[m3.match_id] == []
+
+        best = await top_news(session, [m1.match_id], limit=10, min_relevance=50)
+        assert [r.relevance for r in best[m1.match_id]] == [90, 50]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_upsert_relevance_skips_unchanged_scores(new_session, sports):
+    async with new_session(expire_on_commit=False, autoflush=False) as session:
+        sport_id = sports[0].sport_id
+        match = Match(
+            sport_id=sport_id, match_name="Rescored Match", external_id="rescored"
+        )
+        a, b = (
+            FormattedNews(
+                sport_id=sport_id,
+                header=f"Rescored {i}",
+                text="body",
+                url=f"https://news.example/rescored/{i}",
+                keywords={},
+            )
+            for i in range(2)
+        )
+        session.add_all([match, a, b])
+        await session.commit()
+
+        scores = [
+            (match.match_id, a.formatted_news_id, 1),
+            (match.match_id, b.formatted_news_id, 2),
+        ]
+        assert await upsert_relevance(session, scores) == 2
+        assert await upsert_relevance(session, scores) == 0
+        assert await upsert_relevance(session, [(*scores[0][:2], 3)]) == 1
+        assert await upsert_relevance(session, []) == 0
+
+        stored = await session.execute(
+            select(
+                FilteredMatchInNews.news_id, FilteredMatchInNews.respective_relevance
+            ).filter_by(match_id=match.match_id)
+        )
+        assert dict(stored.all()) == {a.formatted_news_id: 3, b.formatted_news_id: 2}
@@ -0,0 +1,60 @@
+import pytest
+
+from flux_orm import plan_check
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_canonical_query_plans_match_baselines(connection):
+    plans = await plan_check.run_catalog(connection)
+
+    diffs = plan_check.check(plans, plan_check.load_baselines())
+
+    regressions = {
+        name: diff.regressions for name, diff in diffs.items() if diff.regressions
+    }
+    assert not regressions, (
+        "query plans regressed, fix the query/index or accept them with "
+        f"`python -m flux_orm.plan_check --update`: {regressions}"
+    )
+    assert "no baseline" not in {
+        change for diff in diffs.values() for change in diff.changes
+    }
+
+
+def test_new_seq_scan_and_sort_spill_are_regressions():
+    baseline = plan_check.summarize([
+        {
+            "Plan": {
+                "Node Type": "Index Scan",
+                "Relation Name": "match",
+                "Index Name": "ix_match",
+                "Total Cost": 10.0,
+            }
+        }
+    ])
+    current = plan_check.summarize([
+        {
+            "Plan": {
+                "Node Type": "Sort",
+                "Sort Method": "external merge",
+                "Sort Space Type": "Disk",
+                "Total Cost": 15.0,
+                "Plans": [
+                    {
+                        "Node Type": "Seq Scan",
+                        "Relation Name": "match",
+                        "Total Cost": 9.0,
+                    }
+                ],
+            }
+        }
+    ])
+
+    diff = plan_check.compare(baseline.to_baseline(), current)
+
+    assert diff.regressions == [
+        "new sequential scan on match",
+        "spills to disk: Sort: external merge",
+    ]
+    assert current.shape == ["Sort", "  Seq Scan on match"]
+    assert len(diff.changes) == 1
@@ -0,0 +1,128 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from flux_orm import queries
+from flux_orm.benchmarks.hot_queries import HOT_QUERIES, run
+from flux_orm.models.models import (
+    FilteredMatchInNews,
+    FormattedNews,
+    Match,
+    Team,
+    TeamMember,
+)
+from flux_orm.tests.conftest import BASE_URL
+
+START = datetime(2026, 3, 1, 18, 0)
+CACHE_STATUS = ("[generated in", "[cached since")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_catalog_queries(new_session, sports):
+    sport = sports[0]
+    async with new_session(expire_on_commit=False) as session:
+        team = Team(
+            name="Catalog Team",
+            members=[TeamMember(name="Catalog B"), TeamMember(name="Catalog A")],
+        )
+        matches = [
+            Match(
+                match_name=f"Catalog Match {i}",
+                external_id=f"catalog-{i}",
+                sport=sport,
+                planned_start_datetime=START + timedelta(hours=i),
+                match_teams=[team],
+            )
+            for i in range(3)
+        ]
+        news = FormattedNews(
+            sport_id=sport.sport_id, url="https://news.example/catalog", keywords={}
+        )
+        session.add_all([team, *matches, news])
+        await session.flush()
+        session.add(
+            FilteredMatchInNews(
+                match_id=matches[0].match_id, news_id=news.formatted_news_id
+            )
+        )
+        await session.commit()
+
+    async with new_session() as session:
+        match = await queries.match_by_external_id(
+            session, "catalog-1", options=[selectinload(Match.match_teams)]
+        )
+        assert match.match_name == "Catalog Match 1"
+        assert [t.name for t in match.match_teams] == ["Catalog Team"]
+        assert await queries.match_by_external_id(session, "catalog-9") is None
+
+        found = await queries.matches_by_external_ids(
+            session, ["catalog-2", "catalog-0", "catalog-2"]
+        )
+        assert [m.external_id for m in found] == ["catalog-0", "catalog-2"]
+
+        assert (await queries.sport_by_name(session, sport.name)).sport_id == (
+            sport.sport_id
+        )
+        teams = await queries.teams_by_names(session, ["Catalog Team", "Nobody"])
+        assert [t.team_id for t in teams] == [team.team_id]
+        assert await queries.teams_by_names(session, []) == []
+
+        window = await queries.matches_in_window(
+            session, sport.sport_id, START, START + timedelta(hours=2), limit=1
+        )
+        assert [m.external_id for m in window] == ["catalog-0"]
+
+        roster = await queries.team_roster(session, team.team_id)
+        assert [p.name for p in roster] == ["Catalog A", "Catalog B"]
+
+        linked = await queries.news_for_match(session, matches[0].match_id)
+        assert [n.formatted_news_id for n in linked] == [news.formatted_news_id]
+        assert await queries.news_for_match(session, matches[1].match_id) == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_catalog_statements_share_one_compiled_statement(
+    database_name, caplog
+):
+    # A fresh engine, so nothing is in its compiled cache yet.
+    engine = create_async_engine(
+        BASE_URL.set(drivername="postgresql+asyncpg", database=database_name)
+    )
+    caplog.set_level(logging.INFO, logger="sqlalchemy.engine.Engine")
+
+    async def cache_status(*args) -> str:
+        caplog.clear()
+        async with AsyncSession(engine) as session:
+            await queries.match_by_external_id(session, *args)
+        (params,) = [
+            r.message for r in caplog.records if r.message.startswith(CACHE_STATUS)
+        ]
+        return params
+
+    try:
+        assert (await cache_status("a")).startswith("[generated in")
+        second = await cache_status("b")
+        assert second.startswith("[cached since")
+        assert "'b'" in second
+        # Options change the statement, so they get their own entry.
+        options = [selectinload(Match.match_teams)]
+        assert (await cache_status("a", options)).startswith("[generated in")
+        assert (await cache_status("b", options)).startswith("[cached since")
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hot_queries_benchmark_runs(engine):
+    report = await run(engine, matches=200, runs=2, builds=5)
+
+    assert [row["query"] for row in report] == list(HOT_QUERIES)
+    schedule = report[-1]
+    assert all(
+        row[key] > 0
+        for row in report
+        for key in ("call_us_adhoc", "call_us_catalog", "ms_adhoc", "ms_catalog")
+    )
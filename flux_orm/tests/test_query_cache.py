@@ -0,0 +1,143 @@
+import pytest
+from sqlalchemy import delete, select, update
+
+from flux_orm.links import sync_links
+from flux_orm.models.enums import MatchStatusEnum
+from flux_orm.models.models import (
+    Competition,
+    Match,
+    MatchStatusHistory,
+    PlayerInTeam,
+    Sport,
+    Team,
+    TeamMember,
+)
+from flux_orm.query_cache import MemoryBackend, QueryCache, cached, tables_of
+
+
+@pytest.fixture
+def cache():
+    cache = QueryCache(MemoryBackend(max_entries=2)).install()
+    yield cache
+    cache.uninstall()
+
+
+def test_tables_of_includes_joined_and_subquery_tables():
+    stmt = (
+        select(Match)
+        .join(Competition)
+        .where(Match.sport_id.in_(select(Sport.sport_id)))
+    )
+    assert tables_of(stmt) == ("competition", "match", "sport")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached_select_is_served_until_commit_writes_table(
+    new_session, sports, cache
+):
+    stmt = cached(select(Sport.name).where(Sport.sport_id == sports[0].sport_id))
+    async with new_session() as session:
+        assert (await session.execute(stmt)).scalar_one() == "Soccer"
+        assert (await session.execute(stmt)).scalar_one() == "Soccer"
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+        await session.execute(
+            update(Sport)
+            .where(Sport.sport_id == sports[0].sport_id)
+            .values(name="Football")
+        )
+        # Own uncommitted write bypasses the cache.
+        assert (await session.execute(stmt)).scalar_one() == "Football"
+        await session.commit()
+
+    async with new_session() as session:
+        assert (await session.execute(stmt)).scalar_one() == "Football"
+    assert cache.stats.stale == 1
+    assert cache.stats.hit_ratio == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached_orm_entities_are_merged_and_lru_bounded(
+    new_session, sports, cache
+):
+    async with new_session() as session:
+        for sport in sports[:3]:
+            await session.execute(
+                cached(select(Sport).where(Sport.sport_id == sport.sport_id))
+            )
+    assert cache.stats.entries == 2
+    assert cache.stats.evictions == 1
+    assert cache.stats.bytes > 0
+
+    async with new_session() as session:
+        sport = (
+            await session.execute(
+                cached(select(Sport).where(Sport.sport_id == sports[2].sport_id))
+            )
+        ).scalar_one()
+        assert sport.name == sports[2].name
+        assert sport in session
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writes_inside_ctes_invalidate(new_session, cache):
+    async with new_session(expire_on_commit=False) as session:
+        m1, m2 = TeamMember(name="Cached Player 1"), TeamMember(name="Cached Player 2")
+        team = Team(name="Cached Links", members=[m1])
+        session.add_all([team, m2])
+        await session.commit()
+
+    linked = cached(select(PlayerInTeam.player_id).filter_by(team_id=team.team_id))
+    async with new_session() as session:
+        assert (await session.execute(linked)).scalars().all() == [m1.player_id]
+        await sync_links(session, Team.members, team.team_id, [m2.player_id])
+        await session.commit()
+
+    async with new_session() as session:
+        assert (await session.execute(linked)).scalars().all() == [m2.player_id]
+    assert cache.stats.stale == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cascades_and_triggers_invalidate(new_session, sports, cache):
+    async with new_session(expire_on_commit=False) as session:
+        match = Match(
+            match_name="Cached Match",
+            sport_id=sports[0].sport_id,
+            external_id="cached-1",
+            status=MatchStatusEnum.SCHEDULED,
+        )
+        session.add(match)
+        await session.commit()
+
+    history = cached(
+        select(MatchStatusHistory.status)
+        .filter_by(match_id=match.match_id)
+        .order_by(MatchStatusHistory.history_id)
+    )
+    async with new_session() as session:
+        assert (await session.execute(history)).scalars().all() == [
+            MatchStatusEnum.SCHEDULED
+        ]
+        await session.execute(
+            update(Match)
+            .filter_by(match_id=match.match_id)
+            .values(status=MatchStatusEnum.LIVE)
+        )
+        await session.commit()
+
+    async with new_session() as session:
+        # Appended by the trigger on match.
+        assert (await session.execute(history)).scalars().all() == [
+            MatchStatusEnum.SCHEDULED,
+            MatchStatusEnum.LIVE,
+        ]
+        await session.execute(delete(Match).filter_by(match_id=match.match_id))
+        await session.commit()
+
+    async with new_session() as session:
+        # Deleted by ON DELETE CASCADE.
+        assert (await session.execute(history)).scalars().all() == []
+    assert cache.stats.stale == 2
@@ -0,0 +1,78 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from flux_orm.models.models import Competition, Team
+from flux_orm.resolver import EntityResolver
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_resolve_creates_one_row(new_session):
+    resolver = EntityResolver(Team, Team.name, session_factory=new_session)
+    ids = await asyncio.gather(
+        *(resolver.resolve(name) for name in ["Resolver A", " Resolver  A", "Resolver B"])
+    )
+    assert ids[0] == ids[1] != ids[2]
+    assert resolver.cached("Resolver A") == ids[0]
+
+    async with new_session() as session:
+        count = (
+            await session.execute(
+                select(func.count()).select_from(Team).filter(
+                    Team.name.in_(["Resolver A", "Resolver B"])
+                )
+            )
+        ).scalar_one()
+        assert count == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_resolve_existing_row_with_fresh_cache(new_session):
+    first = await EntityResolver(
+        Team, Team.name, session_factory=new_session
+    ).resolve("Resolver C")
+    again = await EntityResolver(
+        Team, Team.name, session_factory=new_session
+    ).resolve("Resolver C")
+    assert first == again
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_resolve_batch_with_different_values(new_session):
+    resolver = EntityResolver(Team, Team.name, session_factory=new_session)
+    plain, pretty = await asyncio.gather(
+        resolver.resolve("Resolver D"),
+        resolver.resolve("Resolver E", pretty_name="E"),
+    )
+
+    async with new_session() as session:
+        teams = await session.execute(
+            select(Team.team_id, Team.pretty_name).filter(
+                Team.team_id.in_([plain, pretty])
+            )
+        )
+        assert dict(teams.tuples().all()) == {plain: None, pretty: "E"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_failed_batch_reaches_every_waiter(new_session, sports):
+    resolver = EntityResolver(
+        Competition, Competition.name, session_factory=new_session
+    )
+    names = ["Resolver Cup", "Resolver Cup ", "Resolver League"]
+    # No such sport: the batched insert violates the foreign key.
+    async with asyncio.timeout(5):
+        results = await asyncio.gather(
+            *(resolver.resolve(name, sport_id=uuid4()) for name in names),
+            return_exceptions=True,
+        )
+    assert [type(result) for result in results] == [IntegrityError] * 3
+    assert "competition_sport_id_fkey" in str(results[0])
+    assert resolver.cached("Resolver Cup") is None
+
+    ids = await resolver.resolve_many(names, sport_id=sports[0].sport_id)
+    assert ids["Resolver Cup"] == ids["Resolver Cup "] != ids["Resolver League"]
+    assert resolver.cached("Resolver League") == ids["Resolver League"]
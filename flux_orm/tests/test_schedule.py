@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from flux_orm.models.enums import MatchStatusEnum
+from flux_orm.models.models import Match, MatchStatus, Team
+from flux_orm.models.utils import utcnow_naive
+from flux_orm.schedule import ScheduleCache, upcoming_and_live
+
+
+async def create_schedule(new_session, sports):
+    now = utcnow_naive()
+    sport, other_sport = sports[0], sports[1]
+
+    def match(name, start, status=None, sport=sport, **kw):
+        return Match(
+            match_name=name,
+            external_id=f"schedule-{name}",
+            sport=sport,
+            planned_start_datetime=now + start,
+            match_status=MatchStatus(name=status) if status else None,
+            **kw,
+        )
+
+    async with new_session(expire_on_commit=False) as session:
+        matches = {
+            "live": match("live", -timedelta(hours=2), MatchStatusEnum.LIVE),
+            "soon": match(
+                "soon",
+                timedelta(hours=3),
+                MatchStatusEnum.SCHEDULED,
+                match_teams=[Team(name="Schedule B"), Team(name="Schedule A")],
+            ),
+            "no status": match("no status", timedelta(hours=5)),
+            "finished": match("finished", -timedelta(hours=3), MatchStatusEnum.FINISHED),
+            "ended": match("ended", -timedelta(hours=4), end_datetime=now),
+            "later": match("later", timedelta(hours=30)),
+            "other sport": match("other sport", timedelta(hours=1), sport=other_sport),
+        }
+        session.add_all(matches.values())
+        await session.commit()
+    return now, matches
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_upcoming_and_live_in_one_query(new_session, sports):
+    now, _ = await create_schedule(new_session, sports)
+
+    async with new_session() as session:
+        rows = await upcoming_and_live(session, sports[0].sport_id, hours=24, now=now)
+
+    assert [row.match_name for row in rows] == ["live", "soon", "no status"]
+    assert rows[0].status == MatchStatusEnum.LIVE
+    assert rows[2].status is None
+    assert [team.name for team in rows[1].teams] == ["Schedule A", "Schedule B"]
+    assert rows[0].teams == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_schedule_cache_refreshes_incrementally(new_session, sports):
+    now, matches = await create_schedule(new_session, sports)
+    cache = ScheduleCache(
+        sports[0].sport_id,
+        session_factory=new_session,
+        horizon=timedelta(days=2),
+        refresh_interval=0,
+    )
+
+    assert [row.match_name for row in await cache.get(hours=24, now=now)] == [
+        "live",
+        "soon",
+        "no status",
+    ]
+    assert [row.match_name for row in await cache.get(hours=48, now=now)][-1] == "later"
+
+    async with new_session() as session:
+        await session.execute(
+            update(Match)
+            .where(Match.match_id == matches["live"].match_id)
+            .values(status=MatchStatusEnum.FINISHED)
+        )
+        session.add(
+            Match(
+                match_name="new",
+                external_id="schedule-new",
+                sport_id=sports[0].sport_id,
+                planned_start_datetime=now + timedelta(hours=1),
+            )
+        )
+        await session.commit()
+
+    rows = await cache.get(hours=24, now=now)
+    assert [row.match_name for row in rows] == ["new", "soon", "no status"]
+    # "live" is dropped, "later" stays cached for the 2 days horizon.
+    assert len(cache) == 4
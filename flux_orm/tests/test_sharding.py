@@ -0,0 +1,201 @@
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, delete, func, insert, select, text, update
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from flux_orm.config import ShardingSettings
+from flux_orm.models.models import Match, Sport, Team, TeamInMatch
+from flux_orm.sharding import ShardRouter, ShardRoutingError, router_from_settings
+from flux_orm.tests.conftest import BASE_NAME, BASE_URL, schema_fingerprint
+
+HOME_SPORT = uuid.UUID("00000000-0000-7000-8000-0000000000a1")
+OTHER_SPORT = uuid.UUID("00000000-0000-7000-8000-0000000000b1")
+DML_HOME_SPORT = uuid.UUID("00000000-0000-7000-8000-0000000000a2")
+DML_OTHER_SPORT = uuid.UUID("00000000-0000-7000-8000-0000000000b2")
+
+
+@pytest.fixture(scope="module")
+def shard_databases(database_name):
+    """Two more databases of the test schema, standing in for two instances."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    template = f"{BASE_NAME}_template_{schema_fingerprint()}"
+    names = {shard: f"{BASE_NAME}_shard_{shard}_{worker}" for shard in ("home", "b")}
+    admin = create_engine(
+        BASE_URL.set(database="postgres"),
+        isolation_level="AUTOCOMMIT",
+        poolclass=NullPool,
+    )
+    with admin.connect() as conn:
+        for name in names.values():
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+            conn.execute(text(f'CREATE DATABASE "{name}" TEMPLATE "{template}"'))
+    yield names
+    with admin.connect() as conn:
+        for name in names.values():
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    admin.dispose()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def router(shard_databases):
+    engines = {
+        shard: create_async_engine(
+            BASE_URL.set(drivername="postgresql+asyncpg", database=name)
+        )
+        for shard, name in shard_databases.items()
+    }
+    router = ShardRouter(engines, {OTHER_SPORT: "b"}, home="home")
+    yield router
+    await router.dispose()
+
+
+async def _count(router, shard_id, stmt) -> int:
+    async with router.engines[shard_id].connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(stmt.subquery()))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sharded_session_routes_by_sport_and_replicates_shared(router):
+    async with router.sessionmaker()() as session:
+        session.add_all([
+            Sport(sport_id=HOME_SPORT, name="Home Shard Sport"),
+            Sport(sport_id=OTHER_SPORT, name="Other Shard Sport"),
+        ])
+        team = Team(name="Shard Team")
+        session.add(team)
+        # Shared rows first, the sharded rows below reference them.
+        await session.flush()
+        home_match = Match(
+            sport_id=HOME_SPORT, match_name="Home Match", external_id="shard-home"
+        )
+        other_match = Match(
+            sport_id=OTHER_SPORT, match_name="Other Match", external_id="shard-other"
+        )
+        session.add_all([home_match, other_match])
+        await session.flush()
+        session.add(TeamInMatch(team_id=team.team_id, match_id=other_match.match_id))
+        await session.commit()
+
+    for shard_id in ("home", "b"):
+        assert await _count(router, shard_id, select(Sport.__table__)) == 2
+        assert await _count(router, shard_id, select(Team.__table__)) == 1
+        assert await _count(router, shard_id, select(Match.__table__)) == 1
+    assert await _count(router, "b", select(TeamInMatch.__table__)) == 1
+    assert await _count(router, "home", select(TeamInMatch.__table__)) == 0
+
+    async with router.sessionmaker()() as session:
+        other = (
+            await session.scalars(select(Match).where(Match.sport_id == OTHER_SPORT))
+        ).one()
+        assert sa_inspect(other).identity_token == "b"
+        everything = (await session.scalars(select(Match))).all()
+        assert sorted(match.match_name for match in everything) == [
+            "Home Match",
+            "Other Match",
+        ]
+
+        team = (await session.scalars(select(Team))).one()
+        team.name = "Renamed Shard Team"
+        await session.commit()
+
+    renamed = select(Team.__table__).where(Team.name == "Renamed Shard Team")
+    assert await _count(router, "b", renamed) == 1
+
+    names = await router.fan_out(
+        select(Match.match_name).order_by(Match.match_name.desc()),
+        key=lambda name: name,
+        reverse=True,
+        limit=1,
+    )
+    assert names == ["Other Match"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sync_shared_copies_bulk_inserts(router):
+    async with router.engines["home"].begin() as conn:
+        await conn.execute(insert(Team.__table__), [{"name": "Bulk Shard Team"}])
+
+    copied = await router.sync_shared([Team.__table__])
+
+    assert copied["team"] >= 1
+    bulk = select(Team.__table__).where(Team.name == "Bulk Shard Team")
+    assert await _count(router, "b", bulk) == 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sharded_insert_update_delete_statements(router):
+    router = ShardRouter(router.engines, {DML_OTHER_SPORT: "b"}, home="home")
+    async with router.sessionmaker()() as session:
+        session.add_all([
+            Sport(sport_id=DML_HOME_SPORT, name="DML Home Sport"),
+            Sport(sport_id=DML_OTHER_SPORT, name="DML Other Sport"),
+        ])
+        await session.flush()
+        await session.execute(
+            insert(Match),
+            [
+                {
+                    "sport_id": DML_OTHER_SPORT,
+                    "match_name": f"DML Match {i}",
+                    "external_id": f"dml-{i}",
+                }
+                for i in range(2)
+            ],
+        )
+        await session.execute(
+            insert(Match).values(
+                sport_id=DML_HOME_SPORT, match_name="DML Match 2", external_id="dml-2"
+            )
+        )
+        with pytest.raises(ShardRoutingError, match="spans shards"):
+            await session.execute(
+                insert(Match),
+                [
+                    {"sport_id": DML_HOME_SPORT, "external_id": "dml-mixed-a"},
+                    {"sport_id": DML_OTHER_SPORT, "external_id": "dml-mixed-b"},
+                ],
+            )
+        with pytest.raises(ShardRoutingError, match="team_in_match"):
+            await session.execute(insert(TeamInMatch), [{"team_id": uuid.uuid4()}])
+        await session.commit()
+
+    other = select(Match.__table__).where(Match.sport_id == DML_OTHER_SPORT)
+    home = select(Match.__table__).where(Match.sport_id == DML_HOME_SPORT)
+    assert await _count(router, "b", other) == 2
+    assert await _count(router, "home", other) == 0
+    assert await _count(router, "home", home) == 1
+
+    async with router.sessionmaker()() as session:
+        await session.execute(
+            update(Match)
+            .where(Match.sport_id == DML_OTHER_SPORT)
+            .values(match_name="DML Renamed")
+        )
+        await session.execute(
+            delete(Match).where(
+                Match.sport_id == DML_HOME_SPORT, Match.match_name == "DML Match 2"
+            )
+        )
+        await session.commit()
+
+    renamed = other.where(Match.match_name == "DML Renamed")
+    assert await _count(router, "b", renamed) == 2
+    assert await _count(router, "home", home) == 0
+
+    async with router.sessionmaker()() as session:
+        await session.execute(
+            delete(Match).where(Match.sport_id.in_([DML_HOME_SPORT, DML_OTHER_SPORT]))
+        )
+        await session.commit()
+    assert await _count(router, "b", other) == 0
+
+
+def test_router_requires_known_shards():
+    with pytest.raises(ValueError, match="Unknown shards"):
+        ShardRouter({"home": None}, {OTHER_SPORT: "b"}, home="home")
+    assert router_from_settings(ShardingSettings(DB_SHARD_URLS={})) is None
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import insert
+
+from flux_orm.models.models import Match, Team, TeamInMatch
+
+np = pytest.importorskip("numpy")
+
+from flux_orm.stats_arrays import as_uuids, fetch_stats, stats_statement  # noqa: E402
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fetch_stats_into_masked_arrays(new_session, sports):
+    async with new_session() as session:
+        match_id = (
+            await session.execute(
+                insert(Match)
+                .values(
+                    sport_id=sports[0].sport_id,
+                    match_name="Stats Match",
+                    external_id="stats-match",
+                )
+                .returning(Match.match_id)
+            )
+        ).scalar_one()
+        documents = [
+            {"kills": 10, "rating": {"avg": 1.25}},
+            {"kills": 7.6, "rating": {"avg": "n/a"}},
+            {"deaths": 3},
+            None,
+        ]
+        team_ids = (
+            (
+                await session.execute(
+                    insert(Team).returning(Team.team_id),
+                    [{"name": f"Stats Team {i}"} for i in range(len(documents))],
+                )
+            )
+            .scalars()
+            .all()
+        )
+        await session.execute(
+            insert(TeamInMatch),
+            [
+                {"team_id": team_id, "match_id": match_id, "stats": stats}
+                for team_id, stats in zip(team_ids, documents, strict=True)
+            ],
+        )
+
+        stats = await fetch_stats(
+            session,
+            TeamInMatch.stats,
+            {"kills": "kills", "rating": ("rating", "avg")},
+            dtypes={"kills": "int"},
+            where=[TeamInMatch.match_id == match_id],
+        )
+
+    assert set(stats.keys) == {"team_id", "match_id"}
+    order = np.argsort(stats.keys["team_id"])
+    assert as_uuids(stats.keys["team_id"][order]) == sorted(team_ids)
+    assert set(as_uuids(stats.keys["match_id"])) == {match_id}
+
+    by_team = dict(zip(as_uuids(stats.keys["team_id"]), range(4), strict=True))
+    kills, rating = stats.values["kills"], stats.values["rating"]
+    assert kills.dtype == np.int64
+    assert rating.dtype == np.float64
+    rows = [by_team[team_id] for team_id in team_ids]
+    assert kills[rows].tolist() == [10, 8, None, None]
+    assert rating[rows].tolist() == [1.25, None, None, None]
+    assert rating.sum() == 1.25
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fetch_stats_without_rows(connection):
+    stats = await fetch_stats(
+        connection,
+        Team.stats,
+        {"wins": "wins"},
+        where=[Team.name == "no such team"],
+    )
+
+    assert stats.keys["team_id"].shape == (0,)
+    assert stats.values["wins"].shape == (0,)
+
+
+def test_fetch_stats_rejects_unknown_dtype():
+    with pytest.raises(ValueError, match="'float' or 'int'"):
+        stats_statement(Team.stats, {"wins": "wins"}, dtypes={"wins": "str"})
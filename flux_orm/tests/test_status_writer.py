@@ -0,0 +1,171 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from flux_orm.models.enums import PipelineStatus
+from flux_orm.models.models import Match, Sport
+from flux_orm.status_writer import PipelineStatusWriter
+
+
+class GatedSessions:
+    """Session factory that holds every write until ``gate`` is set and fails
+    the next ``failures`` of them."""
+
+    def __init__(self, new_session, failures=0):
+        self.new_session = new_session
+        self.failures = failures
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.calls = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        self.calls += 1
+        async with asyncio.timeout(5):
+            await self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database went away")
+        async with self.new_session() as session:
+            yield session
+
+
+async def wait_until(condition, timeout=5):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def statuses(new_session, ids):
+    async with new_session() as session:
+        rows = await session.execute(
+            select(Match.match_id, Match.pipeline_status).filter(
+                Match.match_id.in_(ids)
+            )
+        )
+        return dict(rows.all())
+
+
+async def create_matches(new_session, count):
+    async with new_session(expire_on_commit=False) as session:
+        sport = (
+            await session.execute(select(Sport).filter_by(name="Test Sport"))
+        ).scalars().first()
+        matches = [
+            Match(match_name=f"Writer {i}", sport=sport, external_id=f"writer-{i}")
+            for i in range(count)
+        ]
+        session.add_all(matches)
+        await session.commit()
+    return [m.match_id for m in matches]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writer_coalesces_to_last_status(new_session, sports):
+    ids = await create_matches(new_session, 3)
+    start = datetime(2026, 1, 1)
+
+    async with PipelineStatusWriter(Match, session_factory=new_session) as writer:
+        for ident in ids:
+            await writer.submit(ident, PipelineStatus.SENT, start)
+            await writer.submit(ident, PipelineStatus.PROCESSED, start + timedelta(1))
+        # an older transition arriving late must not win
+        await writer.submit(ids[0], PipelineStatus.ERROR, start)
+
+    assert writer.stats.coalesced == 4
+    assert writer.stats.pending == 0
+    async with new_session() as session:
+        rows = (
+            await session.execute(
+                select(Match.pipeline_status, Match.pipeline_update_time).filter(
+                    Match.match_id.in_(ids)
+                )
+            )
+        ).all()
+    assert rows == [(PipelineStatus.PROCESSED, start + timedelta(1))] * 3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writer_does_not_overwrite_newer_rows(new_session, sports):
+    [ident] = await create_matches(new_session, 1)
+    now = datetime(2026, 1, 2)
+    writer = PipelineStatusWriter(Match, session_factory=new_session)
+    await writer.submit(ident, PipelineStatus.PROCESSED, now)
+    await writer.flush()
+    await writer.submit(ident, PipelineStatus.SENT, now - timedelta(hours=1))
+    await writer.close()
+
+    async with new_session() as session:
+        match = await session.get(Match, ident)
+        assert match.pipeline_status == PipelineStatus.PROCESSED
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writer_retries_failed_flush_keeping_newer_values(new_session, sports):
+    ids = await create_matches(new_session, 2)
+    start = datetime(2026, 1, 3)
+    sessions = GatedSessions(new_session, failures=1)
+    sessions.gate.clear()
+
+    async with PipelineStatusWriter(
+        Match, session_factory=sessions, flush_interval=0.01
+    ) as writer:
+        for ident in ids:
+            await writer.submit(ident, PipelineStatus.SENT, start)
+        await wait_until(lambda: sessions.calls == 1)
+        # Submitted while the failing write is in flight.
+        await writer.submit(ids[0], PipelineStatus.PROCESSED, start + timedelta(1))
+        sessions.gate.set()
+        await wait_until(lambda: writer.stats.failures == 1)
+        await wait_until(lambda: writer.stats.pending == 0)
+
+    assert writer.stats.written == 2
+    assert await statuses(new_session, ids) == {
+        ids[0]: PipelineStatus.PROCESSED,
+        ids[1]: PipelineStatus.SENT,
+    }
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writer_close_raises_when_final_flush_fails(new_session, sports):
+    [ident] = await create_matches(new_session, 1)
+    sessions = GatedSessions(new_session, failures=1)
+    writer = PipelineStatusWriter(Match, session_factory=sessions, flush_interval=60)
+    await writer.submit(ident, PipelineStatus.SENT)
+
+    with pytest.raises(ConnectionError):
+        await writer.close()
+
+    assert writer.stats.failures == 1
+    assert writer.stats.pending == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        await writer.submit(ident, PipelineStatus.PROCESSED)
+    await writer.flush()
+    assert await statuses(new_session, [ident]) == {ident: PipelineStatus.SENT}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_writer_blocks_producers_until_flushed(new_session, sports):
+    ids = await create_matches(new_session, 3)
+    sessions = GatedSessions(new_session)
+    sessions.gate.clear()
+
+    async with PipelineStatusWriter(
+        Match, session_factory=sessions, flush_interval=60, max_pending=2
+    ) as writer:
+        for ident in ids[:2]:
+            await writer.submit(ident, PipelineStatus.SENT)
+        blocked = asyncio.create_task(writer.submit(ids[2], PipelineStatus.SENT))
+        await wait_until(lambda: sessions.calls == 1)
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        sessions.gate.set()
+        await asyncio.wait_for(blocked, timeout=5)
+        assert writer.stats.written == 2
+        assert writer.stats.pending == 1
+
+    assert set((await statuses(new_session, ids)).values()) == {PipelineStatus.SENT}
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import insert, select
+
+from flux_orm.models.models import Team
+from flux_orm.streaming import stream_chunks
+
+TEAMS = select(Team).where(Team.name.like("Stream Team %"))
+
+
+async def _insert_teams(session, count: int) -> None:
+    await session.execute(
+        insert(Team), [{"name": f"Stream Team {i:02}"} for i in range(count)]
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("mode", ["cursor", "keyset"])
+@pytest.mark.parametrize("prefetch", [False, True])
+async def test_stream_chunks_expunges_processed_objects(new_session, mode, prefetch):
+    async with new_session() as session:
+        await _insert_teams(session, 25)
+        chunks = stream_chunks(
+            session, TEAMS, chunk_size=10, mode=mode, prefetch=prefetch, total=25
+        )
+        sizes, names = [], []
+        async for chunk in chunks:
+            sizes.append(len(chunk))
+            names.extend(team.name for team in chunk)
+            # The previous chunk is gone, only the current (and prefetched) stay.
+            assert len(session.identity_map) <= 2 * chunks.chunk_size
+
+    assert sizes == [10, 10, 5]
+    assert sorted(names) == [f"Stream Team {i:02}" for i in range(25)]
+    progress = chunks.progress
+    assert (progress.rows, progress.chunks, progress.fraction) == (25, 3, 1.0)
+    assert progress.rows_per_second > 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stream_chunks_keyset_over_columns(new_session):
+    async with new_session() as session:
+        await _insert_teams(session, 7)
+        stmt = select(Team.name, Team.team_id).where(Team.name.like("Stream Team %"))
+        chunks = stream_chunks(
+            session, stmt, chunk_size=7, mode="keyset", key=Team.name
+        )
+        rows = [row async for row in chunks.items()]
+
+    assert [row.name for row in rows] == [f"Stream Team {i:02}" for i in range(7)]
+    # A full last chunk needs one more (empty) query to find the end.
+    assert chunks.progress.chunks == 1
+
+
+def test_stream_chunks_keyset_requires_key_for_columns():
+    with pytest.raises(ValueError, match="key is required"):
+        stream_chunks(None, select(Team.name), mode="keyset")
+
+
+def test_stream_chunks_keyset_requires_unique_key_and_no_order():
+    with pytest.raises(ValueError, match="must not have an ORDER BY"):
+        stream_chunks(None, TEAMS.order_by(Team.name), mode="keyset")
+    with pytest.raises(ValueError, match="must be unique"):
+        stream_chunks(None, TEAMS, mode="keyset", key=Team.pretty_name)
+    stream_chunks(None, TEAMS, mode="keyset", key=Team.name)
+    stream_chunks(None, TEAMS.order_by(Team.name), mode="cursor")
@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from flux_orm.models.models import Match, Sport
+from flux_orm.tests.conftest import BASE_URL
+from flux_orm.warmup import is_ready, warm_up
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_warm_up_opens_connections_and_prepares_statements(
+    database_name, tmp_path, caplog
+):
+    # A pool of only warmed-up connections.
+    engine = create_async_engine(
+        BASE_URL.set(drivername="postgresql+asyncpg", database=database_name),
+        pool_size=3,
+    )
+    by_id = select(Sport).where(Sport.sport_id == bindparam("sport_id"))
+    statements = {
+        "sport_by_id": by_id,
+        "matches_of_sports": select(Match).where(
+            Match.sport_id.in_(bindparam("sport_ids", expanding=True))
+        ),
+    }
+    ready_file = tmp_path / "ready"
+
+    report = await warm_up(engine, statements=statements, ready_file=ready_file)
+
+    assert report.connections == 3
+    assert report.prepared == 6
+    assert engine.pool.checkedin() == 3
+    assert ready_file.exists()
+    assert is_ready()
+
+    sql = by_id.compile(dialect=engine.dialect).string
+    caplog.set_level(logging.INFO, logger="sqlalchemy.engine.Engine")
+    async with engine.connect() as conn:
+        prepared = await conn.scalars(
+            text("SELECT statement FROM pg_prepared_statements")
+        )
+        assert sql in set(prepared)
+        await conn.execute(by_id, {"sport_id": None})
+    await engine.dispose()
+    assert "[cached since" in caplog.text
@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.pool import QueuePool
+
+from flux_orm.database import make_fork_safe
+from flux_orm.tests.conftest import BASE_URL
+from flux_orm.workers import pool_size_per_worker, run_sharded, shard
+
+
+async def describe_worker(new_session, items):
+    async with new_session() as session:
+        backend = await session.scalar(select(func.pg_backend_pid()))
+    pool = new_session.kw["bind"].pool
+    return os.getpid(), backend, pool.size(), sorted(items)
+
+
+def test_run_sharded_gives_every_worker_its_own_pool(database_name):
+    url = BASE_URL.set(drivername="postgresql+asyncpg", database=database_name)
+    items = [(sport, i) for sport in range(3) for i in range(sport + 1)]
+
+    results = run_sharded(
+        describe_worker,
+        items,
+        key=lambda item: item[0],
+        processes=2,
+        max_connections=6,
+        url=url,
+        start_method="fork",
+    )
+
+    assert len({pid for pid, *_ in results}) == 2
+    assert {pool_size for *_, pool_size, _ in results} == {3}
+    sports = [{sport for sport, _ in shard_items} for *_, shard_items in results]
+    assert sports == [{2}, {0, 1}]
+
+
+def _child_backend_pid(engine, queue):
+    with engine.connect() as conn:
+        queue.put(conn.scalar(text("SELECT pg_backend_pid()")))
+
+
+def test_forked_child_does_not_reuse_parent_connections(database_name):
+    engine = create_engine(
+        BASE_URL.set(database=database_name), poolclass=QueuePool, pool_size=1
+    )
+    make_fork_safe(engine)
+    try:
+        with engine.connect() as conn:
+            parent = conn.scalar(text("SELECT pg_backend_pid()"))
+
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        child = context.Process(target=_child_backend_pid, args=(engine, queue))
+        child.start()
+        child_backend = queue.get(timeout=30)
+        child.join(30)
+
+        assert child.exitcode == 0
+        assert child_backend != parent
+        with engine.connect() as conn:
+            assert conn.scalar(text("SELECT pg_backend_pid()")) == parent
+    finally:
+        engine.dispose()
+
+
+def test_shard_by_hash_is_stable():
+    items = list(range(100))
+    first = shard(items, key=str, shards=4, by="hash")
+    second = shard(reversed(items), key=str, shards=4, by="hash")
+
+    assert [set(items) for items in first] == [set(items) for items in second]
+    assert sorted(sum(first, [])) == items
+
+
+def test_pool_size_per_worker_caps_fleet():
+    assert pool_size_per_worker(20, 3) == 6
+    with pytest.raises(ValueError, match="one connection per process"):
+        pool_size_per_worker(2, 3)
@@ -0,0 +1,125 @@
+"""Warm the database layer up before a process starts taking traffic.
+
+``async_engine`` opens connections lazily and asyncpg prepares every statement
+on its first use per connection, so the first requests after a deploy pay for
+connects, mapper configuration, SQL compilation and PREPARE.  ``warm_up()``
+does all of it at startup::
+
+    register_hot_statement(
+        "upcoming_matches",
+        select(Match).where(Match.sport_id == bindparam("sport_id")),
+    )
+
+    await warm_up(ready_file="/tmp/flux_orm.ready")
+
+Each registered statement runs once on every opened pool connection, in a
+transaction that is rolled back: the engine's compiled cache gets the SQL and
+asyncpg prepares it in its per-connection statement cache, so the next
+execution skips both.  Parameters without a value run as NULL (an empty list
+for expanding ``IN`` parameters); register read statements, rows are not
+fetched beyond the first buffer.
+"""
+
+import asyncio
+import pathlib
+import time
+from contextlib import AsyncExitStack
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.sql import Executable
+
+from flux_orm.custom_logger import logger
+from flux_orm.database import async_engine
+
+HOT_STATEMENTS: dict[str, Executable] = {}
+
+_ready = asyncio.Event()
+
+
+class WarmUpReport(NamedTuple):
+    connections: int
+    prepared: int
+    seconds: float
+
+
+def register_hot_statement(name: str, statement: Executable) -> Executable:
+    """Add ``statement`` to the statements run by ``warm_up``."""
+    HOT_STATEMENTS[name] = statement
+    return statement
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+async def wait_ready() -> None:
+    await _ready.wait()
+
+
+def _parameters(engine: AsyncEngine, statement: Executable) -> dict:
+    """NULL, or an empty list if expanding, for every parameter without a value."""
+    compiled = statement.compile(dialect=engine.dialect)
+    return {
+        key: [] if compiled.binds[key].expanding else None
+        for key, value in compiled.params.items()
+        if value is None
+    }
+
+
+async def _execute(
+    conn: AsyncConnection, statements: dict[str, tuple[Executable, dict]]
+) -> int:
+    transaction = await conn.begin()
+    try:
+        for statement, parameters in statements.values():
+            if statement.is_select:
+                await (await conn.stream(statement, parameters)).close()
+            else:
+                await conn.execute(statement, parameters)
+    finally:
+        await transaction.rollback()
+    return len(statements)
+
+
+async def warm_up(
+    engine: AsyncEngine = async_engine,
+    connections: int | None = None,
+    statements: dict[str, Executable] | None = None,
+    ready_file: str | pathlib.Path | None = None,
+) -> WarmUpReport:
+    """
+    Open ``connections`` pool connections (the pool size by default), configure
+    the mappers and run the hot statements on each connection.
+
+    Marks the process ready when done; ``ready_file`` is created for probes
+    that check the filesystem.
+    """
+    started = time.perf_counter()
+    configure_mappers()
+    if connections is None:
+        connections = engine.pool.size()
+    statements = HOT_STATEMENTS if statements is None else statements
+    statements = {
+        name: (statement, _parameters(engine, statement))
+        for name, statement in statements.items()
+    }
+
+    async with AsyncExitStack() as stack:
+        # Hold all of them at once, otherwise the pool hands out the same one.
+        opened = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+        prepared = sum(
+            await asyncio.gather(*(_execute(conn, statements) for conn in opened))
+        )
+
+    report = WarmUpReport(
+        len(opened), prepared, round(time.perf_counter() - started, 3)
+    )
+    logger.info(f"Database warm-up done: {report}")
+    if ready_file is not None:
+        pathlib.Path(ready_file).touch()
+    _ready.set()
+    return report
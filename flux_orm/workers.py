@@ -0,0 +1,125 @@
+"""Ingestion spread over a process pool.
+
+``run_sharded`` splits the work items into one shard per process and runs an
+async function on each shard in its own process::
+
+    async def ingest(new_session: async_sessionmaker, matches: list[dict]) -> int:
+        async with new_session() as session:
+            ...
+
+    results = run_sharded(
+        ingest, matches, key=lambda match: match["sport_id"], processes=4
+    )
+
+``by="group"`` keeps the items of one key (e.g. a sport) in the same process
+and balances the groups by size; ``by="hash"`` maps every key to a process by a
+stable hash, so a given id always lands on the same worker.
+
+Every worker creates its own engine, with ``max_connections // processes``
+connections and no overflow, so the fleet never holds more than
+``max_connections``.  ``flux_orm.database.new_session`` is rebound to that
+engine inside the worker.  Engines inherited from the parent are disposed in
+the child on fork (see ``make_fork_safe``).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import zlib
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypeVar
+
+import sqlalchemy.engine.url as sa_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from flux_orm import database
+from flux_orm.config import postgresql_connection_settings
+from flux_orm.custom_logger import logger
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def shard(
+    items: Iterable[Item],
+    key: Callable[[Item], Hashable],
+    shards: int,
+    by: str = "group",
+) -> list[list[Item]]:
+    """Split ``items`` into ``shards`` lists, see the module docstring for ``by``."""
+    if by not in {"group", "hash"}:
+        raise ValueError(f"by must be 'group' or 'hash', not {by!r}")
+    result: list[list[Item]] = [[] for _ in range(shards)]
+    if by == "hash":
+        for item in items:
+            result[zlib.crc32(str(key(item)).encode()) % shards].append(item)
+        return result
+
+    groups: dict[Hashable, list[Item]] = defaultdict(list)
+    for item in items:
+        groups[key(item)].append(item)
+    # Largest group first into the least loaded shard.
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(result, key=len).extend(group)
+    return result
+
+
+def pool_size_per_worker(max_connections: int, processes: int) -> int:
+    if max_connections < processes:
+        raise ValueError(
+            f"max_connections ({max_connections}) must allow one connection "
+            f"per process ({processes})"
+        )
+    return max_connections // processes
+
+
+async def _run_worker(
+    func: Callable[[async_sessionmaker, list], Awaitable[Result]],
+    items: list,
+    pool_size: int,
+    url: sa_url.URL,
+) -> Result:
+    engine = create_async_engine(url, pool_size=pool_size, max_overflow=0)
+    database.make_fork_safe(engine)
+    database.new_session.configure(bind=engine)
+    try:
+        return await func(database.new_session, items)
+    finally:
+        await engine.dispose()
+
+
+def _worker(func, items: list, pool_size: int, url: sa_url.URL):
+    logger.info(f"Worker {os.getpid()}: {len(items)} items, {pool_size} connections")
+    return asyncio.run(_run_worker(func, items, pool_size, url))
+
+
+def run_sharded(
+    func: Callable[[async_sessionmaker, list[Item]], Awaitable[Result]],
+    items: Iterable[Item],
+    key: Callable[[Item], Hashable],
+    processes: int | None = None,
+    max_connections: int = 20,
+    by: str = "group",
+    url: sa_url.URL | None = None,
+    start_method: str | None = None,
+) -> list[Result]:
+    """
+    Run ``func(new_session, shard)`` for every non-empty shard in a process pool.
+
+    ``func`` must be importable by the workers (a module-level function).
+    Results are returned in shard order; the first failure is raised.
+    """
+    processes = processes or os.cpu_count() or 1
+    pool_size = pool_size_per_worker(max_connections, processes)
+    shards = [items for items in shard(items, key, processes, by) if items]
+    if not shards:
+        return []
+    url = url or postgresql_connection_settings.async_url
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(len(shards), mp_context=context) as executor:
+        futures = [
+            executor.submit(_worker, func, items, pool_size, url) for items in shards
+        ]
+        return [future.result() for future in futures]